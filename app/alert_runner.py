@@ -1,64 +1,118 @@
-import pkgutil
 import importlib
-import inspect
 import logging
-from app import alert_triggers
+import time
+from typing import Any
 from app.alert_triggers import BaseTrigger
 from app.models import AlertOutput
+from app.services.metrics import Metrics
+from app.services.tracing import Tracer
+from app.trigger_manifest import TriggerManifest, find_trigger_class
+from app.services.trigger_state import TriggerStateStore
 
 
 class AlertRunner:
     """Utility to discover and run alert triggers."""
 
+    _trigger_classes: dict[str, type[BaseTrigger]] = {}
+
     @staticmethod
     def discover_triggers() -> list[dict]:
-        """Scan app.alert_triggers for available Trigger classes."""
-        triggers = []
-        path = alert_triggers.__path__
-        prefix = alert_triggers.__name__ + "."
-        for _, name, _ in pkgutil.iter_modules(path, prefix):
+        """List available triggers from the cached TriggerManifest."""
+        return [
+            {
+                "name": entry["name"],
+                "script": script,
+                "description": entry["description"],
+                "default_params": entry["default_params"],
+                "param_fields": entry["param_fields"],
+            }
+            for script, entry in sorted(TriggerManifest.load().items())
+        ]
+
+    @staticmethod
+    def get_trigger_class(script_name: str) -> type[BaseTrigger] | None:
+        """Import a trigger's module on first execution and cache its class."""
+        trigger_class = AlertRunner._trigger_classes.get(script_name)
+        if trigger_class is None:
+            entry = TriggerManifest.resolve(script_name)
+            if entry is not None:
+                module = importlib.import_module(entry["module"])
+                trigger_class = getattr(module, entry["class"], None)
+            else:
+                module = importlib.import_module(f"app.alert_triggers.{script_name}")
+                trigger_class = find_trigger_class(module)
+            if trigger_class is not None:
+                AlertRunner._trigger_classes[script_name] = trigger_class
+        return trigger_class
+
+    @staticmethod
+    def prefetch(runs: list[tuple[str, Any]]):
+        """Let each trigger start shared I/O for ``(script, params)`` runs ahead."""
+        by_script: dict[str, list[Any]] = {}
+        for script_name, params in runs:
+            by_script.setdefault(script_name, []).append(params)
+        for script_name, params in by_script.items():
             try:
-                module = importlib.import_module(name)
-                for _, item in inspect.getmembers(module):
-                    if (
-                        inspect.isclass(item)
-                        and issubclass(item, BaseTrigger)
-                        and (item is not BaseTrigger)
-                    ):
-                        instance = item()
-                        triggers.append(
-                            {
-                                "name": instance.get_name(),
-                                "script": name.split(".")[-1],
-                                "description": instance.get_description(),
-                                "default_params": instance.get_default_params(),
-                            }
-                        )
+                trigger_class = AlertRunner.get_trigger_class(script_name)
+                if trigger_class is not None and trigger_class.params_schema:
+                    trigger_class.prefetch(params)
             except Exception as e:
-                logging.exception(f"Error loading trigger module {name}: {e}")
-        return triggers
+                logging.exception(f"Error prefetching for trigger {script_name}: {e}")
 
     @staticmethod
-    async def run_trigger(script_name: str, params: dict) -> AlertOutput | None:
-        """Execute a specific trigger script."""
-        try:
-            module_name = f"app.alert_triggers.{script_name}"
-            module = importlib.import_module(module_name)
-            trigger_class = None
-            for _, item in inspect.getmembers(module):
-                if (
-                    inspect.isclass(item)
-                    and issubclass(item, BaseTrigger)
-                    and (item is not BaseTrigger)
-                ):
-                    trigger_class = item
-                    break
-            if trigger_class:
-                instance = trigger_class()
+    async def run_trigger(
+        script_name: str, params: Any, rule_id: int | None = None
+    ) -> AlertOutput | None:
+        """Execute a specific trigger script.
+
+        ``params`` is either the trigger's validated params object (see
+        RuleParams) or a raw dict, which is validated on every call.
+
+        When ``rule_id`` is given, stateful triggers receive that rule's
+        persistent state dict from the TriggerStateStore. Every call is counted
+        and timed in Metrics, labelled by trigger script only so the series
+        stay bounded, and traced as a ``trigger.check`` span that also
+        carries the rule id.
+        """
+        labels = {"trigger": script_name}
+        Metrics.inc("sentinel_trigger_runs_total", **labels)
+        start = time.perf_counter()
+        rule_label = "" if rule_id is None else rule_id
+        with Tracer.span("trigger.check", rule_id=rule_label, **labels) as span:
+            try:
+                output = await AlertRunner._execute(script_name, params, rule_id)
+            except Exception as e:
+                logging.exception(f"Error executing trigger {script_name}: {e}")
+                span.status = "error"
+                output = None
+            span.set(triggered=bool(output and output.triggered))
+        Metrics.observe(
+            "sentinel_trigger_duration_seconds", time.perf_counter() - start, **labels
+        )
+        if output is None:
+            Metrics.inc("sentinel_trigger_errors_total", **labels)
+        elif output.triggered:
+            Metrics.inc("sentinel_trigger_fired_total", **labels)
+        return output
+
+    @staticmethod
+    async def _execute(
+        script_name: str, params: Any, rule_id: int | None
+    ) -> AlertOutput | None:
+        """Import the trigger module (once) and run its check."""
+        trigger_class = AlertRunner.get_trigger_class(script_name)
+        if trigger_class:
+            if isinstance(params, dict):
+                params = trigger_class.parse_params(params)
+            instance = trigger_class()
+            if not (instance.stateful and rule_id is not None):
                 return await instance.check(params)
-            else:
-                logging.error(f"No BaseTrigger subclass found in {script_name}")
-                return None
-        except Exception as e:
-            logging.exception(f"Error executing trigger {script_name}: {e}")
+            state = TriggerStateStore.get(rule_id)
+            output = await instance.check(params, state)
+            state["last_checked_at"] = time.time()
+            if output and output.triggered:
+                state["last_triggered_at"] = state["last_checked_at"]
+            return output
+        else:
+            logging.error(f"No BaseTrigger subclass found in {script_name}")
             return None
\ No newline at end of file
@@ -1,12 +1,42 @@
 import abc
+from typing import Any
+from app.alert_triggers.params import build_params
 from app.models import AlertOutput
 
 
 class BaseTrigger(abc.ABC):
-    """Abstract base class for all alert triggers."""
+    """Abstract base class for all alert triggers.
+
+    Stateful triggers set ``stateful = True`` and receive a per-rule state
+    dict as the second argument of ``check``; it persists across runs.
+
+    Triggers that set ``params_schema`` to a frozen dataclass receive an
+    instance of it instead of the raw dict. Rule parameters are validated
+    into that object once per edit (see RuleParams), so ``check`` doesn't
+    re-coerce values on every run.
+    """
+
+    stateful: bool = False
+    params_schema: type | None = None
+
+    @classmethod
+    def parse_params(cls, params: dict) -> Any:
+        """Validate raw params into ``params_schema``; raises ValueError."""
+        if cls.params_schema is None:
+            return params
+        return build_params(cls.params_schema, params)
+
+    @classmethod
+    def prefetch(cls, params: list[Any]):
+        """Start shared I/O for a sweep's runs of this trigger before they check.
+
+        Rules in a sweep run one at a time; triggers that wait on the network
+        can override this to start every run's request at once, so each
+        ``check`` then only joins its result.
+        """
 
     @abc.abstractmethod
-    async def check(self, params: dict) -> AlertOutput:
+    async def check(self, params: Any) -> AlertOutput:
         """Run the check logic and return an AlertOutput."""
         pass
 
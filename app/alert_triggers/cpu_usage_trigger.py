@@ -1,10 +1,23 @@
 import random
+from dataclasses import dataclass
 from datetime import datetime
 from app.alert_triggers import BaseTrigger
+from app.alert_triggers.params import check_range
 from app.models import AlertOutput
 
 
+@dataclass(frozen=True, slots=True)
+class CpuUsageParams:
+    server: str = "localhost"
+    threshold: float = 90.0
+
+    def __post_init__(self):
+        check_range("threshold", self.threshold, 0, 100)
+
+
 class CpuUsageTrigger(BaseTrigger):
+    params_schema = CpuUsageParams
+
     def get_name(self) -> str:
         return "CPU Usage Monitor"
 
@@ -14,9 +27,9 @@ class CpuUsageTrigger(BaseTrigger):
     def get_default_params(self) -> dict:
         return {"server": "PROD-DB-01", "threshold": 90}
 
-    async def check(self, params: dict) -> AlertOutput:
-        server = params.get("server", "localhost")
-        threshold = float(params.get("threshold", 90))
+    async def check(self, params: CpuUsageParams) -> AlertOutput:
+        server = params.server
+        threshold = params.threshold
         current_load = random.uniform(10, 100)
         triggered = current_load > threshold
         importance = "critical" if current_load > 95 else "high"
@@ -25,12 +38,16 @@ class CpuUsageTrigger(BaseTrigger):
             importance=importance,
             ticker=server,
             message=f"High CPU Load on {server}: {current_load:.1f}% (Threshold: {threshold}%)",
-            metadata={"load": current_load},
+            metadata={
+                "load": current_load,
+                "value": current_load,
+                "threshold": threshold,
+            },
             timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
         )
 
 
 if __name__ == "__main__":
     trigger = CpuUsageTrigger()
-    result = trigger.check(trigger.get_default_params())
+    result = trigger.check(trigger.parse_params(trigger.get_default_params()))
     print(result.json())
\ No newline at end of file
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from datetime import datetime
+from app.alert_triggers import BaseTrigger
+from app.alert_triggers.expressions import compile_expression
+from app.models import AlertOutput
+from app.services.metric_snapshots import MetricSnapshots
+
+
+@dataclass(frozen=True, slots=True)
+class ExpressionParams:
+    expression: str
+    ticker: str = "UNKNOWN"
+    importance: str = "medium"
+    message: str = ""
+
+    def __post_init__(self):
+        compile_expression(self.expression)
+
+
+class ExpressionTrigger(BaseTrigger):
+    params_schema = ExpressionParams
+
+    def get_name(self) -> str:
+        return "Expression Rule"
+
+    def get_description(self) -> str:
+        return "Evaluates a condition such as 'price > 180 and volume_pct > 200' against the latest metrics."
+
+    def get_default_params(self) -> dict:
+        return {
+            "expression": "price > 180 and volume_pct > 200",
+            "ticker": "AAPL",
+            "importance": "medium",
+            "message": "",
+        }
+
+    async def check(self, params: ExpressionParams) -> AlertOutput:
+        compiled = compile_expression(params.expression)
+        snapshot = MetricSnapshots.get(params.ticker)
+        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            triggered = bool(compiled(snapshot))
+        except KeyError as e:
+            return AlertOutput(
+                triggered=False,
+                importance="low",
+                ticker=params.ticker,
+                message=f"Missing metric {e} for expression: {compiled.source}",
+                metadata={"expression": compiled.source},
+                timestamp=timestamp,
+            )
+        values = {name: snapshot[name] for name in sorted(compiled.names)}
+        shown = ", ".join(
+            f"{name}={value:.2f}" if isinstance(value, float) else f"{name}={value}"
+            for name, value in values.items()
+        )
+        prefix = params.message or f"{params.ticker}: {compiled.source}"
+        return AlertOutput(
+            triggered=triggered,
+            importance=params.importance,
+            ticker=params.ticker,
+            message=f"{prefix} ({shown})",
+            metadata={"expression": compiled.source, **values},
+            timestamp=timestamp,
+        )
@@ -0,0 +1,177 @@
+import ast
+import functools
+from collections.abc import Callable, Mapping
+
+MAX_EXPRESSION_LENGTH = 2000
+
+_FUNCTIONS = {"abs": abs, "min": min, "max": max, "round": round}
+_BOOL_OPS = (ast.And, ast.Or)
+_UNARY_OPS = (ast.Not, ast.USub, ast.UAdd)
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod)
+_COMPARE_OPS = (
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+)
+
+
+class CompiledExpression:
+    """A validated rule condition compiled to a closure over a metric snapshot."""
+
+    __slots__ = ("source", "names", "_fn")
+
+    def __init__(self, source: str, names: frozenset[str], fn: Callable):
+        self.source = source
+        self.names = names
+        self._fn = fn
+
+    def __call__(self, snapshot: Mapping[str, object]):
+        """Evaluate against ``snapshot``; a missing metric raises KeyError."""
+        return self._fn(snapshot)
+
+
+def _may_be_sequence(node: ast.AST) -> bool:
+    """Whether ``node`` can evaluate to a str, list, tuple or set.
+
+    Metrics are always numbers, so only literals can introduce a sequence;
+    conditionals, ``and``/``or``, ``min``/``max`` and ``+`` pass one through.
+    """
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, str)
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return True
+    if isinstance(node, ast.IfExp):
+        return _may_be_sequence(node.body) or _may_be_sequence(node.orelse)
+    if isinstance(node, ast.BoolOp):
+        return any(_may_be_sequence(value) for value in node.values)
+    if isinstance(node, ast.Call):
+        return any(_may_be_sequence(arg) for arg in node.args)
+    if isinstance(node, ast.BinOp):
+        return _may_be_sequence(node.left) or _may_be_sequence(node.right)
+    return False
+
+
+def _validate(node: ast.AST, source: str, names: set[str]):
+    def reject(what: str):
+        raise ValueError(f"Unsupported {what} in expression: {source!r}")
+
+    if isinstance(node, ast.Expression):
+        _validate(node.body, source, names)
+    elif isinstance(node, ast.BoolOp):
+        if not isinstance(node.op, _BOOL_OPS):
+            reject("boolean operator")
+        for value in node.values:
+            _validate(value, source, names)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _UNARY_OPS):
+            reject("unary operator")
+        _validate(node.operand, source, names)
+    elif isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _BIN_OPS):
+            reject(f"operator {type(node.op).__name__}")
+        # Arithmetic on numbers only: "x" * 10**9 or "%0999999999d" % 1
+        # would be a cheap memory bomb.
+        if _may_be_sequence(node.left) or _may_be_sequence(node.right):
+            reject("string or sequence arithmetic")
+        _validate(node.left, source, names)
+        _validate(node.right, source, names)
+    elif isinstance(node, ast.Compare):
+        if not all(isinstance(op, _COMPARE_OPS) for op in node.ops):
+            reject("comparison")
+        _validate(node.left, source, names)
+        for op, comparator in zip(node.ops, node.comparators):
+            # Literal lists, tuples and sets only as the ``in`` container.
+            if isinstance(op, (ast.In, ast.NotIn)) and isinstance(
+                comparator, (ast.Tuple, ast.List, ast.Set)
+            ):
+                for element in comparator.elts:
+                    _validate(element, source, names)
+            else:
+                _validate(comparator, source, names)
+    elif isinstance(node, ast.IfExp):
+        for child in (node.test, node.body, node.orelse):
+            _validate(child, source, names)
+    elif isinstance(node, ast.Call):
+        if (
+            not isinstance(node.func, ast.Name)
+            or node.func.id not in _FUNCTIONS
+            or node.keywords
+        ):
+            reject("function call")
+        for arg in node.args:
+            _validate(arg, source, names)
+    elif isinstance(node, ast.Name):
+        if node.id.startswith("_") or node.id in _FUNCTIONS:
+            reject(f"name {node.id!r}")
+        names.add(node.id)
+    elif isinstance(node, ast.Constant):
+        if not isinstance(node.value, (int, float, str, bool, type(None))):
+            reject("constant")
+    else:
+        reject(f"syntax {type(node).__name__}")
+
+
+class _MetricLookup(ast.NodeTransformer):
+    """Rewrite metric names to ``_m["name"]`` lookups on the snapshot."""
+
+    def visit_Name(self, node: ast.Name):
+        if node.id in _FUNCTIONS:
+            return node
+        return ast.copy_location(
+            ast.Subscript(
+                value=ast.Name(id="_m", ctx=ast.Load()),
+                slice=ast.Constant(value=node.id),
+                ctx=ast.Load(),
+            ),
+            node,
+        )
+
+
+@functools.lru_cache(maxsize=16384)
+def compile_expression(source: str) -> CompiledExpression:
+    """Compile a rule condition such as ``price > 180 and volume_pct > 200``.
+
+    Only arithmetic on numbers (no ``**``), comparisons, ``and``/``or``/``not``,
+    conditional expressions, literals and ``abs``/``min``/``max``/``round``
+    are allowed; list, tuple and set literals only after ``in``/``not in``.
+    Bare names are metric lookups. Attribute access,
+    subscripts, lambdas and comprehensions are rejected, so the compiled
+    code can't reach anything but the snapshot. Results are cached by
+    expression text, so thousands of rules sharing a condition compile it
+    once. Raises ValueError for invalid expressions.
+    """
+    source = source.strip()
+    if not source:
+        raise ValueError("Expression is empty")
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(source, mode="eval")
+        names: set[str] = set()
+        _validate(tree, source, names)
+        body = _MetricLookup().visit(tree).body
+        wrapper = ast.Expression(
+            body=ast.Lambda(
+                args=ast.arguments(
+                    posonlyargs=[],
+                    args=[ast.arg(arg="_m")],
+                    kwonlyargs=[],
+                    kw_defaults=[],
+                    defaults=[],
+                ),
+                body=body,
+            )
+        )
+        ast.fix_missing_locations(wrapper)
+        code = compile(wrapper, "<rule expression>", "eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {source!r}: {e.msg}") from None
+    except RecursionError:
+        raise ValueError(f"Expression nested too deeply: {source[:80]!r}") from None
+    fn = eval(code, {"__builtins__": {}, **_FUNCTIONS})
+    return CompiledExpression(source, frozenset(names), fn)
@@ -1,35 +1,85 @@
-import random
+from dataclasses import dataclass
 from datetime import datetime
 from app.alert_triggers import BaseTrigger
+from app.alert_triggers.params import check_range
 from app.models import AlertOutput
+from app.services.health_prober import get_health_prober
+
+
+@dataclass(frozen=True, slots=True)
+class HealthCheckParams:
+    service: str = "unknown"
+    endpoint: str = "localhost"
+    max_age_seconds: float = 30.0
+    max_latency_ms: float = 0.0
+
+    def __post_init__(self):
+        if not self.endpoint.strip():
+            raise ValueError("Parameter 'endpoint' must not be empty")
+        check_range("max_age_seconds", self.max_age_seconds, 0)
+        check_range("max_latency_ms", self.max_latency_ms, 0)
+
+    @property
+    def url(self) -> str:
+        endpoint = self.endpoint.strip()
+        return endpoint if "://" in endpoint else f"http://{endpoint}"
 
 
 class HealthCheckTrigger(BaseTrigger):
+    params_schema = HealthCheckParams
+
     def get_name(self) -> str:
         return "Health Check Monitor"
 
     def get_description(self) -> str:
-        return "Monitors service endpoints and returns status (Healthy/Unhealthy)."
+        return "Probes a service's HTTP health endpoint and alerts when it is down or slow."
 
     def get_default_params(self) -> dict:
-        return {"service": "Auth-API", "endpoint": "https://api.sentinel.io/health"}
-
-    async def check(self, params: dict) -> AlertOutput:
-        service = params.get("service", "unknown")
-        endpoint = params.get("endpoint", "localhost")
-        is_healthy = random.random() > 0.2
-        importance = "low" if is_healthy else "critical"
-        status_text = "Healthy" if is_healthy else "Unhealthy"
-        message = f"Health Check for {service} ({endpoint}): {status_text}"
+        return {
+            "service": "Auth-API",
+            "endpoint": "https://api.sentinel.io/health",
+            "max_age_seconds": 30.0,
+            "max_latency_ms": 0.0,
+        }
+
+    @classmethod
+    def prefetch(cls, params: list[HealthCheckParams]):
+        prober = get_health_prober()
+        for max_age in {p.max_age_seconds for p in params}:
+            prober.prefetch(
+                [p.url for p in params if p.max_age_seconds == max_age], max_age
+            )
+
+    async def check(self, params: HealthCheckParams) -> AlertOutput:
+        prober = get_health_prober()
+        result = await prober.probe(params.url, params.max_age_seconds)
+        latency_ms = result.latency * 1000
+        slow = bool(params.max_latency_ms) and latency_ms > params.max_latency_ms
+        if not result.healthy:
+            importance, status_text = "critical", f"Unhealthy ({result.error})"
+        elif slow:
+            importance, status_text = "high", f"Slow ({latency_ms:.0f} ms)"
+        else:
+            importance, status_text = "low", "Healthy"
+        p50 = prober.latency_percentile(params.url, 50) or 0.0
+        p99 = prober.latency_percentile(params.url, 99) or 0.0
+        metadata = {
+            "status": status_text,
+            "is_healthy": result.healthy,
+            "endpoint": params.endpoint,
+            "status_code": result.status_code,
+            "latency_ms": round(latency_ms, 1),
+            "p50_ms": round(p50 * 1000, 1),
+            "p99_ms": round(p99 * 1000, 1),
+        }
+        if params.max_latency_ms:
+            metadata["value"] = latency_ms
+            metadata["threshold"] = params.max_latency_ms
         return AlertOutput(
-            triggered=True,
+            triggered=not result.healthy or slow,
             importance=importance,
-            ticker=service,
-            message=message,
-            metadata={
-                "status": status_text,
-                "is_healthy": is_healthy,
-                "endpoint": endpoint,
-            },
+            ticker=params.service,
+            message=f"Health Check for {params.service} ({params.endpoint}): {status_text}",
+            metadata=metadata,
             timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-        )
\ No newline at end of file
+        )
@@ -1,10 +1,38 @@
 import random
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from app.alert_triggers import BaseTrigger
+from app.alert_triggers.params import check_range
+from app.alert_triggers.window import TimeSeriesWindow
 from app.models import AlertOutput
 
 
+@dataclass(frozen=True, slots=True)
+class MemoryLeakParams:
+    service: str = "unknown"
+    limit_mb: float = 512.0
+    growth_pct_per_hour: float = 5.0
+    window_size: int = 60
+    min_samples: int = 5
+    min_span_minutes: float = 5.0
+    max_sample_age_hours: float = 24.0
+
+    def __post_init__(self):
+        check_range("limit_mb", self.limit_mb, 0, exclusive_minimum=True)
+        check_range("growth_pct_per_hour", self.growth_pct_per_hour, 0)
+        check_range("window_size", self.window_size, 2, 100_000)
+        check_range("min_samples", self.min_samples, 2, self.window_size)
+        check_range("min_span_minutes", self.min_span_minutes, 0)
+        check_range(
+            "max_sample_age_hours", self.max_sample_age_hours, 0, exclusive_minimum=True
+        )
+
+
 class MemoryLeakTrigger(BaseTrigger):
+    stateful = True
+    params_schema = MemoryLeakParams
+
     def get_name(self) -> str:
         return "Memory Leak Detector"
 
@@ -12,24 +40,64 @@ class MemoryLeakTrigger(BaseTrigger):
         return "Monitors memory usage trends for potential leaks."
 
     def get_default_params(self) -> dict:
-        return {"service": "api-gateway", "limit_mb": 512}
+        return {
+            "service": "api-gateway",
+            "limit_mb": 512,
+            "growth_pct_per_hour": 5,
+            "window_size": 60,
+            "min_samples": 5,
+            "min_span_minutes": 5,
+            "max_sample_age_hours": 24,
+        }
 
-    async def check(self, params: dict) -> AlertOutput:
-        service = params.get("service", "unknown")
-        limit = float(params.get("limit_mb", 512))
+    async def check(
+        self, params: MemoryLeakParams, state: dict | None = None
+    ) -> AlertOutput:
+        service = params.service
+        limit = params.limit_mb
+        growth_limit = params.growth_pct_per_hour
+        window_size = params.window_size
+        min_samples = params.min_samples
+        min_span = params.min_span_minutes * 60
+        max_age = params.max_sample_age_hours * 3600
         used = limit * random.uniform(0.6, 1.2)
-        triggered = used > limit
+        state = state if state is not None else {}
+        window = state.get("window")
+        if (
+            not isinstance(window, TimeSeriesWindow)
+            or window.capacity != window_size
+            or window.max_age != max_age
+        ):
+            window = state["window"] = TimeSeriesWindow(window_size, max_age=max_age)
+        window.push(time.time(), used)
+        growth = None
+        if len(window) >= min_samples and window.span_seconds >= min_span:
+            growth = window.pct_change_per_hour()
+        over_limit = used > limit
+        growing = growth is not None and growth > growth_limit
+        triggered = over_limit or growing
+        if growing and not over_limit:
+            message = f"Potential Memory Leak in {service}: growing {growth:.1f}%/h ({used:.1f}MB used, Limit: {limit}MB)"
+        else:
+            message = f"Potential Memory Leak in {service}: {used:.1f}MB used (Limit: {limit}MB)"
         return AlertOutput(
             triggered=triggered,
             importance="medium",
             ticker=service,
-            message=f"Potential Memory Leak in {service}: {used:.1f}MB used (Limit: {limit}MB)",
-            metadata={"used_mb": used, "limit_mb": limit},
+            message=message,
+            metadata={
+                "used_mb": used,
+                "limit_mb": limit,
+                "value": used,
+                "threshold": limit,
+                "growth_pct_per_hour": growth,
+                "ewma_mb": window.ewma,
+            },
             timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
         )
 
 
 if __name__ == "__main__":
     trigger = MemoryLeakTrigger()
-    result = trigger.check(trigger.get_default_params())
+    result = trigger.check(trigger.parse_params(trigger.get_default_params()))
     print(result.json())
\ No newline at end of file
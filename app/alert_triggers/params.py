@@ -0,0 +1,111 @@
+import dataclasses
+import types
+import typing
+
+
+def _coerce(name: str, kind, value):
+    """Convert one raw JSON value to a schema field's declared type."""
+    if typing.get_origin(kind) in (typing.Union, types.UnionType):
+        args = [a for a in typing.get_args(kind) if a is not type(None)]
+        if value is None:
+            return None
+        return _coerce(name, args[0], value)
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.lower() in ("true", "false"):
+            return value.lower() == "true"
+        raise ValueError(f"Parameter '{name}' must be true or false, got {value!r}")
+    if kind in (int, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"Parameter '{name}' must be a number, got {value!r}")
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(
+                f"Parameter '{name}' must be a number, got {value!r}"
+            ) from None
+        if kind is int:
+            if not number.is_integer():
+                raise ValueError(
+                    f"Parameter '{name}' must be a whole number, got {value!r}"
+                )
+            return int(number)
+        return number
+    if kind is str:
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"Parameter '{name}' must be text, got {value!r}")
+        return str(value)
+    if kind is dict or typing.get_origin(kind) is dict:
+        if not isinstance(value, dict):
+            raise ValueError(f"Parameter '{name}' must be an object, got {value!r}")
+        return dict(value)
+    return value
+
+
+def check_range(
+    name: str,
+    value: float,
+    minimum: float | None = None,
+    maximum: float | None = None,
+    exclusive_minimum: bool = False,
+):
+    """Raise ValueError unless ``value`` is within the given bounds.
+
+    Called from schema ``__post_init__`` methods, so a rule whose parameters
+    could never run is rejected when it is saved.
+    """
+    if minimum is not None:
+        if exclusive_minimum and value <= minimum:
+            raise ValueError(f"Parameter '{name}' must be greater than {minimum:g}")
+        if value < minimum:
+            raise ValueError(f"Parameter '{name}' must be at least {minimum:g}")
+    if maximum is not None and value > maximum:
+        raise ValueError(f"Parameter '{name}' must be at most {maximum:g}")
+
+
+def build_params(schema: type, raw: dict):
+    """Validate a raw parameter dict into a frozen ``schema`` instance.
+
+    Unknown keys and values that can't be converted to the declared field
+    type raise ValueError; missing keys fall back to the field defaults.
+    """
+    hints = typing.get_type_hints(schema)
+    fields = {f.name: f for f in dataclasses.fields(schema)}
+    unknown = sorted(set(raw) - set(fields))
+    if unknown:
+        raise ValueError(f"Unknown parameter(s) for {schema.__name__}: {unknown}")
+    values = {}
+    for name in fields:
+        if name in raw:
+            values[name] = _coerce(name, hints[name], raw[name])
+    try:
+        return schema(**values)
+    except TypeError as e:
+        raise ValueError(f"Invalid parameters for {schema.__name__}: {e}") from None
+
+
+def describe_params(schema: type | None) -> list[dict]:
+    """Field name, type and default of a schema, for rendering rule forms."""
+    if schema is None:
+        return []
+    hints = typing.get_type_hints(schema)
+    described = []
+    for field in dataclasses.fields(schema):
+        kind = hints[field.name]
+        required = False
+        if field.default is not dataclasses.MISSING:
+            default = field.default
+        elif field.default_factory is not dataclasses.MISSING:
+            default = field.default_factory()
+        else:
+            default, required = None, True
+        described.append(
+            {
+                "name": field.name,
+                "type": getattr(kind, "__name__", str(kind)),
+                "default": default,
+                "required": required,
+            }
+        )
+    return described
@@ -1,11 +1,21 @@
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from app.alert_triggers import BaseTrigger
 from app.models import AlertOutput
 from app.services.prefect_service import PrefectSyncService
 
 
+@dataclass(frozen=True, slots=True)
+class PrefectDeploymentParams:
+    deployment_id: str = ""
+    flow_name: str = "Unknown Flow"
+    parameters: dict = field(default_factory=dict)
+
+
 class PrefectDeploymentTrigger(BaseTrigger):
+    params_schema = PrefectDeploymentParams
+
     def get_name(self) -> str:
         return "Prefect Deployment Runner"
 
@@ -15,10 +25,10 @@ class PrefectDeploymentTrigger(BaseTrigger):
     def get_default_params(self) -> dict:
         return {"deployment_id": "", "flow_name": "Prefect Flow", "parameters": {}}
 
-    async def check(self, params: dict) -> AlertOutput:
-        deployment_id = params.get("deployment_id")
-        flow_name = params.get("flow_name", "Unknown Flow")
-        run_parameters = params.get("parameters", {})
+    async def check(self, params: PrefectDeploymentParams) -> AlertOutput:
+        deployment_id = params.deployment_id
+        flow_name = params.flow_name
+        run_parameters = params.parameters
         if not deployment_id:
             return AlertOutput(
                 triggered=False,
@@ -57,5 +67,5 @@ class PrefectDeploymentTrigger(BaseTrigger):
 
 if __name__ == "__main__":
     trigger = PrefectDeploymentTrigger()
-    result = trigger.check(trigger.get_default_params())
+    result = trigger.check(trigger.parse_params(trigger.get_default_params()))
     print(result.json())
\ No newline at end of file
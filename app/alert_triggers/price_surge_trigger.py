@@ -1,10 +1,23 @@
 import random
+from dataclasses import dataclass
 from datetime import datetime
 from app.alert_triggers import BaseTrigger
+from app.alert_triggers.params import check_range
 from app.models import AlertOutput
 
 
+@dataclass(frozen=True, slots=True)
+class PriceSurgeParams:
+    ticker: str = "UNKNOWN"
+    threshold: float = 100.0
+
+    def __post_init__(self):
+        check_range("threshold", self.threshold, 0, exclusive_minimum=True)
+
+
 class PriceSurgeTrigger(BaseTrigger):
+    params_schema = PriceSurgeParams
+
     def get_name(self) -> str:
         return "Price Surge Monitor"
 
@@ -14,9 +27,9 @@ class PriceSurgeTrigger(BaseTrigger):
     def get_default_params(self) -> dict:
         return {"ticker": "AAPL", "threshold": 150.0}
 
-    async def check(self, params: dict) -> AlertOutput:
-        ticker = params.get("ticker", "UNKNOWN")
-        threshold = float(params.get("threshold", 100.0))
+    async def check(self, params: PriceSurgeParams) -> AlertOutput:
+        ticker = params.ticker
+        threshold = params.threshold
         current_price = threshold + random.uniform(-10, 20)
         triggered = current_price > threshold
         return AlertOutput(
@@ -24,12 +37,16 @@ class PriceSurgeTrigger(BaseTrigger):
             importance="high",
             ticker=ticker,
             message=f"Price Surge Alert: {ticker} is at {current_price:.2f} (Threshold: {threshold})",
-            metadata={"current_price": current_price, "threshold": threshold},
+            metadata={
+                "current_price": current_price,
+                "value": current_price,
+                "threshold": threshold,
+            },
             timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
         )
 
 
 if __name__ == "__main__":
     trigger = PriceSurgeTrigger()
-    result = trigger.check(trigger.get_default_params())
+    result = trigger.check(trigger.parse_params(trigger.get_default_params()))
     print(result.json())
\ No newline at end of file
@@ -1,10 +1,25 @@
 import random
+from dataclasses import dataclass
 from datetime import datetime
 from app.alert_triggers import BaseTrigger
+from app.alert_triggers.params import check_range
 from app.models import AlertOutput
 
 
+@dataclass(frozen=True, slots=True)
+class VolumeSpikeParams:
+    ticker: str = "UNKNOWN"
+    avg_volume: float = 1000000.0
+    threshold_percent: float = 200.0
+
+    def __post_init__(self):
+        check_range("avg_volume", self.avg_volume, 0, exclusive_minimum=True)
+        check_range("threshold_percent", self.threshold_percent, 0)
+
+
 class VolumeSpikeTrigger(BaseTrigger):
+    params_schema = VolumeSpikeParams
+
     def get_name(self) -> str:
         return "Volume Spike Monitor"
 
@@ -14,10 +29,10 @@ class VolumeSpikeTrigger(BaseTrigger):
     def get_default_params(self) -> dict:
         return {"ticker": "NVDA", "avg_volume": 1000000, "threshold_percent": 200}
 
-    async def check(self, params: dict) -> AlertOutput:
-        ticker = params.get("ticker", "UNKNOWN")
-        avg_vol = float(params.get("avg_volume", 1000000))
-        pct_thresh = float(params.get("threshold_percent", 200))
+    async def check(self, params: VolumeSpikeParams) -> AlertOutput:
+        ticker = params.ticker
+        avg_vol = params.avg_volume
+        pct_thresh = params.threshold_percent
         factor = random.uniform(0.5, 3.5)
         current_vol = avg_vol * factor
         increase_pct = current_vol / avg_vol * 100
@@ -27,12 +42,17 @@ class VolumeSpikeTrigger(BaseTrigger):
             importance="medium",
             ticker=ticker,
             message=f"Volume Spike: {ticker} volume is {int(current_vol):,} ({increase_pct:.1f}% of avg)",
-            metadata={"current_volume": current_vol, "increase_pct": increase_pct},
+            metadata={
+                "current_volume": current_vol,
+                "increase_pct": increase_pct,
+                "value": increase_pct,
+                "threshold": pct_thresh,
+            },
             timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
         )
 
 
 if __name__ == "__main__":
     trigger = VolumeSpikeTrigger()
-    result = trigger.check(trigger.get_default_params())
+    result = trigger.check(trigger.parse_params(trigger.get_default_params()))
     print(result.json())
\ No newline at end of file
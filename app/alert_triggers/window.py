@@ -0,0 +1,214 @@
+import math
+
+
+class TimeSeriesWindow:
+    """Fixed-size ring of (ts, value) samples with O(1) rolling statistics.
+
+    Running sums are updated incrementally on every push and rebuilt exactly
+    once per full rotation of the ring, so floating point drift stays bounded
+    while each push remains amortized O(1). Timestamps are epoch seconds and
+    are stored relative to the first sample seen to keep the regression sums
+    well conditioned. With ``max_age`` set, samples older than ``max_age``
+    seconds before the newest one are evicted as well, so a gap in the
+    series does not leave stale samples in the fit.
+    """
+
+    __slots__ = (
+        "capacity",
+        "alpha",
+        "max_age",
+        "_ts",
+        "_values",
+        "_head",
+        "_count",
+        "_origin",
+        "_sum_v",
+        "_sum_v2",
+        "_sum_t",
+        "_sum_t2",
+        "_sum_tv",
+        "_ewma",
+        "_pushes",
+    )
+
+    def __init__(
+        self, capacity: int = 60, alpha: float = 0.3, max_age: float | None = None
+    ):
+        if capacity < 2:
+            raise ValueError("TimeSeriesWindow capacity must be at least 2")
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("EWMA alpha must be in (0, 1]")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("TimeSeriesWindow max_age must be positive")
+        self.capacity = capacity
+        self.alpha = alpha
+        self.max_age = max_age
+        self._ts = [0.0] * capacity
+        self._values = [0.0] * capacity
+        self._head = 0
+        self._count = 0
+        self._origin = None
+        self._sum_v = 0.0
+        self._sum_v2 = 0.0
+        self._sum_t = 0.0
+        self._sum_t2 = 0.0
+        self._sum_tv = 0.0
+        self._ewma = None
+        self._pushes = 0
+
+    def push(self, ts: float, value: float) -> None:
+        """Append a sample, evicting the oldest one when the ring is full."""
+        value = float(value)
+        if self._origin is None:
+            self._origin = float(ts)
+        t = float(ts) - self._origin
+        if self.max_age is not None:
+            while self._count and self._ts[self._tail] < t - self.max_age:
+                self._drop_oldest()
+        if self._count == self.capacity:
+            self._drop_oldest()
+        self._count += 1
+        self._ts[self._head] = t
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._sum_v += value
+        self._sum_v2 += value * value
+        self._sum_t += t
+        self._sum_t2 += t * t
+        self._sum_tv += t * value
+        if self._ewma is None:
+            self._ewma = value
+        else:
+            self._ewma += self.alpha * (value - self._ewma)
+        self._pushes += 1
+        if self._pushes >= self.capacity:
+            self._rebuild()
+
+    @property
+    def _tail(self) -> int:
+        return (self._head - self._count) % self.capacity
+
+    def _drop_oldest(self) -> None:
+        old_t = self._ts[self._tail]
+        old_v = self._values[self._tail]
+        self._sum_v -= old_v
+        self._sum_v2 -= old_v * old_v
+        self._sum_t -= old_t
+        self._sum_t2 -= old_t * old_t
+        self._sum_tv -= old_t * old_v
+        self._count -= 1
+
+    def _rebuild(self) -> None:
+        """Recompute running sums exactly from the ring contents."""
+        self._pushes = 0
+        self._sum_v = self._sum_v2 = 0.0
+        self._sum_t = self._sum_t2 = self._sum_tv = 0.0
+        for t, v in self._samples():
+            self._sum_v += v
+            self._sum_v2 += v * v
+            self._sum_t += t
+            self._sum_t2 += t * t
+            self._sum_tv += t * v
+
+    def _samples(self):
+        start = self._tail
+        for i in range(self._count):
+            idx = (start + i) % self.capacity
+            yield self._ts[idx], self._values[idx]
+
+    def clear(self) -> None:
+        self.__init__(self.capacity, self.alpha, self.max_age)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def is_full(self) -> bool:
+        return self._count == self.capacity
+
+    @property
+    def last(self) -> tuple[float, float] | None:
+        """Most recent (ts, value) sample."""
+        if not self._count:
+            return None
+        idx = (self._head - 1) % self.capacity
+        return self._ts[idx] + self._origin, self._values[idx]
+
+    @property
+    def span_seconds(self) -> float:
+        """Time covered by the samples currently in the window."""
+        if self._count < 2:
+            return 0.0
+        first = self._ts[self._tail]
+        last = self._ts[(self._head - 1) % self.capacity]
+        return last - first
+
+    @property
+    def mean(self) -> float | None:
+        if not self._count:
+            return None
+        return self._sum_v / self._count
+
+    @property
+    def variance(self) -> float | None:
+        """Sample variance of the values in the window."""
+        if self._count < 2:
+            return None
+        n = self._count
+        var = (self._sum_v2 - self._sum_v * self._sum_v / n) / (n - 1)
+        return max(var, 0.0)
+
+    @property
+    def stddev(self) -> float | None:
+        var = self.variance
+        return math.sqrt(var) if var is not None else None
+
+    @property
+    def slope(self) -> float | None:
+        """Least-squares slope of value over time, in units per second."""
+        if self._count < 2:
+            return None
+        n = self._count
+        denom = n * self._sum_t2 - self._sum_t * self._sum_t
+        if denom <= 0:
+            return None
+        return (n * self._sum_tv - self._sum_t * self._sum_v) / denom
+
+    @property
+    def ewma(self) -> float | None:
+        return self._ewma
+
+    def pct_change_per_hour(self) -> float | None:
+        """Fitted growth rate as a percentage of the window mean per hour."""
+        slope = self.slope
+        mean = self.mean
+        if slope is None or not mean:
+            return None
+        return slope * 3600.0 / abs(mean) * 100.0
+
+    def values(self) -> list[tuple[float, float]]:
+        """Return samples as (ts, value) pairs, oldest first."""
+        return [(t + self._origin, v) for t, v in self._samples()]
+
+    def to_dict(self) -> dict:
+        """JSON-friendly representation, used for state snapshots."""
+        return {
+            "capacity": self.capacity,
+            "alpha": self.alpha,
+            "max_age": self.max_age,
+            "ewma": self._ewma,
+            "samples": self.values(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TimeSeriesWindow":
+        window = cls(
+            int(data.get("capacity", 60)),
+            float(data.get("alpha", 0.3)),
+            data.get("max_age"),
+        )
+        for ts, value in data.get("samples", []):
+            window.push(ts, value)
+        if data.get("ewma") is not None:
+            window._ewma = float(data["ewma"])
+        return window
@@ -0,0 +1,106 @@
+import asyncio
+import json
+from datetime import datetime
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from app.services.export_service import EXPORT_FORMATS, ExportRegistry
+from app.services.ingestion_service import IngestionService
+from app.services.metric_snapshots import MetricSnapshots
+from app.services.tracing import OtlpCollectorStandIn, Tracer
+from app.worker import cluster_metrics
+
+api = FastAPI()
+
+
+@api.get("/api/export/{token}")
+async def download_export(token: str):
+    """Stream a registered history export as a chunked download."""
+    job = ExportRegistry.take(token)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export expired or not found")
+    fmt, criteria = job
+    media_type, extension = EXPORT_FORMATS[fmt]
+    filename = f"alert_history_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return StreamingResponse(
+        ExportRegistry.stream(fmt, criteria),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@api.post("/api/alerts")
+async def ingest_alert(payload: dict):
+    """Ingest a single externally generated alert; invalid payloads get 400."""
+    try:
+        item = IngestionService.parse(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = await IngestionService.ingest([item])
+    return results[0]
+
+
+@api.post("/api/alerts/batch")
+async def ingest_alert_batch(request: Request):
+    """Ingest an NDJSON batch; invalid lines are rejected individually."""
+    payloads, rejected = IngestionService.parse_ndjson(await request.body())
+    lines, items = [], []
+    for line_no, payload in payloads:
+        try:
+            items.append(IngestionService.parse(payload))
+            lines.append(line_no)
+        except ValueError as e:
+            rejected.append({"line": line_no, "error": str(e)})
+    results = await IngestionService.ingest(items) if items else []
+    rejected.sort(key=lambda r: r["line"])
+    return {
+        "accepted": len(items),
+        "rejected": rejected,
+        "results": [{"line": n, **r} for n, r in zip(lines, results)],
+    }
+
+
+@api.post("/api/snapshots/{ticker}")
+async def push_metric_snapshot(ticker: str, payload: dict):
+    """Merge metric values into a ticker's snapshot; invalid values get 400."""
+    try:
+        return {"ticker": ticker, "metrics": MetricSnapshots.update(ticker, payload)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@api.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint; series carry the ``process`` they come from."""
+    return PlainTextResponse(
+        cluster_metrics().render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@api.get("/api/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """Spans of one trace from the in-memory ring, oldest first."""
+    spans = Tracer.spans(trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return [span.to_dict() for span in spans]
+
+
+async def receive_otlp_traces(request: Request):
+    """Local OTLP/HTTP (JSON) collector stand-in; appends payloads to disk."""
+    body = b""
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > OtlpCollectorStandIn.MAX_PAYLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Payload too large")
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Payload must be a JSON object")
+    spans = await asyncio.to_thread(OtlpCollectorStandIn.receive, payload)
+    return {"accepted_spans": spans}
+
+
+if OtlpCollectorStandIn.enabled():
+    api.add_api_route("/api/otlp/v1/traces", receive_otlp_traces, methods=["POST"])
@@ -8,6 +8,8 @@ from app.components.settings import settings_page
 from app.components.logs import logs_page
 from app.states.alert_state import AlertState
 from app.states.ui_state import UIState
+from app.api import api
+from app.worker import lifespan as rule_worker
 
 
 def layout(content: rx.Component) -> rx.Component:
@@ -245,11 +247,15 @@ app = rxe.App(
         ),
         rx.el.style(style_content),
     ],
+    api_transformer=api,
 )
+app.register_lifespan_task(rule_worker)
 app.add_page(index, route="/", on_load=AlertState.on_load)
 app.add_page(rules_page, route="/rules", on_load=AlertState.on_load)
 app.add_page(events_page, route="/events", on_load=AlertState.on_load)
 app.add_page(
-    lambda: layout(settings_page()), route="/settings", on_load=AlertState.on_load
+    lambda: layout(settings_page()),
+    route="/settings",
+    on_load=[AlertState.on_load, AlertState.refresh_metrics_summary],
 )
 app.add_page(lambda: layout(logs_page()), route="/logs", on_load=AlertState.on_load)
\ No newline at end of file
@@ -86,17 +86,49 @@ base_columns = [
         "cellClassRules": {
             "critical-pulse": "data.raw_importance === 'CRITICAL' && data.status === 'Pending'",
             "text-green-600 font-medium": "data.status === 'Acknowledged'",
+            "text-gray-500": "data.status === 'Resolved'",
             "text-green-600 font-bold": "data.category === 'HealthCheck' && data.raw_importance === 'LOW'",
             "critical-cell": "data.is_critical",
             "warning-cell": "data.raw_importance === 'HIGH' && !data.is_acknowledged",
         },
     },
+    {
+        "field": "repeat_count",
+        "headerName": "Count",
+        "sortable": True,
+        "filter": "agNumberColumnFilter",
+        "width": 100,
+        "cellClassRules": {
+            "font-bold": "x > 1",
+            "critical-cell": "data.is_critical",
+            "warning-cell": "data.raw_importance === 'HIGH' && !data.is_acknowledged",
+        },
+    },
 ]
 
 
-def get_live_columns() -> list[dict]:
-    """Columns for the Live Blotter."""
-    return base_columns + [
+def get_live_columns(grouped: bool = False) -> list[dict]:
+    """Columns for the Live Blotter, optionally grouped by incident."""
+    group_columns = (
+        [
+            {"field": "incident", "headerName": "Incident", "rowGroup": True, "hide": True},
+            {
+                "field": "incident_summary",
+                "headerName": "Incident Summary",
+                "aggFunc": "first",
+                "width": 320,
+            },
+        ]
+        if grouped
+        else []
+    )
+    selectable_first = {
+        **base_columns[0],
+        "checkboxSelection": True,
+        "headerCheckboxSelection": True,
+        "headerCheckboxSelectionFilteredOnly": True,
+    }
+    return group_columns + [selectable_first] + base_columns[1:] + [
         {
             "field": "prefect_link",
             "headerName": "Prefect UI",
@@ -119,6 +151,15 @@ def get_live_columns() -> list[dict]:
     ]
 
 
+def get_incident_group_column() -> dict:
+    """Auto group column shown when the Live Blotter is grouped by incident."""
+    return {
+        "headerName": "Incident",
+        "minWidth": 160,
+        "cellRendererParams": {"suppressCount": False},
+    }
+
+
 def get_history_columns() -> list[dict]:
     """Columns for the Historical Blotter."""
     return base_columns + [
@@ -72,10 +72,22 @@ def historical_blotter() -> rx.Component:
                 ),
                 rx.el.button(
                     rx.icon("download", class_name="w-4 h-4 mr-2"),
-                    "Export",
+                    "Export CSV",
                     on_click=AlertState.export_history_csv,
                     class_name="inline-flex items-center px-3 py-2 border border-gray-300 shadow-sm text-sm leading-4 font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-indigo-500",
                 ),
+                rx.el.button(
+                    rx.icon("file-json", class_name="w-4 h-4 mr-2"),
+                    "Export NDJSON",
+                    on_click=AlertState.export_history_ndjson,
+                    class_name="inline-flex items-center px-3 py-2 border border-gray-300 shadow-sm text-sm leading-4 font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-indigo-500",
+                ),
+                rx.el.button(
+                    rx.icon("database", class_name="w-4 h-4 mr-2"),
+                    "Export Parquet",
+                    on_click=AlertState.export_history_parquet,
+                    class_name="inline-flex items-center px-3 py-2 border border-gray-300 shadow-sm text-sm leading-4 font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-indigo-500",
+                ),
                 class_name="flex flex-wrap gap-3 items-center",
             ),
             class_name="flex flex-col xl:flex-row justify-between items-start xl:items-center p-6 border-b border-gray-100 gap-4",
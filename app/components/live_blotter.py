@@ -1,7 +1,7 @@
 import reflex as rx
 import reflex_enterprise as rxe
 from app.states.alert_state import AlertState
-from app.components.grid_config import get_live_columns
+from app.components.grid_config import get_live_columns, get_incident_group_column
 
 
 def acknowledge_modal() -> rx.Component:
@@ -10,7 +10,11 @@ def acknowledge_modal() -> rx.Component:
         rx.dialog.content(
             rx.dialog.title("Acknowledge Event"),
             rx.dialog.description(
-                "Add an optional comment regarding this alert acknowledgement.",
+                rx.cond(
+                    AlertState.selected_incident_id != -1,
+                    "All pending events in this incident will be acknowledged. Add an optional comment.",
+                    "Add an optional comment regarding this alert acknowledgement.",
+                ),
                 class_name="mb-4",
             ),
             rx.el.div(
@@ -59,6 +63,70 @@ def filter_button(label: str, filter_value: str) -> rx.Component:
     )
 
 
+def bulk_actions_bar() -> rx.Component:
+    """Bulk acknowledge / annotate controls for the Live Blotter."""
+    input_class = "rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 text-sm p-1.5 border"
+    button_class = "inline-flex items-center px-2 py-1 border border-gray-300 shadow-sm text-xs font-medium rounded text-gray-700 bg-white hover:bg-gray-50 focus:outline-none disabled:opacity-50 disabled:cursor-not-allowed"
+    return rx.el.div(
+        rx.el.div(
+            rx.el.span(
+                AlertState.selected_live_event_ids.length().to_string(),
+                " selected",
+                class_name="text-xs font-medium text-gray-600 w-20",
+            ),
+            rx.el.input(
+                placeholder="Bulk comment...",
+                on_change=AlertState.set_bulk_comment,
+                default_value=AlertState.bulk_comment,
+                class_name=f"{input_class} w-56",
+            ),
+            rx.el.button(
+                rx.icon("check-check", class_name="w-3 h-3 mr-1"),
+                "Ack Selected",
+                on_click=AlertState.bulk_acknowledge_selected,
+                disabled=AlertState.selected_live_event_ids.length() == 0,
+                class_name=button_class,
+            ),
+            rx.el.button(
+                rx.icon("message-square", class_name="w-3 h-3 mr-1"),
+                "Annotate Selected",
+                on_click=AlertState.bulk_annotate_selected,
+                disabled=AlertState.selected_live_event_ids.length() == 0,
+                class_name=button_class,
+            ),
+            class_name="flex items-center gap-2 flex-wrap",
+        ),
+        rx.el.div(
+            rx.el.input(
+                placeholder="e.g. importance:low category:Market older_than:1h",
+                on_change=AlertState.set_bulk_filter_expression,
+                default_value=AlertState.bulk_filter_expression,
+                class_name=f"{input_class} w-80 font-mono",
+            ),
+            rx.el.button(
+                "Ack Matching",
+                on_click=AlertState.bulk_acknowledge_matching,
+                disabled=AlertState.bulk_filter_expression == "",
+                class_name=button_class,
+            ),
+            rx.el.button(
+                "Annotate Matching",
+                on_click=AlertState.bulk_annotate_matching,
+                disabled=AlertState.bulk_filter_expression == "",
+                class_name=button_class,
+            ),
+            rx.cond(
+                AlertState.bulk_filter_error != "",
+                rx.el.span(
+                    AlertState.bulk_filter_error, class_name="text-xs text-red-600"
+                ),
+            ),
+            class_name="flex items-center gap-2 flex-wrap",
+        ),
+        class_name="flex flex-col xl:flex-row justify-between gap-3 px-6 py-3 border-b border-gray-100 bg-gray-50",
+    )
+
+
 def live_blotter() -> rx.Component:
     """The main Live Blotter component using rxe.ag_grid."""
     return rx.el.div(
@@ -97,6 +165,19 @@ def live_blotter() -> rx.Component:
                         class_name="block rounded-lg border-gray-200 text-sm font-medium text-gray-700 focus:border-indigo-500 focus:ring-indigo-500 p-1.5 border appearance-none",
                     ),
                     rx.el.div(class_name="w-px h-6 bg-gray-300 mx-2"),
+                    rx.el.label(
+                        rx.switch(
+                            checked=AlertState.group_incidents,
+                            on_change=AlertState.toggle_group_incidents,
+                            size="1",
+                        ),
+                        rx.el.span(
+                            "Group by Incident",
+                            class_name="text-xs font-medium text-gray-600",
+                        ),
+                        class_name="flex items-center gap-2",
+                    ),
+                    rx.el.div(class_name="w-px h-6 bg-gray-300 mx-2"),
                     filter_button("All Events", "All"),
                     filter_button("Critical Only", "Critical"),
                     filter_button("Market", "Market"),
@@ -111,16 +192,26 @@ def live_blotter() -> rx.Component:
                 ),
                 class_name="flex flex-col sm:flex-row justify-between items-start sm:items-center p-6 border-b border-gray-100 gap-4",
             ),
+            bulk_actions_bar(),
             rx.el.div(
                 rx.cond(
                     AlertState.is_grid_ready,
                     rxe.ag_grid(
                         id="live_blotter_grid",
-                        column_defs=get_live_columns(),
+                        column_defs=rx.cond(
+                            AlertState.group_incidents,
+                            get_live_columns(grouped=True),
+                            get_live_columns(),
+                        ),
                         row_data=AlertState.all_live_events,
+                        auto_group_column_def=get_incident_group_column(),
+                        group_default_expanded=0,
                         pagination=True,
                         pagination_page_size=20,
                         pagination_page_size_selector=[20, 50, 100],
+                        row_selection="multiple",
+                        suppress_row_click_selection=True,
+                        on_selection_changed=AlertState.handle_live_selection_changed,
                         on_cell_clicked=AlertState.handle_live_grid_cell_clicked,
                         width="100%",
                         height="600px",
@@ -177,6 +177,78 @@ def search_history_view() -> rx.Component:
     )
 
 
+def trace_span_row(span: rx.Var) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.span(span["name"], class_name="text-xs font-mono font-medium text-gray-900"),
+            rx.el.span(
+                span["attributes"], class_name="text-[10px] font-mono text-gray-500 truncate"
+            ),
+            class_name="flex flex-col w-64 shrink-0",
+        ),
+        rx.el.div(
+            rx.el.div(
+                class_name=rx.cond(
+                    span["status"] == "error",
+                    "absolute h-3 rounded bg-red-400",
+                    "absolute h-3 rounded bg-indigo-400",
+                ),
+                style={"left": span["left"], "width": span["width"]},
+            ),
+            class_name="relative flex-1 h-3 bg-gray-100 rounded",
+        ),
+        rx.el.span(
+            span["offset"], class_name="text-xs font-mono text-gray-500 w-24 text-right"
+        ),
+        rx.el.span(
+            span["duration"], class_name="text-xs font-mono text-gray-900 w-24 text-right"
+        ),
+        class_name="flex items-center gap-4 p-3 border-b border-gray-100",
+    )
+
+
+def event_traces_view() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.input(
+                placeholder="Event ID",
+                default_value=AlertState.trace_event_query,
+                on_change=AlertState.set_trace_event_query,
+                class_name="w-40 px-3 py-2 border border-gray-300 rounded-lg text-sm",
+            ),
+            rx.el.button(
+                rx.icon("activity", class_name="w-4 h-4 mr-2"),
+                "Show Trace",
+                on_click=AlertState.load_event_trace,
+                class_name="flex items-center px-4 py-2 bg-indigo-600 text-white rounded-lg hover:bg-indigo-700 text-sm font-medium",
+            ),
+            rx.el.button(
+                "Export JSON",
+                on_click=AlertState.export_event_trace_json,
+                class_name="px-4 py-2 bg-white text-gray-700 border border-gray-300 rounded-lg hover:bg-gray-50 text-sm font-medium",
+            ),
+            rx.el.button(
+                "Send OTLP",
+                on_click=AlertState.export_event_trace_otlp,
+                class_name="px-4 py-2 bg-white text-gray-700 border border-gray-300 rounded-lg hover:bg-gray-50 text-sm font-medium",
+            ),
+            rx.el.span(AlertState.trace_status, class_name="text-sm text-gray-500"),
+            class_name="flex items-center gap-3 p-4 bg-gray-50 border-b border-gray-200",
+        ),
+        rx.el.div(
+            rx.cond(
+                AlertState.trace_spans.length() > 0,
+                rx.foreach(AlertState.trace_spans, trace_span_row),
+                rx.el.div(
+                    "Enter an event ID to see where its time went: sweep, trigger check, Prefect calls, state mutation and UI push.",
+                    class_name="p-12 text-center text-gray-500 italic",
+                ),
+            ),
+            class_name="overflow-y-auto max-h-[600px]",
+        ),
+    )
+
+
 def logs_page() -> rx.Component:
     return rx.el.div(
         rx.el.div(
@@ -198,9 +270,11 @@ def logs_page() -> rx.Component:
                 rx.tabs.list(
                     rx.tabs.trigger("Latest Logs", value="latest"),
                     rx.tabs.trigger("Search History", value="search"),
+                    rx.tabs.trigger("Event Traces", value="traces"),
                 ),
                 rx.tabs.content(latest_logs_view(), value="latest"),
                 rx.tabs.content(search_history_view(), value="search"),
+                rx.tabs.content(event_traces_view(), value="traces"),
                 default_value="latest",
                 value=AlertState.log_active_tab,
                 on_change=AlertState.set_log_active_tab,
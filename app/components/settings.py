@@ -3,6 +3,115 @@ from app.states.ui_state import UIState
 from app.states.alert_state import AlertState
 
 
+def metric_stat(label: str, value: rx.Var) -> rx.Component:
+    return rx.el.div(
+        rx.el.p(label, class_name="text-xs font-medium text-gray-500"),
+        rx.el.p(value, class_name="text-lg font-semibold text-gray-900"),
+        class_name="flex flex-col p-3 rounded-lg bg-gray-50 border border-gray-100",
+    )
+
+
+def metrics_table(
+    headers: list[str], rows: rx.Var, keys: list[str], highlight_key: str = ""
+) -> rx.Component:
+    return rx.el.table(
+        rx.el.thead(
+            rx.el.tr(
+                *[
+                    rx.el.th(
+                        h,
+                        class_name="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase",
+                    )
+                    for h in headers
+                ]
+            )
+        ),
+        rx.el.tbody(
+            rx.foreach(
+                rows,
+                lambda row: rx.el.tr(
+                    *[
+                        rx.el.td(
+                            row[k],
+                            class_name=rx.cond(
+                                row[highlight_key] == "yes",
+                                "px-3 py-2 text-sm text-red-700 font-medium",
+                                "px-3 py-2 text-sm text-gray-700",
+                            )
+                            if highlight_key
+                            else "px-3 py-2 text-sm text-gray-700",
+                        )
+                        for k in keys
+                    ],
+                    class_name="border-t border-gray-100",
+                ),
+            )
+        ),
+        class_name="min-w-full",
+    )
+
+
+def metrics_section() -> rx.Component:
+    overview = AlertState.metrics_overview
+    return rx.el.div(
+        rx.el.div(
+            rx.el.h3("Trigger Metrics", class_name="text-lg font-bold text-gray-900"),
+            rx.el.div(
+                rx.el.a(
+                    "Prometheus /metrics",
+                    href=rx.config.get_config().api_url.rstrip("/") + "/metrics",
+                    target="_blank",
+                    class_name="text-sm text-indigo-600 hover:text-indigo-800",
+                ),
+                rx.el.button(
+                    rx.icon("refresh-cw", class_name="w-4 h-4 mr-2"),
+                    "Refresh",
+                    on_click=AlertState.refresh_metrics_summary,
+                    class_name="flex items-center px-3 py-1.5 bg-white text-gray-700 border border-gray-300 rounded-lg hover:bg-gray-50 text-sm font-medium shadow-sm",
+                ),
+                class_name="flex items-center gap-4",
+            ),
+            class_name="flex justify-between items-center mb-4",
+        ),
+        rx.el.div(
+            rx.el.div(
+                metric_stat("Sweeps", overview["sweeps"]),
+                metric_stat("Sweep p50", overview["sweep_p50"]),
+                metric_stat("Sweep p99", overview["sweep_p99"]),
+                metric_stat("Prefect calls", overview["prefect_calls"]),
+                metric_stat("Prefect p99", overview["prefect_p99"]),
+                metric_stat("Prefect errors", overview["prefect_errors"]),
+                metric_stat("Prefect fail-fast", overview["prefect_rejected"]),
+                metric_stat("Email queue", overview["email_queue"]),
+                metric_stat("Webhook queue", overview["webhook_queue"]),
+                metric_stat("Run lag p99", overview["run_lag_p99"]),
+                metric_stat("Runs shed", overview["runs_shed"]),
+                class_name="grid grid-cols-2 md:grid-cols-4 gap-3 mb-6",
+            ),
+            rx.el.h4(
+                "Per trigger", class_name="text-sm font-semibold text-gray-700 mb-2"
+            ),
+            metrics_table(
+                ["Trigger", "Runs", "Fired", "Errors", "p50", "p99", "Max"],
+                AlertState.metrics_trigger_rows,
+                ["trigger", "runs", "fired", "errors", "p50", "p99", "max"],
+            ),
+            rx.el.h4(
+                "Slowest rules (p99 vs. period budget)",
+                class_name="text-sm font-semibold text-gray-700 mt-6 mb-2",
+            ),
+            metrics_table(
+                ["Rule", "p99", "Period", "Budget used"],
+                AlertState.metrics_slow_rules,
+                ["name", "p99", "period", "budget"],
+                highlight_key="over_budget",
+            ),
+            class_name="bg-white p-6 rounded-2xl border border-gray-200 shadow-sm overflow-x-auto",
+        ),
+        class_name="mb-8",
+    )
+
+
 def settings_page() -> rx.Component:
     return rx.el.div(
         rx.el.h1("System Settings", class_name="text-2xl font-bold text-gray-900 mb-6"),
@@ -85,12 +194,45 @@ def settings_page() -> rx.Component:
                                 class_name="mt-2 text-sm text-red-600",
                             ),
                         ),
+                        rx.cond(
+                            AlertState.prefect_breakers.length() > 0,
+                            rx.el.div(
+                                rx.el.h4(
+                                    "API circuit breakers",
+                                    class_name="text-sm font-semibold text-gray-700 mb-2",
+                                ),
+                                metrics_table(
+                                    [
+                                        "Endpoint",
+                                        "Process",
+                                        "State",
+                                        "Failure rate",
+                                        "Calls",
+                                        "Opens",
+                                        "Retry in",
+                                    ],
+                                    AlertState.prefect_breakers,
+                                    [
+                                        "endpoint",
+                                        "process",
+                                        "state",
+                                        "failure_rate",
+                                        "calls",
+                                        "opens",
+                                        "retry_in",
+                                    ],
+                                    highlight_key="tripped",
+                                ),
+                                class_name="mt-6 overflow-x-auto",
+                            ),
+                        ),
                         class_name="flex flex-col",
                     ),
                     class_name="bg-white p-6 rounded-2xl border border-gray-200 shadow-sm",
                 ),
                 class_name="mb-8",
             ),
+            metrics_section(),
             rx.el.div(
                 rx.el.h3(
                     "Appearance", class_name="text-lg font-bold text-gray-900 mb-4"
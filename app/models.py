@@ -15,6 +15,17 @@ PREFECT_STATES = [
 ]
 
 
+class AlertOutput(rx.Base):
+    """Standardized output for alert triggers."""
+
+    triggered: bool
+    importance: str
+    ticker: str
+    message: str
+    metadata: dict = {}
+    timestamp: str
+
+
 class AlertRule(rx.Base):
     """Data model for defining alert rules."""
 
@@ -24,12 +35,16 @@ class AlertRule(rx.Base):
     importance: str = "medium"
     category: str = "General"
     period_seconds: int = 60
+    adaptive_period: bool = False
+    min_period_seconds: int = 15
+    max_period_seconds: int = 3600
     display_duration_minutes: int = 1440
     action_config: str = "{}"
+    suppression_window_seconds: int = 900
     comment: Optional[str] = None
     is_active: bool = True
     trigger_script: str = "custom"
-    last_output: Optional[str] = None
+    last_output: Optional[AlertOutput] = None
     prefect_deployment_id: Optional[str] = None
     prefect_flow_name: Optional[str] = None
     schedule_cron: Optional[str] = None
@@ -56,17 +71,28 @@ class AlertEvent(rx.Base):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     retry_count: int = 0
+    fingerprint: Optional[str] = None
+    repeat_count: int = 1
+    last_seen: Optional[datetime] = None
+    is_resolved: bool = False
+    resolved_timestamp: Optional[datetime] = None
+    incident_id: Optional[int] = None
+    trace_id: Optional[str] = None
 
 
-class AlertOutput(rx.Base):
-    """Standardized output for alert triggers."""
+class Incident(rx.Base):
+    """Group of correlated alert events acknowledged as one unit."""
 
-    triggered: bool
-    importance: str
-    ticker: str
-    message: str
-    metadata: dict = {}
-    timestamp: str
+    id: int = 0
+    title: str = ""
+    opened_at: datetime
+    last_activity: datetime
+    importance: str = "medium"
+    event_ids: list[int] = []
+    tickers: list[str] = []
+    categories: list[str] = []
+    tags: list[str] = []
+    is_acknowledged: bool = False
 
 
 class LogEntry(rx.Base):
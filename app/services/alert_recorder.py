@@ -0,0 +1,72 @@
+import logging
+from datetime import datetime
+from app.models import AlertEvent, AlertOutput, AlertRule
+from app.services.dedup_service import AlertDeduplicator, OpenEvents
+from app.services.event_store import EventStore, event_from_output
+from app.services.notification_service import get_dispatcher
+from app.services.webhook_service import get_webhook_dispatcher
+
+
+class AlertRecorder:
+    """Turns AlertOutputs into stored events for one writer.
+
+    The single path rule workers and the ingestion API record alerts
+    through: ``begin`` syncs the store's open events (OpenEvents), ``record``
+    deduplicates an output into a new, repeated or resolved event and queues
+    the rule's email and webhook actions for new events, ``finish`` folds in
+    expired suppressions, and ``commit`` group commits the changes to the
+    EventStore under the writer's ``source``.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.open_events = OpenEvents()
+        self._dedup: AlertDeduplicator | None = None
+        self._changed: dict[int, AlertEvent] = {}
+
+    def begin(self):
+        """Start a batch against the store's latest open events."""
+        self.open_events.sync()
+        self._dedup = self.open_events.deduplicator()
+        self._changed = {}
+
+    def record(
+        self, rule: AlertRule, output: AlertOutput, now: datetime
+    ) -> tuple[str, list[AlertEvent]]:
+        """Apply one output; returns ("created" | "repeated" | "resolved", events)."""
+        if not output.triggered:
+            resolved = self._dedup.resolve(rule.id, output.ticker, now)
+            self._changed.update((e.id, e) for e in resolved)
+            return "resolved", resolved
+        if repeat := self._dedup.merge(rule, output, now):
+            self._changed[repeat.id] = repeat
+            return "repeated", [repeat]
+        event = event_from_output(rule, output, EventStore.next_id(), now)
+        self._dedup.register(rule, output, event)
+        self._changed[event.id] = event
+        self._dispatch_notifications(rule, event)
+        return "created", [event]
+
+    @staticmethod
+    def _dispatch_notifications(rule: AlertRule, event: AlertEvent):
+        for dispatcher in (get_dispatcher(), get_webhook_dispatcher()):
+            if dispatcher is None:
+                continue
+            try:
+                dispatcher.enqueue(rule, event)
+            except Exception as e:
+                logging.exception(
+                    f"Error queueing notification for rule {rule.name}: {e}"
+                )
+
+    def finish(self) -> list[AlertEvent]:
+        """End the batch; returns every event it changed, expirations included."""
+        for event in self._dedup.expired:
+            self._changed[event.id] = event
+        self.open_events.update(self._dedup)
+        changed, self._changed = list(self._changed.values()), {}
+        return changed
+
+    async def commit(self, events: list[AlertEvent]):
+        if events:
+            await EventStore.commit(events, source=self.source)
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from app.models import AlertEvent, Incident
+from app.services.dedup_service import IMPORTANCE_RANK
+
+DEFAULT_TOPOLOGY = {
+    "core-infra": ["DB-PROD", "API-GW", "SYS-01", "PROD-CORE-01", "api-gateway"],
+    "auth": ["Auth-API", "API-GW"],
+    "mega-cap-tech": ["AAPL", "MSFT", "GOOGL", "NVDA", "AMZN", "META", "TSLA"],
+}
+
+
+def load_topology() -> dict[str, list[str]]:
+    """Load topology tags from SENTINEL_TOPOLOGY_FILE, falling back to defaults."""
+    path = os.environ.get("SENTINEL_TOPOLOGY_FILE")
+    if not path:
+        return DEFAULT_TOPOLOGY
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.exception(f"Error loading topology file {path}: {e}")
+        return DEFAULT_TOPOLOGY
+
+
+class IncidentCorrelator:
+    """Groups events into incidents by time proximity and shared attributes.
+
+    An event joins the most recently active unacknowledged incident whose
+    last activity is within ``window_seconds`` and which shares its ticker, a
+    topology tag, or (when ``match_category`` is set) its category. Otherwise
+    it opens a new incident. ``prune`` expires incidents that have settled:
+    quiet for longer than the window and acknowledged or with every event
+    resolved or acknowledged.
+    """
+
+    def __init__(
+        self,
+        incidents: list[Incident],
+        next_incident_id: int,
+        window_seconds: int = 300,
+        topology: dict[str, list[str]] | None = None,
+        match_category: bool = True,
+        now: datetime | None = None,
+    ):
+        self.incidents = incidents
+        self.next_incident_id = next_incident_id
+        self.window = timedelta(seconds=window_seconds)
+        self.match_category = match_category
+        self._tags_by_ticker: dict[str, set[str]] = {}
+        for tag, tickers in (topology if topology is not None else load_topology()).items():
+            for ticker in tickers:
+                self._tags_by_ticker.setdefault(ticker, set()).add(tag)
+        horizon = (now or datetime.utcnow()) - self.window
+        self._active = [
+            i for i in incidents if not i.is_acknowledged and i.last_activity >= horizon
+        ]
+        self._by_id = {i.id: i for i in self._active}
+
+    def _matches(self, incident: Incident, event: AlertEvent, tags: set[str]) -> bool:
+        if event.ticker and event.ticker in incident.tickers:
+            return True
+        if tags and not tags.isdisjoint(incident.tags):
+            return True
+        return self.match_category and event.category in incident.categories
+
+    def assign(self, event: AlertEvent) -> Incident:
+        """Attach an event to a matching open incident or open a new one."""
+        ts = event.timestamp or datetime.utcnow()
+        horizon = ts - self.window
+        self._active = [
+            i for i in self._active if not i.is_acknowledged and i.last_activity >= horizon
+        ]
+        tags = self._tags_by_ticker.get(event.ticker or "", set())
+        incident = None
+        for candidate in sorted(self._active, key=lambda i: i.last_activity, reverse=True):
+            if self._matches(candidate, event, tags):
+                incident = candidate
+                break
+        if incident is None:
+            incident = Incident(
+                id=self.next_incident_id,
+                title=event.message,
+                opened_at=ts,
+                last_activity=ts,
+                importance=event.importance,
+            )
+            self.next_incident_id += 1
+            self.incidents.append(incident)
+            self._active.append(incident)
+            self._by_id[incident.id] = incident
+        incident.event_ids.append(event.id)
+        incident.last_activity = max(incident.last_activity, ts)
+        if event.ticker and event.ticker not in incident.tickers:
+            incident.tickers.append(event.ticker)
+        if event.category not in incident.categories:
+            incident.categories.append(event.category)
+        for tag in tags:
+            if tag not in incident.tags:
+                incident.tags.append(tag)
+        if IMPORTANCE_RANK.get(event.importance, -1) > IMPORTANCE_RANK.get(
+            incident.importance, -1
+        ):
+            incident.importance = event.importance
+        event.incident_id = incident.id
+        return incident
+
+    def touch(self, event: AlertEvent, now: datetime):
+        """Extend an incident's activity when one of its events repeats."""
+        incident = self._by_id.get(event.incident_id)
+        if incident is not None:
+            incident.last_activity = max(incident.last_activity, now)
+
+    def prune(self, events: dict[int, AlertEvent], now: datetime) -> list[Incident]:
+        """Drop settled incidents from ``incidents``; returns the expired ones."""
+        horizon = now - self.window
+
+        def settled(incident: Incident) -> bool:
+            if incident.is_acknowledged:
+                return True
+            members = (events.get(i) for i in incident.event_ids)
+            return all(
+                e is None or e.is_resolved or e.is_acknowledged for e in members
+            )
+
+        expired = [
+            i for i in self.incidents if i.last_activity < horizon and settled(i)
+        ]
+        if expired:
+            ids = {i.id for i in expired}
+            self.incidents[:] = [i for i in self.incidents if i.id not in ids]
+            self._active = [i for i in self._active if i.id not in ids]
+            for incident_id in ids:
+                self._by_id.pop(incident_id, None)
+        return expired
@@ -0,0 +1,190 @@
+import calendar
+import functools
+import os
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+MONTH_NAMES = {
+    name: i
+    for i, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun"]
+        + ["jul", "aug", "sep", "oct", "nov", "dec"],
+        start=1,
+    )
+}
+DAY_NAMES = {
+    name: i
+    for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])
+}
+# (name, low, high, aliases) for minute, hour, day of month, month, day of week.
+FIELDS = [
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, MONTH_NAMES),
+    ("day of week", 0, 7, DAY_NAMES),
+]
+SEARCH_YEARS = 5
+
+
+def _next_bit(mask: int, start: int) -> int:
+    """Lowest set bit position >= ``start``, or -1."""
+    rest = mask >> start
+    if not rest:
+        return -1
+    return start + (rest & -rest).bit_length() - 1
+
+
+def _parse_value(token: str, aliases: dict, name: str) -> int:
+    value = aliases.get(token.lower())
+    if value is not None:
+        return value
+    if not token.isdigit():
+        raise ValueError(f"Invalid {name} value {token!r}")
+    return int(token)
+
+
+def _parse_field(text: str, low: int, high: int, aliases: dict, name: str) -> int:
+    """Compile one cron field to a bitset with bit ``n`` set when ``n`` matches."""
+    mask = 0
+    for part in text.split(","):
+        part, _, step_text = part.partition("/")
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"Invalid {name} step {step_text!r}")
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            first, _, last = part.partition("-")
+            start = _parse_value(first, aliases, name)
+            end = _parse_value(last, aliases, name)
+        else:
+            start = _parse_value(part, aliases, name)
+            end = high if step_text else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Invalid {name} range {part!r} (allowed {low}-{high})")
+        for value in range(start, end + 1, step):
+            mask |= 1 << value
+    return mask
+
+
+class CronExpression:
+    """A five-field cron expression compiled to per-field bitsets.
+
+    Supports ``*``, lists, ranges, steps, month/day names, the ``@daily``
+    style macros and a ``CRON_TZ=Area/City`` prefix; without one the
+    expression is evaluated in ``SENTINEL_CRON_TZ`` (default UTC). As in
+    Vixie cron, when both day of month and day of week are restricted a day
+    matches if either does. ``next_fire`` jumps field by field with bit
+    scans instead of stepping minute by minute.
+    """
+
+    __slots__ = (
+        "source",
+        "tz",
+        "minutes",
+        "hours",
+        "days",
+        "months",
+        "weekdays",
+        "_day_or",
+    )
+
+    def __init__(self, source: str):
+        self.source = source
+        text = source.strip()
+        tz_name = os.environ.get("SENTINEL_CRON_TZ", "UTC")
+        if text.startswith(("CRON_TZ=", "TZ=")):
+            prefix, _, text = text.partition(" ")
+            tz_name = prefix.partition("=")[2]
+        try:
+            self.tz = ZoneInfo(tz_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown cron time zone {tz_name!r}") from None
+        text = MACROS.get(text.strip().lower(), text)
+        parts = text.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {source!r}")
+        masks = [
+            _parse_field(part, low, high, aliases, name)
+            for part, (name, low, high, aliases) in zip(parts, FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = masks
+        # Both 0 and 7 mean Sunday.
+        self.weekdays = (weekdays | (weekdays >> 7)) & 0x7F
+        self._day_or = parts[2] != "*" and parts[4] != "*"
+        if self.next_fire(datetime.now(self.tz)) is None:
+            raise ValueError(f"Cron expression never fires: {source!r}")
+
+    def _day_mask(self, year: int, month: int) -> int:
+        """Bitset of the days of ``month`` matching the day-of-month/week fields."""
+        first_weekday, length = calendar.monthrange(year, month)
+        valid = ((1 << (length + 1)) - 1) & ~1
+        # Weekday bits repeated over the month, shifted so bit d is day d.
+        offset = (first_weekday + 1) % 7  # cron weekday of day 1 (Sunday = 0)
+        rotated = ((self.weekdays >> offset) | (self.weekdays << (7 - offset))) & 0x7F
+        by_weekday = 0
+        for week in range(6):
+            by_weekday |= rotated << (1 + 7 * week)
+        if self._day_or:
+            return (self.days | by_weekday) & valid
+        return self.days & by_weekday & valid
+
+    def next_fire(self, after: datetime) -> datetime | None:
+        """First matching minute strictly after ``after`` (aware), in ``tz``."""
+        local = after.astimezone(self.tz).replace(second=0, microsecond=0)
+        local = local.replace(tzinfo=None) + timedelta(minutes=1)
+        year, month, day, hour, minute = (
+            local.year,
+            local.month,
+            local.day,
+            local.hour,
+            local.minute,
+        )
+        while year <= local.year + SEARCH_YEARS:
+            next_month = _next_bit(self.months, month)
+            if next_month < 0:
+                year, month, day, hour, minute = year + 1, 1, 1, 0, 0
+                continue
+            if next_month != month:
+                month, day, hour, minute = next_month, 1, 0, 0
+            next_day = _next_bit(self._day_mask(year, month), day)
+            if next_day < 0:
+                month, day, hour, minute = month + 1, 1, 0, 0
+                continue
+            if next_day != day:
+                day, hour, minute = next_day, 0, 0
+            next_hour = _next_bit(self.hours, hour)
+            if next_hour < 0:
+                day, hour, minute = day + 1, 0, 0
+                continue
+            if next_hour != hour:
+                hour, minute = next_hour, 0
+            next_minute = _next_bit(self.minutes, minute)
+            if next_minute < 0:
+                hour, minute = hour + 1, 0
+                continue
+            candidate = datetime(year, month, day, hour, next_minute, tzinfo=self.tz)
+            # Wall times repeated or skipped by a DST change can map to an
+            # instant that isn't after ``after``; keep searching from there.
+            if candidate > after:
+                return candidate
+            minute = next_minute + 1
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_cron(source: str) -> CronExpression:
+    """Compile (and cache) a cron expression; raises ValueError."""
+    return CronExpression(source)
@@ -0,0 +1,149 @@
+import logging
+import os
+import sqlite3
+import threading
+
+DEFAULT_DB_PATH = "sentinel.db"
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS trigger_state (
+        rule_id INTEGER PRIMARY KEY,
+        state TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS notification_outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        channel TEXT NOT NULL,
+        recipient TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL,
+        created_at REAL NOT NULL,
+        last_error TEXT
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_outbox_due
+    ON notification_outbox (status, channel, next_attempt_at)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS id_sequence (
+        name TEXT PRIMARY KEY,
+        next_value INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL,
+        source TEXT NOT NULL,
+        data TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_events_version ON events (version)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_events_timestamp
+    ON events (COALESCE(json_extract(data, '$.timestamp'), ''), id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS export_jobs (
+        token TEXT PRIMARY KEY,
+        format TEXT NOT NULL,
+        criteria TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rules (
+        id INTEGER PRIMARY KEY,
+        data TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS workers (
+        worker_id TEXT PRIMARY KEY,
+        host TEXT NOT NULL,
+        started_at REAL NOT NULL,
+        heartbeat_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rule_leases (
+        rule_id INTEGER PRIMARY KEY,
+        worker_id TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS process_metrics (
+        process_id TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS metric_snapshots (
+        ticker TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rule_schedules (
+        rule_id INTEGER PRIMARY KEY,
+        schedule_key TEXT NOT NULL,
+        next_fire REAL NOT NULL,
+        interval REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rule_run_requests (
+        rule_id INTEGER PRIMARY KEY,
+        requested_at REAL NOT NULL
+    )
+    """,
+]
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_initialized_paths: set[str] = set()
+
+
+def get_db_path() -> str:
+    return os.environ.get("SENTINEL_DB_PATH", DEFAULT_DB_PATH)
+
+
+def _init_schema(conn: sqlite3.Connection, path: str):
+    with _schema_lock:
+        if path in _initialized_paths:
+            return
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        _initialized_paths.add(path)
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return a per-thread connection to the shared Sentinel database."""
+    path = get_db_path()
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=10.0)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.DatabaseError as e:
+            logging.exception(f"Could not configure database {path}: {e}")
+        connections[path] = conn
+    _init_schema(conn, path)
+    return conn
@@ -0,0 +1,165 @@
+import hashlib
+import re
+from datetime import datetime, timedelta
+from app.models import AlertEvent, AlertOutput, AlertRule
+from app.services.event_store import EventStore
+
+_VOLATILE_NUMBERS = re.compile(r"\d+(?:[.,]\d+)*")
+
+IMPORTANCE_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+
+class AlertDeduplicator:
+    """Folds repeated trigger outputs onto the open event for the same key.
+
+    Open events are tracked in ``index`` as ``"rule_id|ticker|fingerprint"``
+    -> event id. An output matching an open event inside the rule's
+    suppression window bumps that event's repeat count instead of creating a
+    new one; an output that is no longer triggered resolves the rule's open
+    events for its ticker. An open event replaced by a newer one for its key
+    (a repeat after the window, or any repeat when the window is 0) is
+    resolved as well and collected in ``expired`` so callers persist it.
+    """
+
+    def __init__(self, index: dict[str, int], events: list[AlertEvent]):
+        self.index = dict(index)
+        open_ids = set(self.index.values())
+        self._events_by_id = (
+            {e.id: e for e in events if e.id in open_ids} if open_ids else {}
+        )
+        self.expired: list[AlertEvent] = []
+
+    @staticmethod
+    def fingerprint(output: AlertOutput) -> str:
+        """Stable hash of the message with volatile numbers masked out."""
+        masked = _VOLATILE_NUMBERS.sub("#", output.message.strip().lower())
+        return hashlib.sha1(masked.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def make_key(rule_id: int, ticker: str | None, fingerprint: str) -> str:
+        return f"{rule_id}|{ticker or '-'}|{fingerprint}"
+
+    def _close(self, key: str, now: datetime) -> AlertEvent | None:
+        """Stop tracking a key; resolves its event if it is still open."""
+        event = self._events_by_id.get(self.index.pop(key))
+        if event and not event.is_resolved and not event.is_acknowledged:
+            event.is_resolved = True
+            event.resolved_timestamp = now
+            return event
+        return None
+
+    def _open_event(self, key: str, rule: AlertRule, now: datetime) -> AlertEvent | None:
+        event_id = self.index.get(key)
+        if event_id is None:
+            return None
+        event = self._events_by_id.get(event_id)
+        window = timedelta(seconds=rule.suppression_window_seconds)
+        if (
+            event is None
+            or event.is_acknowledged
+            or event.is_resolved
+            or now - (event.last_seen or event.timestamp or now) > window
+        ):
+            if expired := self._close(key, now):
+                self.expired.append(expired)
+            return None
+        return event
+
+    def merge(self, rule: AlertRule, output: AlertOutput, now: datetime) -> AlertEvent | None:
+        """Fold output into its open event; returns the event if it was a repeat."""
+        if rule.suppression_window_seconds <= 0:
+            return None
+        key = self.make_key(rule.id, output.ticker, self.fingerprint(output))
+        event = self._open_event(key, rule, now)
+        if event is None:
+            return None
+        event.repeat_count += 1
+        event.last_seen = now
+        event.message = output.message
+        importance = output.importance.lower()
+        if IMPORTANCE_RANK.get(importance, -1) > IMPORTANCE_RANK.get(event.importance, -1):
+            event.importance = importance
+        return event
+
+    def register(self, rule: AlertRule, output: AlertOutput, event: AlertEvent):
+        """Start tracking a newly created event as the open event for its key."""
+        event.fingerprint = self.fingerprint(output)
+        event.last_seen = event.timestamp
+        key = self.make_key(rule.id, output.ticker, event.fingerprint)
+        if key in self.index and (
+            expired := self._close(key, event.timestamp or datetime.utcnow())
+        ):
+            self.expired.append(expired)
+        self.index[key] = event.id
+        self._events_by_id[event.id] = event
+
+    def open_events(self) -> dict[int, AlertEvent]:
+        """The events still tracked in ``index``, by id."""
+        return {
+            i: self._events_by_id[i]
+            for i in set(self.index.values())
+            if i in self._events_by_id
+        }
+
+    def resolve(self, rule_id: int, ticker: str | None, now: datetime) -> list[AlertEvent]:
+        """Auto-resolve open events of a rule/ticker whose condition cleared."""
+        prefix = f"{rule_id}|{ticker or '-'}|"
+        resolved = []
+        for key in [k for k in self.index if k.startswith(prefix)]:
+            if event := self._close(key, now):
+                resolved.append(event)
+        return resolved
+
+
+class OpenEvents:
+    """Open events by dedup key, kept in step with the EventStore change feed.
+
+    Each process that deduplicates (rule workers, the ingestion API) keeps
+    one. ``sync`` applies everything committed since the last call, so an
+    event acknowledged or resolved from a dashboard or another process stops
+    absorbing repeats, and events created elsewhere are deduplicated against.
+    """
+
+    def __init__(self):
+        self.index: dict[str, int] = {}
+        self.events: dict[int, AlertEvent] = {}
+        self.version: int | None = None
+
+    def _apply(self, event: AlertEvent):
+        if not event.fingerprint:
+            return
+        key = AlertDeduplicator.make_key(event.rule_id, event.ticker, event.fingerprint)
+        current = self.index.get(key)
+        if event.is_acknowledged or event.is_resolved:
+            self.events.pop(event.id, None)
+            if current == event.id:
+                del self.index[key]
+            return
+        if current is not None and current != event.id:
+            other = self.events.get(current)
+            if other is not None and (other.timestamp or datetime.min) > (
+                event.timestamp or datetime.min
+            ):
+                return
+            self.events.pop(current, None)
+        self.index[key] = event.id
+        self.events[event.id] = event
+
+    def sync(self):
+        """Apply events committed since the last sync (all open events at first)."""
+        if self.version is None:
+            self.version, incoming = EventStore.open_events()
+        else:
+            self.version, incoming = EventStore.changes_since(self.version)
+        while incoming:
+            for event in incoming:
+                self._apply(event)
+            self.version, incoming = EventStore.changes_since(self.version)
+
+    def deduplicator(self) -> AlertDeduplicator:
+        return AlertDeduplicator(self.index, list(self.events.values()))
+
+    def update(self, dedup: AlertDeduplicator):
+        """Keep the open events left after a deduplication pass."""
+        self.index = dedup.index
+        self.events = dedup.open_events()
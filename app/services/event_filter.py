@@ -0,0 +1,119 @@
+import re
+import shlex
+from datetime import datetime, timedelta
+from app.models import AlertEvent
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhdw])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_STATUSES = {"pending", "acknowledged", "resolved"}
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a compact duration such as '90s', '15m', '1h' or '2d'."""
+    match = _DURATION.match(value.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid duration '{value}' (expected e.g. 30m, 1h, 2d)")
+    return timedelta(seconds=float(match.group(1)) * _UNIT_SECONDS[match.group(2)])
+
+
+class EventFilter:
+    """Predicate over AlertEvents built from a ``key:value`` filter expression.
+
+    Example: ``importance:low category:Market older_than:1h``. Comma separated
+    values match any of them (``importance:low,medium``) and quoted values may
+    contain spaces (``text:"connection timeout"``). Supported keys are
+    importance, category, ticker, rule, status, older_than, newer_than, text.
+    """
+
+    __slots__ = (
+        "importance",
+        "category",
+        "ticker",
+        "rule_ids",
+        "status",
+        "older_than",
+        "newer_than",
+        "text",
+    )
+
+    def __init__(self):
+        self.importance: set[str] | None = None
+        self.category: set[str] | None = None
+        self.ticker: set[str] | None = None
+        self.rule_ids: set[int] | None = None
+        self.status: set[str] | None = None
+        self.older_than: timedelta | None = None
+        self.newer_than: timedelta | None = None
+        self.text: str | None = None
+
+    @classmethod
+    def parse(cls, expression: str) -> "EventFilter":
+        """Parse a filter expression, raising ValueError on unknown keys or values."""
+        flt = cls()
+        try:
+            tokens = shlex.split(expression)
+        except ValueError as e:
+            raise ValueError(f"Invalid filter expression: {e}") from e
+        if not tokens:
+            raise ValueError("Filter expression is empty")
+        for token in tokens:
+            key, sep, value = token.partition(":")
+            key = key.strip().lower()
+            if not sep or not value:
+                raise ValueError(f"Expected key:value, got '{token}'")
+            values = [v.strip() for v in value.split(",") if v.strip()]
+            if key == "importance":
+                flt.importance = {v.lower() for v in values}
+            elif key == "category":
+                flt.category = {v.lower() for v in values}
+            elif key == "ticker":
+                flt.ticker = {v.upper() for v in values}
+            elif key == "rule":
+                try:
+                    flt.rule_ids = {int(v) for v in values}
+                except ValueError as e:
+                    raise ValueError(f"Invalid rule id in '{token}'") from e
+            elif key == "status":
+                statuses = {v.lower() for v in values}
+                if not statuses <= _STATUSES:
+                    raise ValueError(f"Unknown status in '{token}'")
+                flt.status = statuses
+            elif key == "older_than":
+                flt.older_than = parse_duration(value)
+            elif key == "newer_than":
+                flt.newer_than = parse_duration(value)
+            elif key == "text":
+                flt.text = value.lower()
+            else:
+                raise ValueError(f"Unknown filter key '{key}'")
+        return flt
+
+    def matches(self, event: AlertEvent, now: datetime) -> bool:
+        if self.importance is not None and event.importance not in self.importance:
+            return False
+        if self.category is not None and (event.category or "").lower() not in self.category:
+            return False
+        if self.ticker is not None and (event.ticker or "").upper() not in self.ticker:
+            return False
+        if self.rule_ids is not None and event.rule_id not in self.rule_ids:
+            return False
+        if self.status is not None:
+            if event.is_acknowledged:
+                status = "acknowledged"
+            elif event.is_resolved:
+                status = "resolved"
+            else:
+                status = "pending"
+            if status not in self.status:
+                return False
+        if self.older_than is not None or self.newer_than is not None:
+            if not event.timestamp:
+                return False
+            age = now - event.timestamp
+            if self.older_than is not None and age < self.older_than:
+                return False
+            if self.newer_than is not None and age > self.newer_than:
+                return False
+        if self.text is not None and self.text not in (event.message or "").lower():
+            return False
+        return True
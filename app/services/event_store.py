@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import threading
+from collections.abc import Iterator
+from datetime import datetime
+from app.models import AlertEvent, AlertOutput, AlertRule
+from app.services import database
+from app.services.tracing import Tracer
+
+
+def event_from_output(
+    rule: AlertRule, output: AlertOutput, event_id: int, now: datetime
+) -> AlertEvent:
+    """Build the AlertEvent recorded for a triggered AlertOutput."""
+    return AlertEvent(
+        id=event_id,
+        rule_id=rule.id,
+        message=output.message,
+        importance=output.importance.lower(),
+        timestamp=now,
+        is_acknowledged=False,
+        category=rule.category,
+        ticker=output.ticker,
+        prefect_flow_run_id=output.metadata.get("flow_run_id"),
+        prefect_state=output.metadata.get("initial_state"),
+        trace_id=Tracer.current_trace_id(),
+    )
+
+
+class EventStore:
+    """Shared, durable event log in the Sentinel database.
+
+    Event ids come from a database-backed sequence handed out in blocks, so
+    every process (UI sessions, the ingestion API, workers) draws from one id
+    space without a round-trip per event. Writes are group committed: callers
+    enqueue rows and a single committer task flushes everything queued so far
+    in one transaction. Each transaction stamps its rows with a new version,
+    which readers use as a change-feed cursor.
+
+    Dashboards own the acknowledgement fields (USER_FIELDS) of a stored
+    event and the processes that evaluate alerts own the rest: a commit from
+    ``USER_SOURCE`` only changes USER_FIELDS of an existing event, and any
+    other commit keeps the stored USER_FIELDS. A repeat merged into a stale
+    copy can therefore not undo an acknowledgement, and an acknowledgement
+    can not roll back a newer repeat count.
+    """
+
+    ID_BLOCK_SIZE = 1000
+    MAX_GROUP_SIZE = 5000
+    USER_SOURCE = "ui"
+    USER_FIELDS = ("is_acknowledged", "acknowledged_timestamp", "comment")
+
+    _id_lock = threading.Lock()
+    _next_id = 0
+    _id_limit = 0
+    _queue: asyncio.Queue | None = None
+    _committer: asyncio.Task | None = None
+
+    @classmethod
+    def _reserve_block(cls, size: int) -> int:
+        conn = database.get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT next_value FROM id_sequence WHERE name = 'events'"
+            ).fetchone()
+            if row is None:
+                max_row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()
+                start = max_row[0] + 1
+                conn.execute(
+                    "INSERT INTO id_sequence (name, next_value) VALUES ('events', ?)",
+                    (start + size,),
+                )
+            else:
+                start = row[0]
+                conn.execute(
+                    "UPDATE id_sequence SET next_value = ? WHERE name = 'events'",
+                    (start + size,),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return start
+
+    @classmethod
+    def allocate_ids(cls, count: int = 1) -> list[int]:
+        """Return ``count`` unique event ids, reserving a new block when needed."""
+        with cls._id_lock:
+            ids = []
+            while len(ids) < count:
+                if cls._next_id >= cls._id_limit:
+                    size = max(cls.ID_BLOCK_SIZE, count - len(ids))
+                    cls._next_id = cls._reserve_block(size)
+                    cls._id_limit = cls._next_id + size
+                take = min(count - len(ids), cls._id_limit - cls._next_id)
+                ids.extend(range(cls._next_id, cls._next_id + take))
+                cls._next_id += take
+            return ids
+
+    @classmethod
+    def next_id(cls) -> int:
+        return cls.allocate_ids(1)[0]
+
+    @classmethod
+    def _merge_stored(
+        cls, conn, rows: list[tuple[AlertEvent, str]]
+    ) -> list[tuple[AlertEvent, str]]:
+        """Apply field ownership (see class docstring) against the stored rows."""
+        ids = list({event.id for event, _ in rows})
+        stored = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            marks = ",".join("?" * len(chunk))
+            stored.update(
+                conn.execute(
+                    f"SELECT id, data FROM events WHERE id IN ({marks})", chunk
+                ).fetchall()
+            )
+        merged = []
+        for event, source in rows:
+            data = stored.get(event.id)
+            if data is not None:
+                old = AlertEvent.parse_raw(data)
+                if source == cls.USER_SOURCE:
+                    event = old.copy(
+                        update={f: getattr(event, f) for f in cls.USER_FIELDS}
+                    )
+                else:
+                    event = event.copy(
+                        update={f: getattr(old, f) for f in cls.USER_FIELDS}
+                    )
+            stored[event.id] = event.json()
+            merged.append((event, source))
+        return merged
+
+    @classmethod
+    def _write_group(cls, rows: list[tuple[AlertEvent, str]]) -> int:
+        conn = database.get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute(
+                "SELECT COALESCE(MAX(version), 0) + 1 FROM events"
+            ).fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO events (id, version, source, data) VALUES (?, ?, ?, ?)",
+                [
+                    (event.id, version, source, event.json())
+                    for event, source in cls._merge_stored(conn, rows)
+                ],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return version
+
+    @classmethod
+    async def _run_committer(cls):
+        while True:
+            batch = [await cls._queue.get()]
+            while not cls._queue.empty() and len(batch) < cls.MAX_GROUP_SIZE:
+                batch.append(cls._queue.get_nowait())
+            rows = [row for rows, _ in batch for row in rows]
+            try:
+                version = await asyncio.to_thread(cls._write_group, rows)
+            except Exception as e:
+                logging.exception(f"Event store group commit failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(version)
+
+    @classmethod
+    async def commit(cls, events: list[AlertEvent], source: str = "ui") -> int:
+        """Durably write (insert or replace) events; returns the commit version."""
+        if not events:
+            return 0
+        if cls._committer is None or cls._committer.done():
+            cls._queue = asyncio.Queue()
+            cls._committer = asyncio.get_running_loop().create_task(
+                cls._run_committer()
+            )
+        future = asyncio.get_running_loop().create_future()
+        with Tracer.span("store.commit", events=len(events), source=source):
+            cls._queue.put_nowait(([(e, source) for e in events], future))
+            return await future
+
+    @staticmethod
+    def open_events() -> tuple[int, list[AlertEvent]]:
+        """Return (latest_version, unresolved unacknowledged events).
+
+        Lets a process start following the change feed without replaying it.
+        """
+        conn = database.get_connection()
+        conn.execute("BEGIN")
+        try:
+            version = conn.execute(
+                "SELECT COALESCE(MAX(version), 0) FROM events"
+            ).fetchone()[0]
+            rows = conn.execute(
+                "SELECT data FROM events "
+                "WHERE json_extract(data, '$.is_resolved') = 0 "
+                "AND json_extract(data, '$.is_acknowledged') = 0 ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.commit()
+        return version, [AlertEvent.parse_raw(data) for (data,) in rows]
+
+    @staticmethod
+    def iter_newest_first(page_size: int = 1000) -> Iterator[AlertEvent]:
+        """Yield every stored event, newest first, one keyset page at a time.
+
+        Each page is a separate query, so the iterator can be advanced from
+        different threads (as a streaming response does).
+        """
+        timestamp = "COALESCE(json_extract(data, '$.timestamp'), '')"
+        cursor = None
+        while True:
+            where, params = "", ()
+            if cursor is not None:
+                # Spelled out rather than a row value so SQLite seeks the index.
+                where = f"WHERE {timestamp} <= ? AND ({timestamp} < ? OR id < ?) "
+                params = (cursor[0], cursor[0], cursor[1])
+            rows = (
+                database.get_connection()
+                .execute(
+                    f"SELECT {timestamp}, id, data FROM events {where}"
+                    f"ORDER BY {timestamp} DESC, id DESC LIMIT ?",
+                    (*params, page_size),
+                )
+                .fetchall()
+            )
+            for _, _, data in rows:
+                yield AlertEvent.parse_raw(data)
+            if len(rows) < page_size:
+                return
+            cursor = rows[-1][:2]
+
+    @staticmethod
+    def changes_since(version: int, limit: int = 5000) -> tuple[int, list[AlertEvent]]:
+        """Return (latest_version, events) written after ``version``."""
+        rows = (
+            database.get_connection()
+            .execute(
+                "SELECT version, data FROM events WHERE version > ? ORDER BY version, id LIMIT ?",
+                (version, limit),
+            )
+            .fetchall()
+        )
+        if not rows:
+            return version, []
+        if len(rows) == limit:
+            last = rows[-1][0]
+            if rows[0][0] != last:
+                rows = [r for r in rows if r[0] != last]
+            else:
+                rows = (
+                    database.get_connection()
+                    .execute(
+                        "SELECT version, data FROM events WHERE version = ? ORDER BY id",
+                        (last,),
+                    )
+                    .fetchall()
+                )
+        return rows[-1][0], [AlertEvent.parse_raw(data) for _, data in rows]
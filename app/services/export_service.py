@@ -0,0 +1,175 @@
+import csv
+import io
+import json
+import logging
+import secrets
+import time
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timedelta
+from app.models import AlertEvent
+from app.services import database
+from app.services.event_store import EventStore
+
+HISTORY_EXPORT_FIELDS = [
+    "id",
+    "rule_id",
+    "timestamp",
+    "importance",
+    "category",
+    "ticker",
+    "message",
+    "is_acknowledged",
+    "acknowledged_timestamp",
+    "comment",
+    "is_resolved",
+    "repeat_count",
+    "incident_id",
+    "prefect_flow_run_id",
+    "prefect_state",
+]
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+
+def _export_row(event: AlertEvent) -> list:
+    return [
+        event.id,
+        event.rule_id,
+        event.timestamp.strftime("%Y-%m-%d %H:%M:%S") if event.timestamp else "",
+        event.importance,
+        event.category,
+        event.ticker or "",
+        event.message,
+        event.is_acknowledged,
+        event.acknowledged_timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        if event.acknowledged_timestamp
+        else "",
+        event.comment or "",
+        event.is_resolved,
+        event.repeat_count,
+        event.incident_id or "",
+        event.prefect_flow_run_id or "",
+        event.prefect_state or "",
+    ]
+
+
+def iter_csv(events: Iterable[AlertEvent], chunk_size: int = 1000) -> Iterator[str]:
+    """Yield CSV text in chunks of ``chunk_size`` rows, reusing one buffer."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HISTORY_EXPORT_FIELDS)
+    rows = 0
+    for event in events:
+        writer.writerow(_export_row(event))
+        rows += 1
+        if rows >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue()
+
+
+def iter_ndjson(events: Iterable[AlertEvent], chunk_size: int = 1000) -> Iterator[str]:
+    """Yield newline-delimited JSON in chunks of ``chunk_size`` events."""
+    lines = []
+    for event in events:
+        lines.append(
+            json.dumps(dict(zip(HISTORY_EXPORT_FIELDS, _export_row(event))), default=str)
+        )
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def history_filter(criteria: dict[str, str]) -> Callable[[AlertEvent], bool]:
+    """Predicate for the History page filters.
+
+    ``criteria`` has the page's ``importance``, ``prefect_state``,
+    ``search``, ``start_date`` and ``end_date`` values ("All" or "" when
+    unset); unparsable dates are ignored.
+    """
+    importance = criteria.get("importance", "All")
+    prefect_state = criteria.get("prefect_state", "All")
+    search = criteria.get("search", "").lower()
+    start = end = None
+    try:
+        if criteria.get("start_date"):
+            start = datetime.strptime(criteria["start_date"], "%Y-%m-%d")
+        if criteria.get("end_date"):
+            end = datetime.strptime(criteria["end_date"], "%Y-%m-%d")
+            end += timedelta(days=1)
+    except ValueError as e:
+        logging.exception(f"Error parsing history date filter: {e}")
+
+    def matches(event: AlertEvent) -> bool:
+        if importance != "All" and event.importance != importance.lower():
+            return False
+        if prefect_state == "None":
+            if event.prefect_state:
+                return False
+        elif prefect_state != "All" and event.prefect_state != prefect_state:
+            return False
+        if search and search not in event.message.lower():
+            return False
+        if start and not (event.timestamp and event.timestamp >= start):
+            return False
+        if end and not (event.timestamp and event.timestamp < end):
+            return False
+        return True
+
+    return matches
+
+
+class ExportRegistry:
+    """Short-lived handoff of export jobs from UI state to the download route.
+
+    The state registers the history filter criteria (see ``history_filter``)
+    in the shared database and gets back a one-time token, so any backend
+    process can serve the download. The route streams the matching events
+    straight from the EventStore, newest first, without loading the history
+    into memory.
+    """
+
+    TTL_SECONDS = 600
+
+    @classmethod
+    def register(cls, criteria: dict[str, str], fmt: str) -> str:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+        now = time.time()
+        token = secrets.token_urlsafe(16)
+        conn = database.get_connection()
+        conn.execute(
+            "DELETE FROM export_jobs WHERE created_at < ?", (now - cls.TTL_SECONDS,)
+        )
+        conn.execute(
+            "INSERT INTO export_jobs (token, format, criteria, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (token, fmt, json.dumps(criteria), now),
+        )
+        conn.commit()
+        return token
+
+    @classmethod
+    def take(cls, token: str) -> tuple[str, dict[str, str]] | None:
+        conn = database.get_connection()
+        row = conn.execute(
+            "DELETE FROM export_jobs WHERE token = ? "
+            "RETURNING format, criteria, created_at",
+            (token,),
+        ).fetchone()
+        conn.commit()
+        if row is None or time.time() - row[2] > cls.TTL_SECONDS:
+            return None
+        return row[0], json.loads(row[1])
+
+    @classmethod
+    def stream(cls, fmt: str, criteria: dict[str, str]) -> Iterator[str]:
+        events = filter(history_filter(criteria), EventStore.iter_newest_first())
+        return iter_csv(events) if fmt == "csv" else iter_ndjson(events)
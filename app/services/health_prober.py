@@ -0,0 +1,273 @@
+import asyncio
+import functools
+import ipaddress
+import os
+import socket
+import time
+from dataclasses import dataclass
+import httpcore
+import httpx
+from app.services.metrics import LatencyHistogram, Metrics
+
+PROBE_TIMER = "sentinel_health_probe_duration_seconds"
+PROBE_FAILURES = "sentinel_health_probe_failures_total"
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    url: str
+    healthy: bool
+    status_code: int | None
+    latency: float
+    error: str
+    probed_at: float
+
+
+class _CachingResolverBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that resolves host names once per ``dns_ttl`` seconds.
+
+    Resolution happens when a connection is opened, so requests keep their
+    URL: the connection pool is keyed by host name, and the ``Host`` header
+    and TLS server name are the original host, as without the cache.
+    """
+
+    def __init__(self, dns_ttl: float):
+        self.dns_ttl = dns_ttl
+        self._backend = httpcore.AnyIOBackend()
+        self._addresses: dict[tuple[str, int], tuple[float, str]] = {}
+        self._resolving: dict[tuple[str, int], asyncio.Task] = {}
+
+    async def _lookup(self, key: tuple[str, int]) -> str:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                key[0], key[1], type=socket.SOCK_STREAM
+            )
+            address = infos[0][4][0]
+            self._addresses[key] = (time.monotonic() + self.dns_ttl, address)
+            return address
+        finally:
+            self._resolving.pop(key, None)
+
+    async def resolve(self, host: str, port: int) -> str:
+        key = (host, port)
+        cached = self._addresses.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        task = self._resolving.get(key)
+        if task is None:
+            task = asyncio.create_task(self._lookup(key))
+            self._resolving[key] = task
+        return await asyncio.shield(task)
+
+    def forget(self, host: str, port: int):
+        self._addresses.pop((host, port), None)
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options=None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return await self._backend.connect_tcp(
+                host, port, timeout, local_address, socket_options
+            )
+        try:
+            address = await asyncio.wait_for(self.resolve(host, port), timeout)
+        except asyncio.TimeoutError:
+            raise httpcore.ConnectTimeout(f"Timed out resolving {host}") from None
+        except OSError as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}") from e
+        try:
+            return await self._backend.connect_tcp(
+                address, port, timeout, local_address, socket_options
+            )
+        except httpcore.ConnectError:
+            # The address may have moved; resolve again next time.
+            self.forget(host, port)
+            raise
+
+    async def connect_unix_socket(
+        self, path: str, timeout: float | None = None, socket_options=None
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+class _CachingResolverTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport whose connection pool uses ``_CachingResolverBackend``."""
+
+    def __init__(self, dns_ttl: float, limits: httpx.Limits):
+        super().__init__(limits=limits)
+        self.resolver = _CachingResolverBackend(dns_ttl)
+        # httpx doesn't take a network backend, so rebuild its pool with one.
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=self.resolver,
+        )
+
+
+class HealthProber:
+    """Probes HTTP health endpoints concurrently over one shared client.
+
+    All probes share a pooled keep-alive client whose transport caches DNS
+    lookups, and each host has a semaphore capping its in-flight probes, so
+    hundreds of endpoints can be probed at once without flooding any one
+    service. An endpoint is healthy when it answers ``GET`` with a 2xx status
+    within ``timeout`` seconds.
+
+    Probes are shared: ``probe(url, max_age)`` returns the latest result if
+    it is younger than ``max_age`` seconds, joins a probe of that URL already
+    in flight, and only otherwise starts a new one. Per-endpoint latency
+    histograms back ``latency_percentile``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency_per_host: int = 8,
+        max_connections: int = 200,
+        timeout: float = 5.0,
+        dns_ttl: float = 300.0,
+    ):
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.dns_ttl = dns_ttl
+        self._client: httpx.AsyncClient | None = None
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._results: dict[str, ProbeResult] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._latency: dict[str, LatencyHistogram] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            )
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=_CachingResolverTransport(self.dns_ttl, limits=limits),
+                trust_env=False,
+            )
+            self._hosts.clear()
+        return self._client
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency_per_host)
+            self._hosts[host] = semaphore
+        return semaphore
+
+    async def _probe(self, url: str) -> ProbeResult:
+        client = self._get_client()
+        try:
+            host = httpx.URL(url).host
+        except httpx.InvalidURL:
+            host = ""
+        status_code = None
+        error = ""
+        async with self._semaphore(host):
+            start = time.perf_counter()
+            try:
+                response = await client.get(url)
+                status_code = response.status_code
+                if not response.is_success:
+                    error = f"HTTP {status_code}"
+            except httpx.TimeoutException:
+                error = f"Timed out after {self.timeout:g}s"
+            except (httpx.HTTPError, httpx.InvalidURL, OSError) as e:
+                error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            latency = time.perf_counter() - start
+        Metrics.observe(PROBE_TIMER, latency, host=host)
+        if error:
+            Metrics.inc(PROBE_FAILURES, host=host)
+        histogram = self._latency.get(url)
+        if histogram is None:
+            histogram = self._latency[url] = LatencyHistogram()
+        histogram.record(latency)
+        result = ProbeResult(
+            url=url,
+            healthy=not error,
+            status_code=status_code,
+            latency=latency,
+            error=error,
+            probed_at=time.monotonic(),
+        )
+        self._results[url] = result
+        return result
+
+    def _start(self, url: str) -> asyncio.Task:
+        task = self._inflight.get(url)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._probe(url))
+            task.add_done_callback(functools.partial(self._finished, url))
+            self._inflight[url] = task
+        return task
+
+    def _finished(self, url: str, task: asyncio.Task):
+        if self._inflight.get(url) is task:
+            del self._inflight[url]
+
+    def latest(self, url: str, max_age: float) -> ProbeResult | None:
+        result = self._results.get(url)
+        if result is not None and time.monotonic() - result.probed_at < max_age:
+            return result
+        return None
+
+    async def probe(self, url: str, max_age: float = 0.0) -> ProbeResult:
+        """Latest result for ``url`` if younger than ``max_age``, else a fresh probe."""
+        result = self.latest(url, max_age)
+        if result is not None:
+            return result
+        return await asyncio.shield(self._start(url))
+
+    def prefetch(self, urls: list[str], max_age: float = 0.0):
+        """Start probes for ``urls`` without waiting; later ``probe`` calls join them."""
+        for url in set(urls):
+            if self.latest(url, max_age) is None:
+                self._start(url)
+
+    async def probe_many(self, urls: list[str], max_age: float = 0.0) -> list:
+        """Probe ``urls`` concurrently; results are in the same order."""
+        return await asyncio.gather(*(self.probe(url, max_age) for url in urls))
+
+    def latency_percentile(self, url: str, pct: float) -> float | None:
+        histogram = self._latency.get(url)
+        return histogram.percentile(pct) if histogram else None
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+
+_prober: HealthProber | None = None
+
+
+def get_health_prober() -> HealthProber:
+    """Return the process-wide health prober."""
+    global _prober
+    if _prober is None:
+        _prober = HealthProber(
+            max_concurrency_per_host=int(
+                os.environ.get("SENTINEL_HEALTH_PROBE_PER_HOST", 8)
+            ),
+            max_connections=int(
+                os.environ.get("SENTINEL_HEALTH_PROBE_MAX_CONNECTIONS", 200)
+            ),
+            timeout=float(os.environ.get("SENTINEL_HEALTH_PROBE_TIMEOUT_SECONDS", 5)),
+            dns_ttl=float(os.environ.get("SENTINEL_HEALTH_DNS_TTL_SECONDS", 300)),
+        )
+    return _prober
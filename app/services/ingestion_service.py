@@ -0,0 +1,108 @@
+import asyncio
+import json
+from datetime import datetime
+from app.models import AlertOutput, AlertRule
+from app.services.alert_recorder import AlertRecorder
+from app.services.dedup_service import IMPORTANCE_RANK
+from app.services.rule_store import RuleStore
+from app.services.tracing import Tracer
+
+
+class IngestionService:
+    """Turns externally generated AlertOutputs into stored events.
+
+    Payloads are AlertOutput fields (``timestamp`` defaults to receipt time,
+    ``importance`` is one of IMPORTANCE_RANK) plus optional ``rule_id`` (default 0),
+    ``category`` (default "External") and ``suppression_window_seconds``.
+    They are recorded through the same AlertRecorder path as the rule
+    workers: deduplicated against the store's open events, committed to the
+    EventStore, and, when ``rule_id`` names a stored rule, that rule's email
+    and webhook actions run for new events. Invalid payloads raise
+    ValueError, which the API answers with 400.
+    """
+
+    DEFAULT_CATEGORY = "External"
+
+    _recorder: AlertRecorder | None = None
+    _lock: asyncio.Lock | None = None
+
+    @staticmethod
+    def parse(payload: dict) -> tuple[AlertRule, AlertOutput]:
+        """Validate one payload, raising ValueError with a readable message."""
+        if not isinstance(payload, dict):
+            raise ValueError("Payload must be a JSON object")
+        try:
+            output = AlertOutput.parse_obj(
+                {"timestamp": datetime.utcnow().isoformat(), **payload}
+            )
+        except Exception as e:
+            raise ValueError(str(e)) from e
+        if output.importance.lower() not in IMPORTANCE_RANK:
+            raise ValueError(
+                f"importance must be one of {', '.join(IMPORTANCE_RANK)}, "
+                f"got {output.importance!r}"
+            )
+        category = payload.get("category") or IngestionService.DEFAULT_CATEGORY
+        if not isinstance(category, str):
+            raise ValueError("category must be a string")
+        try:
+            rule_id = int(payload.get("rule_id") or 0)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"rule_id must be an integer: {e}") from e
+        rule = AlertRule(id=rule_id, name="External", category=category)
+        if payload.get("suppression_window_seconds") is not None:
+            try:
+                window = int(payload["suppression_window_seconds"])
+            except (TypeError, ValueError) as e:
+                raise ValueError(
+                    f"suppression_window_seconds must be an integer: {e}"
+                ) from e
+            if window < 0:
+                raise ValueError("suppression_window_seconds must not be negative")
+            rule.suppression_window_seconds = window
+        return rule, output
+
+    @staticmethod
+    def parse_ndjson(body: bytes) -> tuple[list[tuple[int, dict]], list[dict]]:
+        """Split an NDJSON body into (line_no, payload) pairs and per-line errors."""
+        payloads, errors = [], []
+        for line_no, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                payloads.append((line_no, json.loads(line)))
+            except ValueError as e:
+                errors.append({"line": line_no, "error": f"Invalid JSON: {e}"})
+        return payloads, errors
+
+    @classmethod
+    async def ingest(cls, items: list[tuple[AlertRule, AlertOutput]]) -> list[dict]:
+        """Apply dedup, assign ids and group commit; returns one result per item."""
+        with Tracer.span("ingest", items=len(items)):
+            return await cls._ingest(items)
+
+    @classmethod
+    async def _ingest(cls, items: list[tuple[AlertRule, AlertOutput]]) -> list[dict]:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+            cls._recorder = AlertRecorder("api")
+        stored = {r.id: r for r in RuleStore.load()}
+        results = []
+        async with cls._lock:
+            now = datetime.utcnow()
+            cls._recorder.begin()
+            for rule, output in items:
+                if known := stored.get(rule.id):
+                    # Alerts filed under a stored rule run that rule's actions.
+                    rule.name = known.name
+                    rule.action_config = known.action_config
+                action, events = cls._recorder.record(rule, output, now)
+                if action == "resolved":
+                    results.append(
+                        {"action": action, "event_ids": [e.id for e in events]}
+                    )
+                else:
+                    results.append({"action": action, "event_id": events[0].id})
+            changed = cls._recorder.finish()
+        await cls._recorder.commit(changed)
+        return results
@@ -0,0 +1,93 @@
+import json
+import logging
+import random
+import threading
+import time
+from app.services import database
+
+
+class MetricSnapshots:
+    """Latest metric values per ticker, read by expression rules.
+
+    Snapshots are pushed through ``POST /api/snapshots/{ticker}`` (or
+    ``update``) and merged key by key into the shared database, so rule
+    workers in other processes see them. Each process reads them back at
+    most every REFRESH_SECONDS. Tickers nobody has pushed yet get simulated
+    values, like the other mock triggers, so expression rules produce output
+    out of the box.
+    """
+
+    REFRESH_SECONDS = 1.0
+
+    _lock = threading.Lock()
+    _snapshots: dict[str, dict[str, float]] = {}
+    _loaded_at: float | None = None
+
+    @classmethod
+    def update(cls, ticker: str, values: dict) -> dict[str, float]:
+        """Merge numeric ``values`` into a ticker's snapshot; raises ValueError."""
+        cleaned = {}
+        for name, value in values.items():
+            if not isinstance(name, str) or not name.isidentifier():
+                raise ValueError(f"Invalid metric name {name!r}")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Metric '{name}' must be a number, got {value!r}")
+            cleaned[name] = float(value)
+        conn = database.get_connection()
+        # json_patch merges in one statement, so concurrent pushes don't race.
+        row = conn.execute(
+            "INSERT INTO metric_snapshots (ticker, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(ticker) DO UPDATE SET "
+            "data = json_patch(data, excluded.data), updated_at = excluded.updated_at "
+            "RETURNING data",
+            (ticker, json.dumps(cleaned), time.time()),
+        ).fetchone()
+        conn.commit()
+        snapshot = json.loads(row[0])
+        with cls._lock:
+            # Copy-on-write: readers keep a consistent snapshot without locking.
+            cls._snapshots = {**cls._snapshots, ticker: snapshot}
+        return snapshot
+
+    @classmethod
+    def _refresh(cls):
+        now = time.monotonic()
+        if cls._loaded_at is not None and now - cls._loaded_at < cls.REFRESH_SECONDS:
+            return
+        cls._loaded_at = now
+        try:
+            rows = database.get_connection().execute(
+                "SELECT ticker, data FROM metric_snapshots"
+            )
+            snapshots = {ticker: json.loads(data) for ticker, data in rows}
+        except Exception as e:
+            logging.exception(f"Error loading metric snapshots: {e}")
+            return
+        with cls._lock:
+            cls._snapshots = snapshots
+
+    @classmethod
+    def get(cls, ticker: str) -> dict[str, float]:
+        cls._refresh()
+        snapshot = cls._snapshots.get(ticker)
+        return snapshot if snapshot is not None else cls.simulate(ticker)
+
+    @staticmethod
+    def simulate(ticker: str) -> dict[str, float]:
+        return {
+            "price": random.uniform(100, 220),
+            "volume_pct": random.uniform(50, 350),
+            "cpu": random.uniform(10, 100),
+            "memory_mb": random.uniform(200, 700),
+            "latency_ms": random.uniform(5, 500),
+            "error_rate": random.uniform(0, 0.1),
+        }
+
+    @classmethod
+    def clear(cls):
+        conn = database.get_connection()
+        conn.execute("DELETE FROM metric_snapshots")
+        conn.commit()
+        with cls._lock:
+            cls._snapshots = {}
+            cls._loaded_at = None
@@ -0,0 +1,424 @@
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from app.services import database
+
+PROMETHEUS_BUCKETS = [
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+]
+
+
+class LatencyHistogram:
+    """HDR-style log-linear latency histogram with fixed relative error.
+
+    Values are recorded in microseconds. Each power-of-two range is split into
+    ``2**sub_bucket_bits`` linear sub-buckets, so recording is O(1) and any
+    percentile is accurate to ~1/2**sub_bucket_bits (about 6% by default)
+    across the whole range, from microseconds to hours.
+    """
+
+    __slots__ = ("sub_bucket_bits", "counts", "count", "total", "max_value")
+
+    def __init__(self, sub_bucket_bits: int = 4):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max_value = 0
+
+    def _index(self, value: int) -> int:
+        if value < (1 << self.sub_bucket_bits):
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        return ((shift + 1) << self.sub_bucket_bits) + (value >> shift) - (
+            1 << self.sub_bucket_bits
+        )
+
+    def _upper_bound(self, index: int) -> int:
+        """Highest microsecond value that maps to ``index``."""
+        sub = 1 << self.sub_bucket_bits
+        if index < sub:
+            return index
+        shift = (index >> self.sub_bucket_bits) - 1
+        mantissa = (index & (sub - 1)) + sub
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        micros = max(0, int(seconds * 1_000_000))
+        index = self._index(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max_value = max(self.max_value, micros)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max_value = max(self.max_value, other.max_value)
+
+    def to_dict(self) -> dict:
+        return {
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "counts": sorted(self.counts.items()),
+            "count": self.count,
+            "total": self.total,
+            "max_value": self.max_value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        histogram = cls(data["sub_bucket_bits"])
+        histogram.counts = {int(index): count for index, count in data["counts"]}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.max_value = data["max_value"]
+        return histogram
+
+    def percentile(self, pct: float) -> float:
+        """Latency in seconds at or below which ``pct`` percent of samples fall."""
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(self.count * pct / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_value) / 1_000_000
+        return self.max_value / 1_000_000
+
+    def cumulative_buckets(self, bounds: list[float]) -> list[int]:
+        """Sample counts at or below each bound (in seconds), for Prometheus."""
+        ordered = sorted(self.counts.items())
+        result, seen, i = [], 0, 0
+        for bound in bounds:
+            limit = bound * 1_000_000
+            while i < len(ordered) and self._upper_bound(ordered[i][0]) <= limit:
+                seen += ordered[i][1]
+                i += 1
+            result.append(seen)
+        return result
+
+
+def format_seconds(seconds: float) -> str:
+    """Human readable latency for summaries (µs, ms or s)."""
+    if seconds < 0.001:
+        return f"{seconds * 1_000_000:.0f} µs"
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+def _exported_key(key: list) -> tuple:
+    return tuple(tuple(pair) for pair in key)
+
+
+class Metrics:
+    """Process-wide counters, gauges and latency histograms.
+
+    Series are keyed by metric name plus a label dict and rendered in the
+    Prometheus text format by ``render_prometheus``. Gauges registered with
+    ``register_gauge`` are sampled at scrape time. ``export`` copies every
+    series into plain data, which SharedMetrics publishes so one process can
+    show the metrics of all of them (see MetricsView).
+    """
+
+    _lock = threading.Lock()
+    _help: dict[str, tuple[str, str]] = {}
+    _counters: dict[str, dict[tuple, float]] = {}
+    _histograms: dict[str, dict[tuple, LatencyHistogram]] = {}
+    _gauges: dict[str, dict[tuple, Callable[[], float]]] = {}
+
+    @classmethod
+    def describe(cls, name: str, kind: str, help_text: str):
+        cls._help[name] = (kind, help_text)
+
+    @classmethod
+    def inc(cls, name: str, value: float = 1, **labels):
+        key = _label_key(labels)
+        with cls._lock:
+            series = cls._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    @classmethod
+    def observe(cls, name: str, seconds: float, **labels):
+        key = _label_key(labels)
+        with cls._lock:
+            series = cls._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @classmethod
+    @contextmanager
+    def timer(cls, name: str, **labels):
+        """Observe the wall time of the ``with`` block, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.observe(name, time.perf_counter() - start, **labels)
+
+    @classmethod
+    def register_gauge(cls, name: str, sample: Callable[[], float], **labels):
+        """Register a callback sampled at scrape time for one gauge series."""
+        with cls._lock:
+            cls._gauges.setdefault(name, {})[_label_key(labels)] = sample
+
+    @classmethod
+    def counter_values(cls, name: str) -> dict[tuple, float]:
+        with cls._lock:
+            return dict(cls._counters.get(name, {}))
+
+    @classmethod
+    def gauge_values(cls, name: str) -> dict[tuple, float]:
+        with cls._lock:
+            samplers = dict(cls._gauges.get(name, {}))
+        values = {}
+        for key, sample in samplers.items():
+            try:
+                values[key] = sample()
+            except Exception as e:
+                logging.exception(f"Error sampling gauge {name}: {e}")
+        return values
+
+    @classmethod
+    def histogram(
+        cls, name: str, group_by: str | None = None
+    ) -> dict[str, LatencyHistogram]:
+        """Merged copies of a histogram's series, optionally grouped by one label."""
+        merged: dict[str, LatencyHistogram] = {}
+        with cls._lock:
+            for key, histogram in cls._histograms.get(name, {}).items():
+                group = dict(key).get(group_by, "") if group_by else ""
+                target = merged.get(group)
+                if target is None:
+                    target = LatencyHistogram(histogram.sub_bucket_bits)
+                    merged[group] = target
+                target.merge(histogram)
+        return merged
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._counters.clear()
+            cls._histograms.clear()
+
+    @classmethod
+    def export(cls, **extra) -> dict:
+        """JSON-friendly copy of every series, gauges sampled now, plus ``extra``."""
+        with cls._lock:
+            counters = {
+                name: [[list(key), value] for key, value in series.items()]
+                for name, series in cls._counters.items()
+            }
+            histograms = {
+                name: [[list(key), h.to_dict()] for key, h in series.items()]
+                for name, series in cls._histograms.items()
+            }
+            gauge_names = list(cls._gauges)
+        gauges = {
+            name: [[list(key), value] for key, value in cls.gauge_values(name).items()]
+            for name in gauge_names
+        }
+        return {
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": gauges,
+            **extra,
+        }
+
+    @classmethod
+    def render_prometheus(cls) -> str:
+        return MetricsView({"": cls.export()}).render_prometheus()
+
+
+class MetricsView:
+    """Read-only merge of ``Metrics.export`` results keyed by process id.
+
+    The summary accessors add up every process's series; the Prometheus
+    rendering keeps them apart with a ``process`` label (omitted for the
+    empty id).
+    """
+
+    def __init__(self, exports: dict[str, dict]):
+        self.exports = exports
+
+    def _series(self, kind: str, name: str):
+        for process, export in sorted(self.exports.items()):
+            for key, value in export.get(kind, {}).get(name, []):
+                yield process, _exported_key(key), value
+
+    def _summed(self, kind: str, name: str) -> dict[tuple, float]:
+        values: dict[tuple, float] = {}
+        for _, key, value in self._series(kind, name):
+            values[key] = values.get(key, 0) + value
+        return values
+
+    def counter_values(self, name: str) -> dict[tuple, float]:
+        return self._summed("counters", name)
+
+    def gauge_values(self, name: str) -> dict[tuple, float]:
+        return self._summed("gauges", name)
+
+    def histogram(
+        self, name: str, group_by: str | None = None
+    ) -> dict[str, LatencyHistogram]:
+        """Merged histograms of all processes, optionally grouped by one label."""
+        merged: dict[str, LatencyHistogram] = {}
+        for _, key, data in self._series("histograms", name):
+            histogram = LatencyHistogram.from_dict(data)
+            group = dict(key).get(group_by, "") if group_by else ""
+            target = merged.get(group)
+            if target is None:
+                target = merged[group] = LatencyHistogram(histogram.sub_bucket_bits)
+            target.merge(histogram)
+        return merged
+
+    def extra(self, field: str) -> list[tuple[str, object]]:
+        """``(process, item)`` for each item of an ``export(**extra)`` list."""
+        return [
+            (process, item)
+            for process, export in sorted(self.exports.items())
+            for item in export.get(field, [])
+        ]
+
+    def render_prometheus(self) -> str:
+        lines = []
+
+        def header(name: str, default_kind: str):
+            kind, help_text = Metrics._help.get(name, (default_kind, ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def series(kind: str, name: str):
+            rows = []
+            for process, key, value in self._series(kind, name):
+                if process:
+                    key = tuple(sorted(key + (("process", process),)))
+                rows.append((key, value))
+            return sorted(rows, key=lambda row: row[0])
+
+        def names(kind: str) -> list[str]:
+            return sorted(
+                {name for export in self.exports.values() for name in export[kind]}
+            )
+
+        for name in names("counters"):
+            header(name, "counter")
+            for key, value in series("counters", name):
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+        for name in names("histograms"):
+            header(name, "histogram")
+            for key, data in series("histograms", name):
+                histogram = LatencyHistogram.from_dict(data)
+                buckets = histogram.cumulative_buckets(PROMETHEUS_BUCKETS)
+                for bound, seen in zip(PROMETHEUS_BUCKETS, buckets):
+                    labels = _format_labels(key, (("le", f"{bound:g}"),))
+                    lines.append(f"{name}_bucket{labels} {seen}")
+                labels = _format_labels(key, (("le", "+Inf"),))
+                lines.append(f"{name}_bucket{labels} {histogram.count}")
+                lines.append(
+                    f"{name}_sum{_format_labels(key)} {histogram.total:.6f}"
+                )
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        for name in names("gauges"):
+            header(name, "gauge")
+            for key, value in series("gauges", name):
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+class SharedMetrics:
+    """Metrics exports published per process in the shared database.
+
+    Rule workers (in-process and standalone) publish their export on every
+    lease renewal, so ``view`` on a web process covers evaluation that runs
+    elsewhere. Exports older than MAX_AGE_SECONDS belong to stopped
+    processes and are dropped.
+    """
+
+    MAX_AGE_SECONDS = 60.0
+
+    @classmethod
+    def publish(cls, process_id: str, export: dict):
+        now = time.time()
+        conn = database.get_connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO process_metrics (process_id, data, updated_at) "
+            "VALUES (?, ?, ?)",
+            (process_id, json.dumps(export), now),
+        )
+        conn.execute(
+            "DELETE FROM process_metrics WHERE updated_at < ?",
+            (now - cls.MAX_AGE_SECONDS,),
+        )
+        conn.commit()
+
+    @classmethod
+    def view(cls, process_id: str, local: dict) -> MetricsView:
+        """Every live process's export, with ``local`` standing in for this one."""
+        exports = {}
+        try:
+            rows = database.get_connection().execute(
+                "SELECT process_id, data FROM process_metrics WHERE updated_at >= ?",
+                (time.time() - cls.MAX_AGE_SECONDS,),
+            )
+            exports = {row[0]: json.loads(row[1]) for row in rows}
+        except Exception as e:
+            logging.exception(f"Error loading shared metrics: {e}")
+        exports[process_id] = local
+        return MetricsView(exports)
+
+for _name, _kind, _help_text in [
+    ("sentinel_trigger_runs_total", "counter", "Trigger checks executed."),
+    ("sentinel_trigger_fired_total", "counter", "Trigger checks that fired."),
+    ("sentinel_trigger_errors_total", "counter", "Trigger checks that failed."),
+    ("sentinel_trigger_duration_seconds", "histogram", "BaseTrigger.check time."),
+    ("sentinel_sweep_duration_seconds", "histogram", "Rule sweep wall time."),
+    ("sentinel_prefect_api_duration_seconds", "histogram", "Prefect API latency."),
+    ("sentinel_prefect_api_errors_total", "counter", "Failed Prefect API calls."),
+    ("sentinel_prefect_api_rejected_total", "counter", "Prefect calls failed fast."),
+    ("sentinel_prefect_breaker_state", "gauge", "0 closed, 1 half-open, 2 open."),
+    ("sentinel_cache_requests_total", "counter", "Cache lookups by result."),
+    ("sentinel_health_probe_duration_seconds", "histogram", "Health probe latency."),
+    ("sentinel_health_probe_failures_total", "counter", "Unhealthy health probes."),
+    ("sentinel_queue_depth", "gauge", "Notifications awaiting delivery."),
+    ("sentinel_runs_shed_total", "counter", "Late low-priority rule runs skipped."),
+    ("sentinel_run_queue_lag_seconds", "histogram", "Rule run start delay."),
+]:
+    Metrics.describe(_name, _kind, _help_text)
\ No newline at end of file
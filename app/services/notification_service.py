@@ -0,0 +1,380 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import smtplib
+import time
+from email.message import EmailMessage
+from app.models import AlertEvent, AlertRule
+from app.services import database
+from app.services.metrics import Metrics
+
+MAX_SUBJECT_LENGTH = 200
+
+
+def header_value(value: str) -> str:
+    """Collapse whitespace (CR/LF included) so a value is safe in a mail header."""
+    return " ".join(str(value).split())
+
+
+class SmtpConfig:
+    """SMTP connection settings read from SENTINEL_SMTP_* environment variables."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        username: str | None = None,
+        password: str | None = None,
+        sender: str = "sentinel@localhost",
+        starttls: bool = False,
+        timeout: float = 10.0,
+        idle_check_seconds: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.starttls = starttls
+        self.timeout = timeout
+        self.idle_check_seconds = idle_check_seconds
+
+    @classmethod
+    def from_env(cls) -> "SmtpConfig | None":
+        host = os.environ.get("SENTINEL_SMTP_HOST")
+        if not host:
+            return None
+        return cls(
+            host=host,
+            port=int(os.environ.get("SENTINEL_SMTP_PORT", "25")),
+            username=os.environ.get("SENTINEL_SMTP_USER") or None,
+            password=os.environ.get("SENTINEL_SMTP_PASSWORD") or None,
+            sender=os.environ.get("SENTINEL_SMTP_FROM", "sentinel@localhost"),
+            starttls=os.environ.get("SENTINEL_SMTP_STARTTLS", "") == "1",
+            idle_check_seconds=float(
+                os.environ.get("SENTINEL_SMTP_IDLE_CHECK_SECONDS", "30")
+            ),
+        )
+
+
+class SmtpConnectionPool:
+    """Small pool of long-lived SMTP connections shared by the dispatch workers.
+
+    A connection idle for longer than ``idle_check_seconds`` is checked with
+    ``NOOP`` before it is handed out and replaced if the server has dropped it.
+    """
+
+    def __init__(self, config: SmtpConfig, size: int = 2):
+        self.config = config
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.config.host, self.config.port, timeout=self.config.timeout)
+        if self.config.starttls:
+            conn.starttls()
+        if self.config.username:
+            conn.login(self.config.username, self.config.password or "")
+        return conn
+
+    @staticmethod
+    def _is_alive(conn: smtplib.SMTP) -> bool:
+        try:
+            return conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    async def _open(self) -> smtplib.SMTP:
+        self._created += 1
+        try:
+            return await asyncio.to_thread(self._connect)
+        except Exception:
+            self._created -= 1
+            raise
+
+    async def acquire(self) -> smtplib.SMTP:
+        if self._idle.empty() and self._created < self.size:
+            return await self._open()
+        conn, idle_since = await self._idle.get()
+        if time.monotonic() - idle_since > self.config.idle_check_seconds:
+            if not await asyncio.to_thread(self._is_alive, conn):
+                # Likely closed by the server's idle timeout; reconnect.
+                self.release(conn, broken=True)
+                return await self._open()
+        return conn
+
+    def release(self, conn: smtplib.SMTP, broken: bool = False):
+        if broken:
+            self._created -= 1
+            try:
+                conn.close()
+            except Exception as e:
+                logging.exception(f"Error closing SMTP connection: {e}")
+            return
+        self._idle.put_nowait((conn, time.monotonic()))
+
+    async def close(self):
+        while not self._idle.empty():
+            conn, _ = self._idle.get_nowait()
+            self._created -= 1
+            try:
+                await asyncio.to_thread(conn.quit)
+            except Exception as e:
+                logging.exception(f"Error closing SMTP connection: {e}")
+
+
+class NotificationDispatcher:
+    """Durable email outbox drained by a pool of async workers.
+
+    ``enqueue`` only buffers rows; one flush task writes everything buffered
+    to the ``notification_outbox`` table in a single insert off the event
+    loop and wakes the workers, so enqueueing never waits on SQLite or SMTP.
+    Workers wait until a recipient's oldest pending message is
+    ``batch_window`` seconds old, then send everything pending for that
+    recipient as one digest over a pooled connection. Header values are
+    stripped of line breaks. Failures are retried with exponential backoff and marked
+    ``dead`` after ``max_attempts``.
+    """
+
+    CHANNEL = "email"
+
+    def __init__(
+        self,
+        config: SmtpConfig,
+        workers: int = 2,
+        batch_window: float = 5.0,
+        max_attempts: int = 5,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+    ):
+        self.config = config
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._pool: SmtpConnectionPool | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._claim_lock: asyncio.Lock | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._buffer: list[tuple] = []
+        self._flush_task: asyncio.Task | None = None
+
+    @staticmethod
+    def recipients(rule: AlertRule) -> list[str]:
+        try:
+            config = json.loads(rule.action_config or "{}")
+        except ValueError as e:
+            logging.exception(f"Invalid action_config for rule {rule.name}: {e}")
+            return []
+        # A CR/LF in an address would inject headers; skip such entries.
+        return [
+            e
+            for e in config.get("emails", [])
+            if isinstance(e, str) and e and "\r" not in e and "\n" not in e
+        ]
+
+    def enqueue(self, rule: AlertRule, event: AlertEvent) -> int:
+        """Queue an event for every email target of its rule; returns rows added."""
+        recipients = self.recipients(rule)
+        if not recipients:
+            return 0
+        now = time.time()
+        payload = json.dumps(
+            {
+                "event_id": event.id,
+                "rule": rule.name,
+                "importance": event.importance,
+                "ticker": event.ticker,
+                "message": event.message,
+                "timestamp": event.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                if event.timestamp
+                else "",
+            }
+        )
+        self._buffer.extend((self.CHANNEL, r, payload, now, now) for r in recipients)
+        self.start()
+        if self._flush_task is None or self._flush_task.done():
+            loop = asyncio.get_running_loop()
+            self._flush_task = loop.create_task(self._flush())
+        return len(recipients)
+
+    @staticmethod
+    def _insert(rows: list[tuple]):
+        conn = database.get_connection()
+        conn.executemany(
+            "INSERT INTO notification_outbox (channel, recipient, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+
+    async def _flush(self):
+        """Write buffered rows to the outbox until the buffer stays empty."""
+        while self._buffer:
+            rows, self._buffer = self._buffer, []
+            try:
+                await asyncio.to_thread(self._insert, rows)
+            except Exception as e:
+                logging.exception(f"Error writing {len(rows)} outbox rows: {e}")
+                self._buffer[:0] = rows
+                await asyncio.sleep(self.batch_window)
+                continue
+            self._wakeup.set()
+
+    def start(self):
+        """Start the worker tasks on the running loop if they are not running."""
+        if self._tasks and not all(t.done() for t in self._tasks):
+            return
+        self._pool = SmtpConnectionPool(self.config, size=self.workers)
+        self._wakeup = asyncio.Event()
+        self._claim_lock = asyncio.Lock()
+        conn = database.get_connection()
+        conn.execute(
+            "UPDATE notification_outbox SET status = 'pending' WHERE status = 'sending' AND channel = ?",
+            (self.CHANNEL,),
+        )
+        conn.commit()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pool:
+            await self._pool.close()
+
+    def pending_count(self) -> int:
+        row = (
+            database.get_connection()
+            .execute(
+                "SELECT COUNT(*) FROM notification_outbox WHERE channel = ? AND status IN ('pending', 'sending')",
+                (self.CHANNEL,),
+            )
+            .fetchone()
+        )
+        return row[0] + len(self._buffer)
+
+    async def _claim_batch(self) -> tuple[str, list[tuple[int, int, str]]] | None:
+        """Claim all due messages of the recipient with the oldest ripe message."""
+        async with self._claim_lock:
+            now = time.time()
+            conn = database.get_connection()
+            row = conn.execute(
+                "SELECT recipient FROM notification_outbox WHERE channel = ? AND status = 'pending' AND next_attempt_at <= ? AND created_at <= ? ORDER BY next_attempt_at LIMIT 1",
+                (self.CHANNEL, now, now - self.batch_window),
+            ).fetchone()
+            if not row:
+                return None
+            recipient = row[0]
+            rows = conn.execute(
+                "SELECT id, attempts, payload FROM notification_outbox WHERE channel = ? AND status = 'pending' AND recipient = ? AND next_attempt_at <= ? ORDER BY id",
+                (self.CHANNEL, recipient, now),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE notification_outbox SET status = 'sending' WHERE id = ?",
+                [(r[0],) for r in rows],
+            )
+            conn.commit()
+            return recipient, rows
+
+    def _build_message(self, recipient: str, payloads: list[dict]) -> EmailMessage:
+        msg = EmailMessage()
+        msg["From"] = header_value(self.config.sender)
+        msg["To"] = header_value(recipient)
+        if len(payloads) == 1:
+            p = payloads[0]
+            subject = f"[Sentinel] {p['importance'].upper()}: {p['message']}"
+        else:
+            subject = f"[Sentinel] {len(payloads)} new alerts"
+        msg["Subject"] = header_value(subject)[:MAX_SUBJECT_LENGTH]
+        lines = [
+            f"{p['timestamp']} [{p['importance'].upper()}] {p['rule']} / {p['ticker'] or '-'}: {p['message']}"
+            for p in payloads
+        ]
+        msg.set_content("\n".join(lines))
+        return msg
+
+    async def _send(self, recipient: str, rows: list[tuple[int, int, str]]):
+        msg = self._build_message(recipient, [json.loads(r[2]) for r in rows])
+        smtp = await self._pool.acquire()
+        try:
+            await asyncio.to_thread(smtp.send_message, msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self._pool.release(smtp, broken=True)
+            raise
+        except Exception:
+            self._pool.release(smtp)
+            raise
+        self._pool.release(smtp)
+
+    def _mark_failed(self, rows: list[tuple[int, int, str]], error: str):
+        now = time.time()
+        updates = []
+        for row_id, attempts, _ in rows:
+            attempts += 1
+            if attempts >= self.max_attempts:
+                updates.append(("dead", attempts, now, error, row_id))
+            else:
+                delay = min(self.base_backoff * 2 ** (attempts - 1), self.max_backoff)
+                delay *= random.uniform(0.8, 1.2)
+                updates.append(("pending", attempts, now + delay, error, row_id))
+        conn = database.get_connection()
+        conn.executemany(
+            "UPDATE notification_outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            updates,
+        )
+        conn.commit()
+
+    async def _worker(self):
+        while True:
+            try:
+                batch = await self._claim_batch()
+                if batch is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.batch_window)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                recipient, rows = batch
+                try:
+                    await self._send(recipient, rows)
+                except Exception as e:
+                    logging.exception(f"Error sending alert email to {recipient}: {e}")
+                    self._mark_failed(rows, str(e))
+                    continue
+                conn = database.get_connection()
+                conn.executemany(
+                    "UPDATE notification_outbox SET status = 'sent', attempts = attempts + 1 WHERE id = ?",
+                    [(r[0],) for r in rows],
+                )
+                conn.commit()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.exception(f"Notification worker error: {e}")
+                await asyncio.sleep(self.batch_window)
+
+
+_dispatcher: NotificationDispatcher | None = None
+
+
+def get_dispatcher() -> NotificationDispatcher | None:
+    """Return the process-wide email dispatcher, or None if SMTP is not configured."""
+    global _dispatcher
+    if _dispatcher is None:
+        config = SmtpConfig.from_env()
+        if config is None:
+            return None
+        _dispatcher = NotificationDispatcher(config)
+        Metrics.register_gauge(
+            "sentinel_queue_depth", _dispatcher.pending_count, channel="email"
+        )
+    return _dispatcher
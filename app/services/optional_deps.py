@@ -0,0 +1,48 @@
+import importlib.util
+import logging
+import threading
+from collections.abc import Callable
+from types import SimpleNamespace
+
+
+class OptionalDependency:
+    """Lazily imported optional integration (Prefect, pyarrow, ...).
+
+    Nothing is imported until ``load()`` is first called, so backends that
+    never use the integration don't pay for it at startup. ``available()``
+    only checks that the package is installed, without importing it. A
+    failed import is logged once and then reported as unavailable.
+    """
+
+    def __init__(self, package: str, loader: Callable[[], SimpleNamespace]):
+        self.package = package
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value: SimpleNamespace | None = None
+
+    def available(self) -> bool:
+        if self._loaded:
+            return self._value is not None
+        return importlib.util.find_spec(self.package) is not None
+
+    def load(self) -> SimpleNamespace | None:
+        """Import on first use; returns the loader's namespace or None."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        self._value = self._loader()
+                    except ImportError as e:
+                        logging.exception(
+                            f"Optional dependency '{self.package}' not found: {e}"
+                        )
+                        self._value = None
+                    self._loaded = True
+        return self._value
+
+    def override(self, value: SimpleNamespace | None):
+        """Install a stand-in namespace (e.g. a fake client for benchmarks)."""
+        with self._lock:
+            self._value = value
+            self._loaded = True
\ No newline at end of file
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import shutil
+import time
+from types import SimpleNamespace
+from app.models import AlertEvent
+from app.services.event_store import EventStore
+from app.services.optional_deps import OptionalDependency
+
+WATERMARK_FILE = "_watermark.json"
+
+
+def _load_pyarrow() -> SimpleNamespace:
+    import pyarrow
+    import pyarrow.parquet
+
+    return SimpleNamespace(pa=pyarrow, pq=pyarrow.parquet)
+
+
+pyarrow = OptionalDependency("pyarrow", _load_pyarrow)
+
+
+def _arrow_schema(pa):
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("rule_id", pa.int64()),
+            ("timestamp", pa.timestamp("us")),
+            ("importance", pa.string()),
+            ("ticker", pa.string()),
+            ("message", pa.string()),
+            ("is_acknowledged", pa.bool_()),
+            ("acknowledged_timestamp", pa.timestamp("us")),
+            ("comment", pa.string()),
+            ("is_resolved", pa.bool_()),
+            ("repeat_count", pa.int32()),
+            ("incident_id", pa.int64()),
+            ("prefect_flow_run_id", pa.string()),
+            ("prefect_state", pa.string()),
+            ("store_version", pa.int64()),
+        ]
+    )
+
+
+class ParquetExporter:
+    """Writes event history as a Hive-partitioned Parquet dataset.
+
+    Files land under ``day=YYYY-MM-DD/category=<name>/`` so pandas, duckdb and
+    pyarrow.dataset can prune partitions; ``category`` is carried by the
+    partition path only. Events are read from the EventStore change feed,
+    and the watermark is the store version reached by the last export. An
+    incremental export writes every event committed after it, including
+    updates to events exported before (acknowledgements, repeats). Those
+    appear again in a later part, so readers keep the row with the highest
+    ``store_version`` per ``id``. A snapshot rewrites the whole dataset with
+    one row per event.
+    """
+
+    def __init__(self, base_dir: str | None = None, batch_size: int = 10000):
+        self.base_dir = base_dir or os.environ.get(
+            "SENTINEL_EXPORT_DIR", os.path.join("exports", "parquet")
+        )
+        self.batch_size = batch_size
+
+    @staticmethod
+    def available() -> bool:
+        return pyarrow.available()
+
+    def read_watermark(self) -> int:
+        path = os.path.join(self.base_dir, WATERMARK_FILE)
+        try:
+            with open(path) as f:
+                return int(json.load(f).get("store_version", 0))
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logging.exception(f"Error reading export watermark {path}: {e}")
+            return 0
+
+    def _write_watermark(self, version: int):
+        path = os.path.join(self.base_dir, WATERMARK_FILE)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"store_version": version, "exported_at": time.time()}, f)
+        os.replace(tmp, path)
+
+    def _record_batch(self, pa, schema, events: list[AlertEvent], version: int):
+        return pa.RecordBatch.from_pydict(
+            {
+                "id": [e.id for e in events],
+                "rule_id": [e.rule_id for e in events],
+                "timestamp": [e.timestamp for e in events],
+                "importance": [e.importance for e in events],
+                "ticker": [e.ticker for e in events],
+                "message": [e.message for e in events],
+                "is_acknowledged": [e.is_acknowledged for e in events],
+                "acknowledged_timestamp": [e.acknowledged_timestamp for e in events],
+                "comment": [e.comment for e in events],
+                "is_resolved": [e.is_resolved for e in events],
+                "repeat_count": [e.repeat_count for e in events],
+                "incident_id": [e.incident_id for e in events],
+                "prefect_flow_run_id": [e.prefect_flow_run_id for e in events],
+                "prefect_state": [e.prefect_state for e in events],
+                "store_version": [version] * len(events),
+            },
+            schema=schema,
+        )
+
+    def _write_part(self, pa, pq, events: list[AlertEvent], low: int, high: int):
+        """Write one part file per partition for the changes in ``(low, high]``."""
+        partitions: dict[tuple[str, str], list[AlertEvent]] = {}
+        for event in events:
+            if not event.timestamp:
+                continue
+            key = (event.timestamp.strftime("%Y-%m-%d"), event.category or "General")
+            partitions.setdefault(key, []).append(event)
+        schema = _arrow_schema(pa)
+        part_name = f"part-{low + 1:012d}-{high:012d}.parquet"
+        for (day, category), rows in partitions.items():
+            safe_category = category.replace("/", "_").replace("=", "_")
+            directory = os.path.join(
+                self.base_dir, f"day={day}", f"category={safe_category}"
+            )
+            os.makedirs(directory, exist_ok=True)
+            rows.sort(key=lambda e: e.id)
+            with pq.ParquetWriter(
+                os.path.join(directory, part_name), schema, compression="zstd"
+            ) as writer:
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start : start + self.batch_size]
+                    writer.write_batch(self._record_batch(pa, schema, batch, high))
+        return sum(len(rows) for rows in partitions.values()), len(partitions)
+
+    def export(self, snapshot: bool = False) -> dict:
+        """Export store changes and return {"events", "files", "watermark"} stats."""
+        arrow = pyarrow.load()
+        if arrow is None:
+            raise RuntimeError("pyarrow is required for Parquet export")
+        if snapshot and os.path.isdir(self.base_dir):
+            shutil.rmtree(self.base_dir)
+        os.makedirs(self.base_dir, exist_ok=True)
+        watermark = 0 if snapshot else self.read_watermark()
+        exported = files = 0
+        while True:
+            # One change feed page at a time keeps memory bounded.
+            version, events = EventStore.changes_since(watermark, self.batch_size)
+            if not events:
+                break
+            written, parts = self._write_part(
+                arrow.pa, arrow.pq, events, watermark, version
+            )
+            exported += written
+            files += parts
+            watermark = version
+            self._write_watermark(watermark)
+        return {"events": exported, "files": files, "watermark": watermark}
@@ -1,33 +1,166 @@
+import asyncio
 import logging
 import uuid
 import os
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+from typing import TypeVar
 import httpx
+from app.models import PREFECT_STATES
+from app.services.metrics import Metrics
+from app.services.optional_deps import OptionalDependency
+from app.services.resilience import CallRejected, CircuitBreaker, TokenBucket
+from app.services.tracing import Tracer
+from app.services.ttl_cache import TTLCache
+
+T = TypeVar("T")
 
-try:
+
+def _load_prefect() -> SimpleNamespace:
     from prefect.client.orchestration import get_client
     from prefect.client.schemas.filters import FlowRunFilter, FlowRunFilterId
-except ImportError as e:
-    logging.exception(f"Optional dependency 'prefect' not found: {e}")
-    get_client = None
-from app.models import PREFECT_STATES
+
+    return SimpleNamespace(
+        get_client=get_client,
+        FlowRunFilter=FlowRunFilter,
+        FlowRunFilterId=FlowRunFilterId,
+    )
+
+
+prefect = OptionalDependency("prefect", _load_prefect)
+
+PREFECT_API_TIMER = "sentinel_prefect_api_duration_seconds"
+PREFECT_API_ERRORS = "sentinel_prefect_api_errors_total"
+PREFECT_API_REJECTED = "sentinel_prefect_api_rejected_total"
+PREFECT_BREAKER_STATE = "sentinel_prefect_breaker_state"
+
+
+def _is_client_error(error: BaseException) -> bool:
+    """Whether a failed call was refused for its own input (4xx), not server health."""
+    response = getattr(error, "response", None)
+    if response is None:
+        response = getattr(getattr(error, "http_exc", None), "response", None)
+    status = getattr(response, "status_code", 0)
+    return 400 <= status < 500 and status not in (408, 429)
 
 
 class PrefectSyncService:
-    """Service to interact with Prefect API."""
+    """Service to interact with Prefect API.
+
+    Every API call goes through a circuit breaker for its endpoint and a
+    token bucket shared by all endpoints (see ``_call``). While an
+    endpoint's breaker is open, or the bucket stays empty for longer than
+    ``SENTINEL_PREFECT_RATE_MAX_WAIT_SECONDS``, calls fail fast with the same
+    empty result as a failed call instead of waiting on an unhealthy server.
+
+    Deployment metadata is cached (``deployment_cache``): the deployment list
+    is served from cache and refreshed in the background once stale, and a
+    trigger only reads its deployment when it isn't cached yet.
+    """
 
     DEFAULT_API_URL = "http://localhost:4200/api"
 
+    _breakers: dict[str, CircuitBreaker] = {}
+    _limiter: TokenBucket | None = None
+    _deployment_cache: TTLCache | None = None
+
     @staticmethod
     def _get_api_url() -> str:
         return os.environ.get("PREFECT_API_URL", PrefectSyncService.DEFAULT_API_URL)
 
+    @classmethod
+    def breaker(cls, endpoint: str) -> CircuitBreaker:
+        breaker = cls._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                endpoint,
+                window=int(os.environ.get("SENTINEL_PREFECT_BREAKER_WINDOW", 20)),
+                min_calls=int(os.environ.get("SENTINEL_PREFECT_BREAKER_MIN_CALLS", 5)),
+                failure_rate=float(
+                    os.environ.get("SENTINEL_PREFECT_BREAKER_FAILURE_RATE", 0.5)
+                ),
+                open_seconds=float(
+                    os.environ.get("SENTINEL_PREFECT_BREAKER_OPEN_SECONDS", 30)
+                ),
+            )
+            cls._breakers[endpoint] = breaker
+            Metrics.register_gauge(
+                PREFECT_BREAKER_STATE, breaker.state_value, endpoint=endpoint
+            )
+        return breaker
+
+    @classmethod
+    def breakers(cls) -> list[CircuitBreaker]:
+        return [cls._breakers[name] for name in sorted(cls._breakers)]
+
+    @classmethod
+    def limiter(cls) -> TokenBucket:
+        if cls._limiter is None:
+            rate = float(os.environ.get("SENTINEL_PREFECT_RATE_LIMIT", 10))
+            burst = float(os.environ.get("SENTINEL_PREFECT_RATE_BURST", 20))
+            cls._limiter = TokenBucket(rate, burst)
+        return cls._limiter
+
+    @classmethod
+    def deployment_cache(cls) -> TTLCache:
+        """Deployment rows by ``(api_url, id)``; the list by ``(api_url, None)``."""
+        if cls._deployment_cache is None:
+            cls._deployment_cache = TTLCache(
+                "prefect_deployments",
+                ttl=float(
+                    os.environ.get("SENTINEL_PREFECT_DEPLOYMENT_TTL_SECONDS", 300)
+                ),
+                stale_seconds=float(
+                    os.environ.get("SENTINEL_PREFECT_DEPLOYMENT_STALE_SECONDS", 3600)
+                ),
+            )
+        return cls._deployment_cache
+
+    @classmethod
+    async def _call(cls, endpoint: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run one Prefect API call behind its breaker, the rate limit and a timeout.
+
+        Raises ``CallRejected`` when the call is refused without being made.
+        """
+        breaker = cls.breaker(endpoint)
+        try:
+            breaker.before_call()
+            try:
+                await cls.limiter().acquire(
+                    float(os.environ.get("SENTINEL_PREFECT_RATE_MAX_WAIT_SECONDS", 1)),
+                    name=f"prefect.{endpoint}",
+                )
+            except CallRejected:
+                breaker.release()
+                raise
+        except CallRejected as e:
+            Metrics.inc(PREFECT_API_REJECTED, operation=endpoint, reason=e.reason)
+            raise
+        timeout = float(os.environ.get("SENTINEL_PREFECT_TIMEOUT_SECONDS", 10))
+        try:
+            with (
+                Metrics.timer(PREFECT_API_TIMER, operation=endpoint),
+                Tracer.span(f"prefect.{endpoint}"),
+            ):
+                result = await asyncio.wait_for(call(), timeout)
+        except Exception as e:
+            Metrics.inc(PREFECT_API_ERRORS, operation=endpoint)
+            breaker.record(_is_client_error(e))
+            raise
+        except BaseException:
+            breaker.record(False)
+            raise
+        breaker.record(True)
+        return result
+
     @staticmethod
     async def get_batch_flow_run_states(flow_run_ids: list[str]) -> dict[str, str]:
         """Fetch states for multiple flow runs."""
         api_url = PrefectSyncService._get_api_url()
         if not api_url:
             return {}
-        if not get_client:
+        client_api = prefect.load()
+        if client_api is None:
             logging.warning(
                 "Prefect client not available (prefect package not installed or import failed)."
             )
@@ -41,30 +174,65 @@ class PrefectSyncService:
                 continue
         if not valid_uuids:
             return {}
+
+        async def read_flow_runs():
+            async with client_api.get_client() as client:
+                return await client.read_flow_runs(
+                    flow_run_filter=client_api.FlowRunFilter(
+                        id=client_api.FlowRunFilterId(any_=valid_uuids)
+                    )
+                )
+
         try:
             os.environ["PREFECT_API_URL"] = PrefectSyncService._get_api_url()
-            async with get_client() as client:
-                runs = await client.read_flow_runs(
-                    flow_run_filter=FlowRunFilter(id=FlowRunFilterId(any_=valid_uuids))
-                )
-                return {str(run.id): run.state.name for run in runs}
+            runs = await PrefectSyncService._call("read_flow_runs", read_flow_runs)
+            return {str(run.id): run.state.name for run in runs}
+        except CallRejected as e:
+            logging.warning(f"Skipped Prefect flow run sync: {e}")
+            return {}
         except Exception as e:
             logging.exception(f"Error fetching Prefect flow runs: {e}")
             return {}
 
     @staticmethod
-    async def get_deployments() -> list[dict]:
-        """Fetch all available deployments."""
-        if not get_client:
+    def _deployment_row(deployment) -> dict:
+        return {
+            "id": str(deployment.id),
+            "name": deployment.name,
+            "flow_id": str(deployment.flow_id),
+        }
+
+    @staticmethod
+    async def get_deployments(refresh: bool = False) -> list[dict]:
+        """Fetch all available deployments (cached, see ``deployment_cache``)."""
+        client_api = prefect.load()
+        if client_api is None:
             return []
+        api_url = PrefectSyncService._get_api_url()
+        cache = PrefectSyncService.deployment_cache()
+
+        async def read_deployments():
+            async with client_api.get_client() as client:
+                return await client.read_deployments()
+
+        async def load() -> list[dict]:
+            deployments = await PrefectSyncService._call(
+                "read_deployments", read_deployments
+            )
+            rows = [PrefectSyncService._deployment_row(d) for d in deployments]
+            # Prime the per-deployment entries used by trigger_deployment.
+            for row in rows:
+                cache.put((api_url, row["id"]), row)
+            return rows
+
         try:
-            os.environ["PREFECT_API_URL"] = PrefectSyncService._get_api_url()
-            async with get_client() as client:
-                deployments = await client.read_deployments()
-                return [
-                    {"id": str(d.id), "name": d.name, "flow_id": str(d.flow_id)}
-                    for d in deployments
-                ]
+            os.environ["PREFECT_API_URL"] = api_url
+            if refresh:
+                cache.invalidate((api_url, None))
+            return list(await cache.get((api_url, None), load))
+        except CallRejected as e:
+            logging.warning(f"Skipped fetching Prefect deployments: {e}")
+            return []
         except Exception as e:
             logging.exception(f"Error fetching Prefect deployments: {e}")
             return []
@@ -74,19 +242,49 @@ class PrefectSyncService:
         deployment_id: str, parameters: dict = None
     ) -> str | None:
         """Trigger a deployment by ID."""
-        if not get_client:
+        client_api = prefect.load()
+        if client_api is None:
             logging.warning("Prefect client not available, cannot trigger deployment.")
             return None
         try:
-            os.environ["PREFECT_API_URL"] = PrefectSyncService._get_api_url()
-            async with get_client() as client:
-                dep_uuid = uuid.UUID(deployment_id)
-                deployment = await client.read_deployment(dep_uuid)
-                flow_run = await client.create_flow_run_from_deployment(
-                    deployment.id, parameters=parameters or {}
+            dep_uuid = uuid.UUID(deployment_id)
+        except ValueError as e:
+            logging.exception(f"Invalid deployment id '{deployment_id}': {e}")
+            return None
+        api_url = PrefectSyncService._get_api_url()
+        cache = PrefectSyncService.deployment_cache()
+        cache_key = (api_url, str(dep_uuid))
+
+        async def read_deployment():
+            async with client_api.get_client() as client:
+                return await client.read_deployment(dep_uuid)
+
+        async def load() -> dict:
+            deployment = await PrefectSyncService._call(
+                "read_deployment", read_deployment
+            )
+            return PrefectSyncService._deployment_row(deployment)
+
+        async def create_flow_run():
+            async with client_api.get_client() as client:
+                return await client.create_flow_run_from_deployment(
+                    dep_uuid, parameters=parameters or {}
                 )
-                return str(flow_run.id)
+
+        try:
+            os.environ["PREFECT_API_URL"] = api_url
+            await cache.get(cache_key, load)
+            flow_run = await PrefectSyncService._call(
+                "trigger_deployment", create_flow_run
+            )
+            return str(flow_run.id)
+        except CallRejected as e:
+            logging.warning(f"Skipped triggering deployment {deployment_id}: {e}")
+            return None
         except Exception as e:
+            if _is_client_error(e):
+                # e.g. the deployment was deleted since it was cached.
+                cache.invalidate(cache_key)
             logging.exception(f"Error triggering deployment {deployment_id}: {e}")
             return None
 
@@ -98,16 +296,25 @@ class PrefectSyncService:
             return {"success": False, "error": "Prefect API URL is not configured."}
         try:
             health_url = f"{target_url.rstrip('/')}/health"
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(health_url)
-                if response.status_code == 200:
-                    return {"success": True, "message": "Connected to Prefect"}
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Health check failed: Status {response.status_code}",
-                    }
+            with (
+                Metrics.timer(PREFECT_API_TIMER, operation="health"),
+                Tracer.span("prefect.health"),
+            ):
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.get(health_url)
+            if response.status_code == 200:
+                # A manual check that passes lets open breakers probe right away.
+                for breaker in PrefectSyncService.breakers():
+                    breaker.retry_now()
+                return {"success": True, "message": "Connected to Prefect"}
+            else:
+                Metrics.inc(PREFECT_API_ERRORS, operation="health")
+                return {
+                    "success": False,
+                    "error": f"Health check failed: Status {response.status_code}",
+                }
         except httpx.ConnectError as e:
+            Metrics.inc(PREFECT_API_ERRORS, operation="health")
             logging.exception(
                 f"Prefect connection failed: Unable to connect to {target_url}. Error: {e}"
             )
@@ -116,6 +323,7 @@ class PrefectSyncService:
                 "error": f"Connection refused at {target_url}. Is the server running?",
             }
         except Exception as e:
+            Metrics.inc(PREFECT_API_ERRORS, operation="health")
             logging.exception(f"Error checking Prefect connection: {e}")
             msg = str(e)
             return {"success": False, "error": f"Connection failed: {msg}"}
@@ -123,4 +331,4 @@ class PrefectSyncService:
     @staticmethod
     def get_ui_url(flow_run_id: str, base_url: str = "http://localhost:4200") -> str:
         """Get the UI URL for a flow run."""
-        return f"{base_url}/flow-runs/flow-run/{flow_run_id}"
\ No newline at end of file
+        return f"{base_url}/flow-runs/flow-run/{flow_run_id}"
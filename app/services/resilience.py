@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+# Gauge values for ``sentinel_prefect_breaker_state``.
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CallRejected(Exception):
+    """A call refused locally, before it reached the remote service."""
+
+    reason = "rejected"
+
+
+class CircuitOpenError(CallRejected):
+    reason = "circuit_open"
+
+
+class RateLimitedError(CallRejected):
+    reason = "rate_limited"
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over the outcomes of the last calls.
+
+    Closed, calls pass and their outcomes fill a window of the last
+    ``window`` calls. Once the window holds at least ``min_calls`` outcomes
+    and the failing fraction reaches ``failure_rate`` the breaker opens:
+    ``before_call`` raises ``CircuitOpenError`` without touching the
+    network. After ``open_seconds`` it turns half-open and admits up to
+    ``half_open_calls`` probes; if they all succeed it closes with an empty
+    window, and any failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+    ):
+        self.name = name
+        self.min_calls = max(1, min_calls)
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+        self.opens = 0
+        self._outcomes: deque[bool] = deque(maxlen=max(window, self.min_calls))
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+        return self._state
+
+    def _trip(self, now: float):
+        self._state = OPEN
+        self._opened_at = now
+        self.opens += 1
+
+    def _failure_fraction(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def state_value(self) -> float:
+        return STATE_VALUES[self.state]
+
+    def before_call(self):
+        """Admit a call or raise ``CircuitOpenError``."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == OPEN:
+                retry_in = self.open_seconds - (now - self._opened_at)
+                raise CircuitOpenError(
+                    f"{self.name} circuit open, retrying in {retry_in:.0f}s"
+                )
+            if state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    raise CircuitOpenError(f"{self.name} circuit half-open, probing")
+                self._probes += 1
+
+    def release(self):
+        """Give back an admitted call that never ran (e.g. rate limited)."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record(self, success: bool):
+        """Record the outcome of an admitted call."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == OPEN:
+                # A slow call admitted before the breaker tripped.
+                return
+            if state == HALF_OPEN:
+                if not success:
+                    self._trip(now)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_calls:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+            self._outcomes.append(success)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and self._failure_fraction() >= self.failure_rate
+            ):
+                self._trip(now)
+
+    def retry_now(self):
+        """End an open period early, so the next call is a half-open probe."""
+        with self._lock:
+            if self._state == OPEN:
+                self._opened_at = time.monotonic() - self.open_seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            retry_in = (
+                max(0.0, self.open_seconds - (now - self._opened_at))
+                if state == OPEN
+                else 0.0
+            )
+            return {
+                "name": self.name,
+                "state": state,
+                "failure_rate": self._failure_fraction(),
+                "calls": len(self._outcomes),
+                "opens": self.opens,
+                "retry_in": retry_in,
+            }
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` calls per second in bursts of ``capacity``.
+
+    A ``rate`` of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is free."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    async def acquire(self, max_wait: float, name: str = "call"):
+        """Wait up to ``max_wait`` seconds for a token; raises ``RateLimitedError``."""
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitedError(f"{name} rate limited ({self.rate:g}/s)")
+            await asyncio.sleep(wait)
@@ -0,0 +1,69 @@
+import json
+import threading
+from typing import Any
+from app.alert_runner import AlertRunner
+from app.models import AlertRule
+from app.services.trigger_state import TriggerStateStore
+
+
+class RuleParams:
+    """Validated rule parameters, cached per rule and parameter string.
+
+    ``AlertRule.parameters`` stays the JSON text users edit. It is parsed and
+    validated into the trigger's ``params_schema`` object (or a plain dict
+    for triggers without one) once per edit: the cached value is reused
+    until the parameter string or trigger script changes, which also resets
+    the rule's persisted trigger state. Invalid parameters are cached as
+    their error message, so a bad rule fails fast on every sweep without
+    being re-parsed. The returned object
+    is shared between runs and must be treated as read-only by triggers.
+    """
+
+    _lock = threading.Lock()
+    _cache: dict[int, tuple[tuple[str, str], Any, str | None]] = {}
+
+    @staticmethod
+    def parse(parameters: str) -> dict:
+        """Parse a parameter string into a dict; raises ValueError."""
+        params = json.loads(parameters or "{}")
+        if not isinstance(params, dict):
+            raise ValueError(
+                f"Rule parameters must be a JSON object, got {type(params).__name__}"
+            )
+        return params
+
+    @staticmethod
+    def validate(trigger_script: str, parameters: str) -> Any:
+        """Validate parameters for a trigger, e.g. when a rule is saved."""
+        raw = RuleParams.parse(parameters)
+        if not trigger_script or trigger_script == "custom":
+            return raw
+        trigger_class = AlertRunner.get_trigger_class(trigger_script)
+        return trigger_class.parse_params(raw) if trigger_class else raw
+
+    @classmethod
+    def get(cls, rule: AlertRule) -> Any:
+        key = (rule.trigger_script, rule.parameters)
+        cached = cls._cache.get(rule.id)
+        if cached is None or cached[0] != key:
+            if cached is not None:
+                # Windows built under the old parameters no longer apply.
+                TriggerStateStore.reset(rule.id)
+            try:
+                cached = (key, cls.validate(rule.trigger_script, rule.parameters), None)
+            except ValueError as e:
+                cached = (key, None, str(e))
+            with cls._lock:
+                cls._cache[rule.id] = cached
+        if cached[2] is not None:
+            raise ValueError(cached[2])
+        return cached[1]
+
+    @classmethod
+    def invalidate(cls, rule_id: int | None = None):
+        """Drop one rule's validated parameters, or all of them."""
+        with cls._lock:
+            if rule_id is None:
+                cls._cache.clear()
+            else:
+                cls._cache.pop(rule_id, None)
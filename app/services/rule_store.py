@@ -0,0 +1,139 @@
+import json
+import time
+from app.models import AlertRule
+from app.services import database
+
+# Runtime fields that stay with the process evaluating the rule.
+RUNTIME_FIELDS = {"last_output", "last_prefect_sync", "last_prefect_state"}
+
+
+class RuleStore:
+    """Alert rule definitions shared through the Sentinel database.
+
+    Every dashboard and evaluation worker (``python -m app.worker``) reads
+    the rules from here. Rules are written one at a time (``save``,
+    ``delete``), never as a session's whole list, so a stale dashboard
+    cannot undo changes made elsewhere; the first load of an empty store
+    seeds the defaults (``seed``). ``load`` re-reads the table only when it
+    changed since the last call. Dashboards can also ask for rules to run
+    now (``request_runs``); the worker owning a rule takes the request on
+    its next poll (``take_run_requests``).
+    """
+
+    _stamp: tuple[int, float] | None = None
+    _rules: list[AlertRule] = []
+
+    @staticmethod
+    def _row(rule: AlertRule, now: float) -> tuple[int, str, float]:
+        return rule.id, json.dumps(rule.dict(exclude=RUNTIME_FIELDS)), now
+
+    @staticmethod
+    def seed(rules: list[AlertRule]) -> bool:
+        """Insert ``rules`` if the store is empty; returns whether they were."""
+        conn = database.get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT COUNT(*) FROM rules").fetchone()[0]:
+                conn.rollback()
+                return False
+            now = time.time()
+            conn.executemany(
+                "INSERT INTO rules (id, data, updated_at) VALUES (?, ?, ?)",
+                [RuleStore._row(rule, now) for rule in rules],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return True
+
+    @staticmethod
+    def save(rule: AlertRule) -> bool:
+        """Insert or update one rule definition; returns whether it changed."""
+        conn = database.get_connection()
+        before = conn.total_changes
+        conn.execute(
+            "INSERT INTO rules (id, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data, "
+            "updated_at = excluded.updated_at WHERE rules.data != excluded.data",
+            RuleStore._row(rule, time.time()),
+        )
+        conn.commit()
+        return conn.total_changes > before
+
+    @staticmethod
+    def delete(rule_id: int) -> bool:
+        """Delete one rule; its worker drops it on the next lease renewal."""
+        conn = database.get_connection()
+        deleted = conn.execute("DELETE FROM rules WHERE id = ?", (rule_id,)).rowcount
+        conn.commit()
+        return deleted > 0
+
+    @staticmethod
+    def request_runs(rule_ids: list[int]):
+        """Ask the workers owning ``rule_ids`` to run them on their next poll."""
+        now = time.time()
+        conn = database.get_connection()
+        conn.executemany(
+            "INSERT OR REPLACE INTO rule_run_requests (rule_id, requested_at) "
+            "VALUES (?, ?)",
+            [(rule_id, now) for rule_id in rule_ids],
+        )
+        conn.commit()
+
+    @staticmethod
+    def pending_runs(rule_ids: list[int]) -> set[int]:
+        """The run requests among ``rule_ids`` that no worker has taken yet."""
+        wanted = set(rule_ids)
+        return {
+            rule_id
+            for (rule_id,) in database.get_connection().execute(
+                "SELECT rule_id FROM rule_run_requests"
+            )
+            if rule_id in wanted
+        }
+
+    @staticmethod
+    def take_run_requests(rule_ids: set[int]) -> set[int]:
+        """Remove and return the pending run requests among ``rule_ids``."""
+        conn = database.get_connection()
+        pending = {
+            rule_id
+            for (rule_id,) in conn.execute("SELECT rule_id FROM rule_run_requests")
+        }
+        if not pending & rule_ids:
+            return set()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            taken = {
+                rule_id
+                for (rule_id,) in conn.execute("SELECT rule_id FROM rule_run_requests")
+                if rule_id in rule_ids
+            }
+            conn.executemany(
+                "DELETE FROM rule_run_requests WHERE rule_id = ?",
+                [(rule_id,) for rule_id in taken],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return taken
+
+    @classmethod
+    def stamp(cls) -> tuple[int, float] | None:
+        """Identifies the rule set returned by the last ``load``."""
+        return cls._stamp
+
+    @classmethod
+    def load(cls) -> list[AlertRule]:
+        """All stored rules, ordered by id."""
+        conn = database.get_connection()
+        count, updated_at = conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(updated_at), 0) FROM rules"
+        ).fetchone()
+        if cls._stamp != (count, updated_at):
+            rows = conn.execute("SELECT data FROM rules ORDER BY id").fetchall()
+            cls._rules = [AlertRule.parse_raw(data) for (data,) in rows]
+            cls._stamp = (count, updated_at)
+        return cls._rules
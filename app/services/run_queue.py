@@ -0,0 +1,74 @@
+import heapq
+import os
+import time
+from collections.abc import Iterator
+from typing import Any
+from app.models import AlertRule
+from app.services.dedup_service import IMPORTANCE_RANK
+from app.services.metrics import Metrics
+from app.services.rule_params import RuleParams
+
+# Runs below this importance may be shed when they are late.
+SHED_BELOW = "high"
+
+
+class RunQueue:
+    """Due rule runs ordered by importance tier, then earliest deadline.
+
+    Critical runs go first, then high, medium and low; within a tier the
+    run whose deadline (its next scheduled fire) is nearest goes first.
+    A medium or low run that has waited longer than the lag budget
+    (``SENTINEL_RUN_LAG_BUDGET_SECONDS``, default 60) by the time it reaches
+    the front is shed: skipped until its next scheduled fire and counted in
+    ``sentinel_runs_shed_total``. Critical and high runs are never shed.
+    """
+
+    def __init__(self, budget_seconds: float | None = None):
+        self.budget_seconds = (
+            budget_seconds
+            if budget_seconds is not None
+            else float(os.environ.get("SENTINEL_RUN_LAG_BUDGET_SECONDS", 60))
+        )
+        self._heap: list[tuple[int, float, int, float, AlertRule]] = []
+        self._seq = 0
+        self.shed: list[AlertRule] = []
+
+    @staticmethod
+    def importance(rule: AlertRule) -> str:
+        importance = (rule.importance or "").lower()
+        return importance if importance in IMPORTANCE_RANK else "medium"
+
+    def push(self, rule: AlertRule, due_at: float, deadline: float):
+        rank = IMPORTANCE_RANK[self.importance(rule)]
+        heapq.heappush(self._heap, (-rank, deadline, self._seq, due_at, rule))
+        self._seq += 1
+
+    def trigger_runs(self) -> list[tuple[str, Any]]:
+        """``(trigger_script, params)`` of the queued runs, without popping them."""
+        runs = []
+        for *_, rule in self._heap:
+            if not rule.trigger_script or rule.trigger_script == "custom":
+                continue
+            try:
+                runs.append((rule.trigger_script, RuleParams.get(rule)))
+            except ValueError:
+                continue
+        return runs
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[AlertRule]:
+        """Pop runs in priority order, shedding late low-priority ones."""
+        while self._heap:
+            neg_rank, _, _, due_at, rule = heapq.heappop(self._heap)
+            importance = self.importance(rule)
+            lag = max(0.0, time.time() - due_at)
+            if -neg_rank < IMPORTANCE_RANK[SHED_BELOW] and lag > self.budget_seconds:
+                self.shed.append(rule)
+                Metrics.inc("sentinel_runs_shed_total", importance=importance)
+                continue
+            Metrics.observe(
+                "sentinel_run_queue_lag_seconds", lag, importance=importance
+            )
+            yield rule
@@ -0,0 +1,250 @@
+import heapq
+import logging
+import math
+from datetime import datetime, timezone
+from app.models import AlertOutput, AlertRule
+from app.services import database
+from app.services.cron import parse_cron
+
+ScheduleEntry = tuple[float, int, str]
+# (schedule key, next fire time, adaptive interval) as kept by ScheduleStore.
+SavedSchedule = tuple[str, float, float | None]
+
+# Adaptive rules run at their floor once the metric reaches NEAR_RATIO of the
+# threshold, and back off (doubling per run) while it stays under QUIET_RATIO.
+NEAR_RATIO = 0.9
+QUIET_RATIO = 0.5
+
+
+def threshold_ratio(output: AlertOutput | None) -> float | None:
+    """``value / threshold`` from a trigger's metadata, if it reports both."""
+    if output is None:
+        return None
+    value = output.metadata.get("value")
+    threshold = output.metadata.get("threshold")
+    if not isinstance(value, (int, float)) or not isinstance(threshold, (int, float)):
+        return None
+    if threshold <= 0:
+        return None
+    return value / threshold
+
+
+class RuleScheduler:
+    """Min-heap of next fire times (epoch seconds) for active rules.
+
+    Rules with ``schedule_cron`` fire on their cron expression; the others
+    every ``period_seconds``, on a fixed cadence from when they were first
+    scheduled. Each heap entry carries the rule's schedule key; ``keys``
+    holds the current key per rule, so entries made stale by an edit or
+    deactivation are dropped lazily when they reach the top. A tick only
+    pops entries that are due, and missed runs (e.g. no worker was running)
+    collapse into one.
+
+    Interval rules with ``adaptive_period`` pick each next interval from
+    their latest output (see ``adaptive_interval``); the interval in use is
+    kept per rule in ``intervals``.
+
+    Fire times outlive the scheduler through ScheduleStore: ``changes``
+    returns the schedules to save, and ``sync`` resumes a rule new to this
+    scheduler from its saved schedule, so a worker restart or a lease moving
+    to another worker doesn't push the rule a whole period out.
+    """
+
+    def __init__(
+        self,
+        heap: list[ScheduleEntry],
+        keys: dict[int, str],
+        intervals: dict[int, float] | None = None,
+    ):
+        self.heap = list(heap)
+        self.keys = dict(keys)
+        self.intervals = dict(intervals or {})
+        self._changed: dict[int, SavedSchedule] = {}
+
+    @staticmethod
+    def schedule_key(rule: AlertRule) -> str:
+        if rule.schedule_cron:
+            return f"cron:{rule.schedule_cron}"
+        if rule.adaptive_period:
+            return (
+                f"adaptive:{rule.period_seconds}:"
+                f"{rule.min_period_seconds}-{rule.max_period_seconds}"
+            )
+        return f"every:{rule.period_seconds}"
+
+    @staticmethod
+    def adaptive_interval(rule: AlertRule, previous: float) -> float:
+        """Next interval for an adaptive rule given its latest output.
+
+        Triggered or near-threshold rules drop to ``min_period_seconds``;
+        rules well below their threshold double their interval up to
+        ``max_period_seconds``; anything in between, or output without a
+        value/threshold, runs at ``period_seconds``.
+        """
+        floor = max(1, min(rule.min_period_seconds, rule.period_seconds))
+        ceiling = max(rule.max_period_seconds, rule.period_seconds)
+        output = rule.last_output
+        ratio = threshold_ratio(output)
+        if ratio is None:
+            return rule.period_seconds
+        if output.triggered or ratio >= NEAR_RATIO:
+            return floor
+        if ratio <= QUIET_RATIO:
+            return min(ceiling, max(previous, rule.period_seconds) * 2)
+        return rule.period_seconds
+
+    @staticmethod
+    def is_due(heap: list[ScheduleEntry], now: float) -> bool:
+        return bool(heap) and heap[0][0] <= now
+
+    @staticmethod
+    def next_fire(
+        rule: AlertRule, fired_at: float, now: float, interval: float | None = None
+    ) -> float | None:
+        """Next fire time after ``now`` for a rule that last fired at ``fired_at``."""
+        if rule.schedule_cron:
+            after = datetime.fromtimestamp(max(fired_at, now), timezone.utc)
+            fire = parse_cron(rule.schedule_cron).next_fire(after)
+            return fire.timestamp() if fire else None
+        interval = interval or rule.period_seconds
+        if interval <= 0:
+            return None
+        periods = max(0, math.floor((now - fired_at) / interval)) + 1
+        return fired_at + periods * interval
+
+    def _push(self, rule: AlertRule, fired_at: float, now: float, adapt: bool = False):
+        key = self.schedule_key(rule)
+        self.keys[rule.id] = key
+        interval = None
+        if rule.adaptive_period and not rule.schedule_cron:
+            previous = self.intervals.get(rule.id, rule.period_seconds)
+            interval = self.adaptive_interval(rule, previous) if adapt else previous
+            self.intervals[rule.id] = interval
+        else:
+            self.intervals.pop(rule.id, None)
+        try:
+            fire_at = self.next_fire(rule, fired_at, now, interval)
+        except ValueError as e:
+            logging.exception(f"Invalid schedule for rule {rule.name}: {e}")
+            return
+        if fire_at is not None:
+            heapq.heappush(self.heap, (fire_at, rule.id, key))
+            self._changed[rule.id] = (key, fire_at, interval)
+
+    def _resume(self, rule: AlertRule, saved: SavedSchedule):
+        key, fire_at, interval = saved
+        self.keys[rule.id] = key
+        if rule.adaptive_period and not rule.schedule_cron and interval:
+            self.intervals[rule.id] = interval
+        heapq.heappush(self.heap, (fire_at, rule.id, key))
+
+    def sync(
+        self,
+        rules: list[AlertRule],
+        now: float,
+        saved: dict[int, SavedSchedule] | None = None,
+    ):
+        """Schedule new or changed active rules and forget inactive ones.
+
+        Rules new to this scheduler resume from ``saved`` when their saved
+        schedule key still matches; a fire time in the past is due now.
+        """
+        active = set()
+        for rule in rules:
+            if not rule.is_active:
+                continue
+            active.add(rule.id)
+            key = self.schedule_key(rule)
+            if self.keys.get(rule.id) == key:
+                continue
+            resume = (saved or {}).get(rule.id)
+            if rule.id not in self.keys and resume and resume[0] == key:
+                self._resume(rule, resume)
+            else:
+                self._push(rule, now, now)
+        for rule_id in set(self.keys) - active:
+            del self.keys[rule_id]
+            self.intervals.pop(rule_id, None)
+        if len(self.heap) > 2 * len(self.keys) + 64:
+            self.heap = [e for e in self.heap if self.keys.get(e[1]) == e[2]]
+            heapq.heapify(self.heap)
+
+    def changes(self) -> dict[int, SavedSchedule]:
+        """Schedules pushed since the last call, for ``ScheduleStore.save``."""
+        changed, self._changed = self._changed, {}
+        return changed
+
+    def pop_due(self, now: float) -> list[ScheduleEntry]:
+        """Remove and return due entries that are still current."""
+        due = []
+        while self.is_due(self.heap, now):
+            entry = heapq.heappop(self.heap)
+            if self.keys.get(entry[1]) == entry[2]:
+                due.append(entry)
+        return due
+
+    def deadline(self, rule: AlertRule, due_at: float) -> float:
+        """When a run due at ``due_at`` is overtaken by the rule's next fire."""
+        try:
+            deadline = self.next_fire(
+                rule, due_at, due_at, self.intervals.get(rule.id)
+            )
+        except ValueError:
+            deadline = None
+        return deadline if deadline is not None else due_at + rule.period_seconds
+
+    @classmethod
+    def is_current(cls, rule: AlertRule | None, entry: ScheduleEntry) -> bool:
+        """Whether a popped entry still matches an active rule's schedule."""
+        return (
+            rule is not None and rule.is_active and cls.schedule_key(rule) == entry[2]
+        )
+
+    def reschedule(self, rule: AlertRule | None, entry: ScheduleEntry, now: float):
+        """Queue the next run of a popped rule, after it ran."""
+        fired_at, rule_id, key = entry
+        if rule is None or not rule.is_active:
+            self.keys.pop(rule_id, None)
+            self.intervals.pop(rule_id, None)
+        elif self.schedule_key(rule) != key:
+            self._push(rule, now, now)
+        else:
+            self._push(rule, fired_at, now, adapt=True)
+
+
+class ScheduleStore:
+    """Next fire time per rule in the shared database (see RuleScheduler)."""
+
+    @staticmethod
+    def load(rule_ids: set[int]) -> dict[int, SavedSchedule]:
+        if not rule_ids:
+            return {}
+        rows = (
+            database.get_connection()
+            .execute(
+                "SELECT rule_id, schedule_key, next_fire, interval FROM rule_schedules"
+            )
+            .fetchall()
+        )
+        return {row[0]: tuple(row[1:]) for row in rows if row[0] in rule_ids}
+
+    @staticmethod
+    def save(schedules: dict[int, SavedSchedule]):
+        if not schedules:
+            return
+        conn = database.get_connection()
+        conn.executemany(
+            "INSERT OR REPLACE INTO rule_schedules "
+            "(rule_id, schedule_key, next_fire, interval) VALUES (?, ?, ?, ?)",
+            [(rule_id, *saved) for rule_id, saved in schedules.items()],
+        )
+        conn.commit()
+
+    @staticmethod
+    def forget(rule_ids: set[int]):
+        conn = database.get_connection()
+        conn.executemany(
+            "DELETE FROM rule_schedules WHERE rule_id = ?",
+            [(rule_id,) for rule_id in rule_ids],
+        )
+        conn.commit()
@@ -0,0 +1,111 @@
+import bisect
+import hashlib
+from app.services import database
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring mapping keys (rule ids) to worker ids.
+
+    Each worker is placed at ``replicas`` points on the ring and owns the
+    keys that hash up to its points, so adding or removing a worker only
+    moves about ``1/N`` of the keys.
+    """
+
+    def __init__(self, nodes: list[str], replicas: int = 64):
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in set(nodes) for i in range(replicas)
+        )
+        self._points = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, key) -> str | None:
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(str(key))) % len(self._points)
+        return self._nodes[index]
+
+
+class RuleLeases:
+    """Worker heartbeats and time-limited rule leases in the shared database.
+
+    A worker owns a rule only while it holds an unexpired lease on it. A
+    lease can be taken over once it has expired, so the rules of a worker
+    that stops renewing (crashed, partitioned) are picked up by the others
+    within ``ttl`` seconds.
+    """
+
+    @staticmethod
+    def heartbeat(worker_id: str, host: str, now: float):
+        conn = database.get_connection()
+        conn.execute(
+            "INSERT INTO workers (worker_id, host, started_at, heartbeat_at) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(worker_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+            (worker_id, host, now, now),
+        )
+        conn.commit()
+
+    @staticmethod
+    def live_workers(now: float, ttl: float) -> list[str]:
+        rows = (
+            database.get_connection()
+            .execute(
+                "SELECT worker_id FROM workers WHERE heartbeat_at >= ? "
+                "ORDER BY worker_id",
+                (now - ttl,),
+            )
+            .fetchall()
+        )
+        return [worker_id for (worker_id,) in rows]
+
+    @staticmethod
+    def claim(worker_id: str, rule_ids: set[int], now: float, ttl: float) -> set[int]:
+        """Renew or take leases on ``rule_ids``, release the worker's others.
+
+        Returns the rule ids the worker holds afterwards; rules still leased
+        to another live worker are left alone until that lease expires.
+        """
+        conn = database.get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            held = {
+                rule_id
+                for (rule_id,) in conn.execute(
+                    "SELECT rule_id FROM rule_leases WHERE worker_id = ?", (worker_id,)
+                )
+            }
+            conn.executemany(
+                "DELETE FROM rule_leases WHERE rule_id = ? AND worker_id = ?",
+                [(rule_id, worker_id) for rule_id in held - rule_ids],
+            )
+            conn.executemany(
+                "INSERT INTO rule_leases (rule_id, worker_id, expires_at) "
+                "VALUES (?, ?, ?) ON CONFLICT(rule_id) DO UPDATE SET "
+                "worker_id = excluded.worker_id, expires_at = excluded.expires_at "
+                "WHERE rule_leases.worker_id = excluded.worker_id "
+                "OR rule_leases.expires_at < ?",
+                [(rule_id, worker_id, now + ttl, now) for rule_id in rule_ids],
+            )
+            owned = {
+                rule_id
+                for (rule_id,) in conn.execute(
+                    "SELECT rule_id FROM rule_leases WHERE worker_id = ?", (worker_id,)
+                )
+            }
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return owned
+
+    @staticmethod
+    def leave(worker_id: str):
+        """Drop a worker's leases and heartbeat so others take over right away."""
+        conn = database.get_connection()
+        conn.execute("DELETE FROM rule_leases WHERE worker_id = ?", (worker_id,))
+        conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+        conn.commit()
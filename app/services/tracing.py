@@ -0,0 +1,336 @@
+import contextvars
+import json
+import logging
+import math
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import httpx
+
+DEFAULT_OTLP_ENDPOINT = "http://localhost:4318/v1/traces"
+
+
+class Span:
+    """One timed operation in a trace; times are epoch nanoseconds."""
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: str | None,
+        attributes: dict | None = None,
+        start_ns: int | None = None,
+    ):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = 0
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+
+    @property
+    def duration_ms(self) -> float:
+        return max(0, (self.end_ns or time.time_ns()) - self.start_ns) / 1_000_000
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "sentinel_current_span", default=None
+)
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """Lightweight span recorder for the sweep → trigger → event → UI path.
+
+    The active span lives in a ContextVar, so child spans opened in awaited
+    coroutines or tasks created inside a span (asyncio copies the context)
+    attach to the right parent. Finished spans go into a bounded in-memory
+    ring (``SENTINEL_TRACE_CAPACITY``, default 20000) and can be exported as
+    JSON or sent to an OTLP/HTTP collector (``SENTINEL_OTLP_ENDPOINT``).
+    """
+
+    _lock = threading.Lock()
+    _spans: deque = deque(
+        maxlen=int(os.environ.get("SENTINEL_TRACE_CAPACITY", 20000))
+    )
+
+    @staticmethod
+    def new_trace_id() -> str:
+        return secrets.token_hex(16)
+
+    @staticmethod
+    def is_id(value, nbytes: int) -> bool:
+        """Whether ``value`` looks like a trace (16 bytes) or span (8 bytes) id."""
+        return (
+            isinstance(value, str)
+            and len(value) == nbytes * 2
+            and set(value) <= set("0123456789abcdef")
+        )
+
+    @staticmethod
+    def current() -> Span | None:
+        return _current_span.get()
+
+    @staticmethod
+    def current_trace_id() -> str | None:
+        span = _current_span.get()
+        return span.trace_id if span else None
+
+    @classmethod
+    @contextmanager
+    def span(
+        cls,
+        name: str,
+        trace_id: str | None = None,
+        parent_id: str | None = None,
+        **attributes,
+    ):
+        """Open a span as a child of the current one (or of an explicit trace)."""
+        parent = _current_span.get()
+        if trace_id is None:
+            trace_id = parent.trace_id if parent else cls.new_trace_id()
+            parent_id = parent_id or (parent.span_id if parent else None)
+        span = Span(name, trace_id, parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.attributes["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            cls.finish(span)
+
+    @classmethod
+    def record(
+        cls,
+        name: str,
+        trace_id: str,
+        start_ns: int,
+        end_ns: int | None = None,
+        parent_id: str | None = None,
+        **attributes,
+    ) -> Span:
+        """Record an already-measured span, e.g. one closed by a later request."""
+        span = Span(name, trace_id, parent_id, attributes, start_ns=start_ns)
+        cls.finish(span, end_ns)
+        return span
+
+    @classmethod
+    def finish(cls, span: Span, end_ns: int | None = None):
+        span.end_ns = end_ns or time.time_ns()
+        with cls._lock:
+            cls._spans.append(span)
+
+    @classmethod
+    def spans(cls, trace_id: str | None = None, **match) -> list[Span]:
+        """Spans of a trace, oldest first.
+
+        ``match`` narrows a shared trace (e.g. a whole sweep) to one rule or
+        event: spans carrying a matched attribute must have the same value,
+        spans without it (sweep, state mutation, UI push) are kept.
+        """
+        with cls._lock:
+            spans = list(cls._spans)
+        if trace_id is not None:
+            spans = [s for s in spans if s.trace_id == trace_id]
+        for key, value in match.items():
+            spans = [
+                s
+                for s in spans
+                if key not in s.attributes or str(s.attributes[key]) == str(value)
+            ]
+        return sorted(spans, key=lambda s: s.start_ns)
+
+    @classmethod
+    def slowest(cls, name: str, key: str, limit: int = 10) -> list[dict]:
+        """p99 duration per ``key`` attribute of the ring's ``name`` spans.
+
+        Returns up to ``limit`` ``{"key", "p99", "count"}`` rows, slowest
+        first; per-rule latency comes from here rather than from metric
+        labels.
+        """
+        durations: dict[str, list[float]] = {}
+        with cls._lock:
+            spans = [s for s in cls._spans if s.name == name]
+        for span in spans:
+            value = span.attributes.get(key)
+            if value is None or value == "" or span.end_ns is None:
+                continue
+            seconds = (span.end_ns - span.start_ns) / 1e9
+            durations.setdefault(str(value), []).append(seconds)
+        rows = []
+        for value, samples in durations.items():
+            samples.sort()
+            index = max(0, math.ceil(len(samples) * 0.99) - 1)
+            rows.append({"key": value, "p99": samples[index], "count": len(samples)})
+        rows.sort(key=lambda row: row["p99"], reverse=True)
+        return rows[:limit]
+
+    @staticmethod
+    def export_json(spans: list[Span]) -> str:
+        return json.dumps([s.to_dict() for s in spans], default=str)
+
+    @classmethod
+    def to_otlp(cls, spans: list[Span]) -> dict:
+        """Build an OTLP/HTTP JSON ``ExportTraceServiceRequest`` body."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": "sentinel-alerts"},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "app.services.tracing"},
+                            "spans": [
+                                {
+                                    "traceId": s.trace_id,
+                                    "spanId": s.span_id,
+                                    "parentSpanId": s.parent_id or "",
+                                    "name": s.name,
+                                    "kind": 1,
+                                    "startTimeUnixNano": str(s.start_ns),
+                                    "endTimeUnixNano": str(s.end_ns),
+                                    "attributes": [
+                                        {"key": k, "value": _otlp_value(v)}
+                                        for k, v in s.attributes.items()
+                                    ],
+                                    "status": {
+                                        "code": 2 if s.status == "error" else 1
+                                    },
+                                }
+                                for s in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    @classmethod
+    async def export_otlp(cls, spans: list[Span], endpoint: str | None = None) -> int:
+        """POST spans to an OTLP/HTTP collector; returns the number sent."""
+        if not spans:
+            return 0
+        endpoint = endpoint or os.environ.get(
+            "SENTINEL_OTLP_ENDPOINT", DEFAULT_OTLP_ENDPOINT
+        )
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(endpoint, json=cls.to_otlp(spans))
+            response.raise_for_status()
+        return len(spans)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._spans.clear()
+
+
+class OtlpCollectorStandIn:
+    """Minimal local stand-in for an OTLP/HTTP collector.
+
+    Received ``ExportTraceServiceRequest`` bodies are appended as NDJSON to
+    ``SENTINEL_TRACE_DIR`` (default ``exports/traces``) for offline
+    inspection. The route is unauthenticated, so it is only mounted when
+    ``SENTINEL_OTLP_STANDIN=1``; bodies over MAX_PAYLOAD_BYTES are refused,
+    and the file rotates at MAX_FILE_BYTES keeping KEEP_FILES old files.
+    """
+
+    MAX_PAYLOAD_BYTES = int(
+        os.environ.get("SENTINEL_OTLP_MAX_PAYLOAD_BYTES", 1 << 20)
+    )
+    MAX_FILE_BYTES = int(os.environ.get("SENTINEL_OTLP_MAX_FILE_BYTES", 10 << 20))
+    KEEP_FILES = 3
+
+    _lock = threading.Lock()
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.environ.get("SENTINEL_OTLP_STANDIN", "") == "1"
+
+    @staticmethod
+    def path() -> str:
+        base = os.environ.get(
+            "SENTINEL_TRACE_DIR", os.path.join("exports", "traces")
+        )
+        return os.path.join(base, "otlp.ndjson")
+
+    @classmethod
+    def _rotate(cls, path: str):
+        """Shift ``path`` to ``path.1`` (``.1`` to ``.2`` ...), dropping the oldest."""
+        for index in range(cls.KEEP_FILES - 1, 0, -1):
+            if os.path.exists(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+
+    @classmethod
+    def receive(cls, payload: dict) -> int:
+        spans = sum(
+            len(scope.get("spans", []))
+            for resource in payload.get("resourceSpans", [])
+            for scope in resource.get("scopeSpans", [])
+        )
+        path = cls.path()
+        line = json.dumps(payload) + "\n"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with cls._lock:
+                if (
+                    os.path.exists(path)
+                    and os.path.getsize(path) + len(line) > cls.MAX_FILE_BYTES
+                ):
+                    cls._rotate(path)
+                with open(path, "a") as f:
+                    f.write(line)
+        except OSError as e:
+            logging.exception(f"Error writing OTLP payload to {path}: {e}")
+            raise
+        return spans
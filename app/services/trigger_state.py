@@ -0,0 +1,104 @@
+import json
+import logging
+import time
+from app.alert_triggers.window import TimeSeriesWindow
+from app.services import database
+
+
+def _encode(value):
+    if isinstance(value, TimeSeriesWindow):
+        return {"__window__": value.to_dict()}
+    raise TypeError(f"Unsupported trigger state value: {type(value).__name__}")
+
+
+def _decode(obj: dict):
+    if "__window__" in obj and len(obj) == 1:
+        return TimeSeriesWindow.from_dict(obj["__window__"])
+    return obj
+
+
+class TriggerStateStore:
+    """Per-rule trigger state kept in memory with optional database snapshots."""
+
+    _states: dict[int, dict] = {}
+    _dirty: set[int] = set()
+    _last_snapshot: float = 0.0
+    SNAPSHOT_INTERVAL_SECONDS = 60.0
+
+    @classmethod
+    def get(cls, rule_id: int) -> dict:
+        """Return the mutable state dict for a rule, restoring it if snapshotted."""
+        state = cls._states.get(rule_id)
+        if state is None:
+            state = cls._load(rule_id) or {}
+            cls._states[rule_id] = state
+        cls._dirty.add(rule_id)
+        return state
+
+    @classmethod
+    def reset(cls, rule_id: int):
+        """Drop all state for a rule, e.g. after its parameters changed."""
+        cls._states.pop(rule_id, None)
+        cls._dirty.discard(rule_id)
+        try:
+            conn = database.get_connection()
+            conn.execute("DELETE FROM trigger_state WHERE rule_id = ?", (rule_id,))
+            conn.commit()
+        except Exception as e:
+            logging.exception(f"Error clearing trigger state for rule {rule_id}: {e}")
+
+    @classmethod
+    def evict(cls, rule_ids: set[int]):
+        """Snapshot and forget rules another process takes over."""
+        if cls._dirty & rule_ids:
+            cls.snapshot(force=True)
+        for rule_id in rule_ids:
+            cls._states.pop(rule_id, None)
+
+    @classmethod
+    def _load(cls, rule_id: int) -> dict | None:
+        try:
+            row = (
+                database.get_connection()
+                .execute("SELECT state FROM trigger_state WHERE rule_id = ?", (rule_id,))
+                .fetchone()
+            )
+            return json.loads(row[0], object_hook=_decode) if row else None
+        except Exception as e:
+            logging.exception(f"Error loading trigger state for rule {rule_id}: {e}")
+            return None
+
+    @classmethod
+    def snapshot(cls, force: bool = False) -> int:
+        """Persist state of rules touched since the last snapshot.
+
+        Snapshots are throttled to SNAPSHOT_INTERVAL_SECONDS unless forced.
+        Returns the number of rules written.
+        """
+        now = time.time()
+        if not cls._dirty or (
+            not force and now - cls._last_snapshot < cls.SNAPSHOT_INTERVAL_SECONDS
+        ):
+            return 0
+        rows = []
+        for rule_id in cls._dirty:
+            state = cls._states.get(rule_id)
+            if state is None:
+                continue
+            try:
+                rows.append((rule_id, json.dumps(state, default=_encode), now))
+            except (TypeError, ValueError) as e:
+                logging.exception(f"Skipping snapshot of rule {rule_id} state: {e}")
+        try:
+            conn = database.get_connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO trigger_state (rule_id, state, updated_at) VALUES (?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+        except Exception as e:
+            logging.exception(f"Error snapshotting trigger state: {e}")
+            return 0
+        cls._dirty.clear()
+        cls._last_snapshot = now
+        return len(rows)
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+from app.services.metrics import Metrics
+
+CACHE_REQUESTS = "sentinel_cache_requests_total"
+
+
+class TTLCache:
+    """Async cache with a time to live and single-flight loading.
+
+    ``get`` returns a value loaded less than ``ttl`` seconds ago as is. An
+    older value still within ``stale_seconds`` past its TTL is returned too,
+    while one background task reloads it; past that, callers wait for a
+    reload. At most one load per key runs at a time and concurrent callers
+    share its result. Failed loads are not cached.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_seconds: float = 0.0,
+        max_entries: int = 1024,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._loading: dict[Hashable, asyncio.Task] = {}
+
+    def put(self, key: Hashable, value: Any):
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), value)
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, key: Hashable | None = None):
+        """Drop one key, or everything."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def _run(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        try:
+            value = await loader()
+            self.put(key, value)
+            return value
+        finally:
+            if self._loading.get(key) is asyncio.current_task():
+                del self._loading[key]
+
+    def _load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        task = self._loading.get(key)
+        # A task left over from another event loop can't be awaited here.
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._run(key, loader))
+            task.add_done_callback(self._consume)
+            self._loading[key] = task
+        return task
+
+    def _consume(self, task: asyncio.Task):
+        if not task.cancelled():
+            task.exception()
+
+    def _log_refresh(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(
+                f"Background refresh of {self.name} cache failed: {task.exception()}"
+            )
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for ``key``, calling ``loader`` when it must be (re)loaded."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                Metrics.inc(CACHE_REQUESTS, cache=self.name, result="hit")
+                return entry[1]
+            if age < self.ttl + self.stale_seconds:
+                Metrics.inc(CACHE_REQUESTS, cache=self.name, result="stale")
+                self._load(key, loader).add_done_callback(self._log_refresh)
+                return entry[1]
+        Metrics.inc(CACHE_REQUESTS, cache=self.name, result="miss")
+        # Shield the shared load so one caller's cancellation doesn't cancel it.
+        return await asyncio.shield(self._load(key, loader))
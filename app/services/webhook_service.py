@@ -0,0 +1,269 @@
+import asyncio
+import json
+import logging
+import random
+import time
+import httpx
+from app.models import AlertEvent, AlertRule
+from app.services import database
+from app.services.metrics import Metrics
+
+
+class WebhookTarget:
+    """Delivery settings for one webhook URL from a rule's action_config."""
+
+    def __init__(self, url: str, batch: bool = False, headers: dict | None = None):
+        self.url = url
+        self.batch = batch
+        self.headers = headers or {}
+
+    @property
+    def key(self) -> tuple[str, bool, str]:
+        """Targets differing in headers or batching get separate queues."""
+        return (self.url, self.batch, json.dumps(self.headers, sort_keys=True))
+
+    @classmethod
+    def from_config(cls, entry) -> "WebhookTarget | None":
+        if isinstance(entry, str):
+            return cls(entry) if entry else None
+        if isinstance(entry, dict) and entry.get("url"):
+            return cls(
+                entry["url"], bool(entry.get("batch", False)), entry.get("headers")
+            )
+        return None
+
+
+class _Endpoint:
+    __slots__ = ("target", "queue", "semaphore", "task", "held")
+
+    def __init__(
+        self, target: WebhookTarget, semaphore: asyncio.Semaphore, maxsize: int
+    ):
+        self.target = target
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.semaphore = semaphore
+        self.task: asyncio.Task | None = None
+        # Payloads taken off the queue that no delivery owns yet.
+        self.held: list[dict] = []
+
+
+class WebhookDispatcher:
+    """Delivers alert payloads to webhook endpoints over one shared HTTP client.
+
+    Each endpoint (URL plus the rule's headers and batch setting) has its
+    own queue, and a semaphore per URL caps in-flight requests. Batching
+    endpoints collect events for up to ``batch_window`` seconds (or
+    ``max_batch_size`` events) and POST them as one JSON array; others POST
+    one JSON object per event. Failed deliveries are retried with
+    exponential backoff and dead-lettered after ``max_attempts``. Queues
+    hold at most ``max_queue_size`` events; overflow is dead-lettered rather
+    than buffered without bound. ``close`` delivers what is still queued and
+    dead-letters whatever has not gone out when its timeout runs out.
+    """
+
+    def __init__(
+        self,
+        max_concurrency_per_endpoint: int = 4,
+        batch_window: float = 1.0,
+        max_batch_size: int = 100,
+        max_attempts: int = 5,
+        max_queue_size: int = 10_000,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        timeout: float = 10.0,
+    ):
+        self.max_concurrency_per_endpoint = max_concurrency_per_endpoint
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_attempts = max_attempts
+        self.max_queue_size = max_queue_size
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._endpoints: dict[tuple[str, bool, str], _Endpoint] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._deliveries: set[asyncio.Task] = set()
+        self.delivered = 0
+        self.dead_lettered = 0
+
+    @staticmethod
+    def targets(rule: AlertRule) -> list[WebhookTarget]:
+        try:
+            config = json.loads(rule.action_config or "{}")
+        except ValueError as e:
+            logging.exception(f"Invalid action_config for rule {rule.name}: {e}")
+            return []
+        targets = [WebhookTarget.from_config(w) for w in config.get("webhooks", [])]
+        return [t for t in targets if t]
+
+    @staticmethod
+    def payload(rule: AlertRule, event: AlertEvent) -> dict:
+        return {
+            "event_id": event.id,
+            "rule_id": rule.id,
+            "rule": rule.name,
+            "category": event.category,
+            "importance": event.importance,
+            "ticker": event.ticker,
+            "message": event.message,
+            "timestamp": event.timestamp.isoformat() if event.timestamp else None,
+            "incident_id": event.incident_id,
+        }
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return self._client
+
+    def enqueue(self, rule: AlertRule, event: AlertEvent) -> int:
+        """Queue an event for every webhook target of its rule; returns targets hit."""
+        targets = self.targets(rule)
+        if not targets:
+            return 0
+        payload = self.payload(rule, event)
+        for target in targets:
+            endpoint = self._endpoints.get(target.key)
+            if endpoint is None:
+                semaphore = self._semaphores.get(target.url)
+                if semaphore is None:
+                    semaphore = asyncio.Semaphore(self.max_concurrency_per_endpoint)
+                    self._semaphores[target.url] = semaphore
+                endpoint = _Endpoint(target, semaphore, self.max_queue_size)
+                self._endpoints[target.key] = endpoint
+            if endpoint.task is None or endpoint.task.done():
+                endpoint.task = asyncio.get_running_loop().create_task(
+                    self._endpoint_loop(endpoint)
+                )
+            try:
+                endpoint.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                body = [payload] if target.batch else payload
+                self._dead_letter(target, body, 1, "Queue full")
+        return len(targets)
+
+    def queue_depth(self) -> int:
+        return sum(e.queue.qsize() for e in self._endpoints.values())
+
+    async def _collect_batch(self, endpoint: _Endpoint):
+        """Add queued events to ``endpoint.held`` until the batch is due."""
+        deadline = time.monotonic() + self.batch_window
+        while len(endpoint.held) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(endpoint.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            endpoint.held.append(item)
+
+    async def _endpoint_loop(self, endpoint: _Endpoint):
+        while True:
+            endpoint.held = [await endpoint.queue.get()]
+            if endpoint.target.batch:
+                await self._collect_batch(endpoint)
+            await endpoint.semaphore.acquire()
+            items, endpoint.held = endpoint.held, []
+            self._start_delivery(endpoint, items, acquired=True)
+
+    def _start_delivery(self, endpoint: _Endpoint, items: list[dict], acquired: bool):
+        body = items if endpoint.target.batch else items[0]
+        task = asyncio.get_running_loop().create_task(
+            self._deliver(endpoint, body, len(items), acquired)
+        )
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(
+        self, endpoint: _Endpoint, body, count: int, acquired: bool = True
+    ):
+        target = endpoint.target
+        error = ""
+        if not acquired:
+            try:
+                await endpoint.semaphore.acquire()
+            except asyncio.CancelledError:
+                self._dead_letter(target, body, count, "Cancelled on shutdown")
+                raise
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    response = await self._get_client().post(
+                        target.url, json=body, headers=target.headers
+                    )
+                    if response.status_code < 300:
+                        self.delivered += count
+                        return
+                    error = f"HTTP {response.status_code}"
+                    if response.status_code < 500 and response.status_code != 429:
+                        break
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}"
+                if attempt < self.max_attempts:
+                    delay = min(self.base_backoff * 2 ** (attempt - 1), self.max_backoff)
+                    await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            self._dead_letter(target, body, count, error)
+        except asyncio.CancelledError:
+            self._dead_letter(target, body, count, "Cancelled on shutdown")
+            raise
+        except Exception as e:
+            logging.exception(f"Webhook delivery to {target.url} crashed: {e}")
+            self._dead_letter(target, body, count, str(e))
+        finally:
+            endpoint.semaphore.release()
+
+    def _dead_letter(self, target: WebhookTarget, body, count: int, error: str):
+        self.dead_lettered += count
+        logging.error(f"Dead-lettering {count} webhook events for {target.url}: {error}")
+        try:
+            now = time.time()
+            conn = database.get_connection()
+            conn.execute(
+                "INSERT INTO notification_outbox (channel, recipient, payload, status, attempts, next_attempt_at, created_at, last_error) VALUES ('webhook', ?, ?, 'dead', ?, ?, ?, ?)",
+                (target.url, json.dumps(body), self.max_attempts, now, now, error),
+            )
+            conn.commit()
+        except Exception as e:
+            logging.exception(f"Error recording webhook dead letter: {e}")
+
+    async def close(self, timeout: float = 5.0):
+        """Stop the endpoint loops and drain their queues for up to ``timeout``."""
+        loops = [e.task for e in self._endpoints.values() if e.task]
+        for task in loops:
+            task.cancel()
+        await asyncio.gather(*loops, return_exceptions=True)
+        for endpoint in self._endpoints.values():
+            items, endpoint.held = endpoint.held, []
+            while not endpoint.queue.empty():
+                items.append(endpoint.queue.get_nowait())
+            size = self.max_batch_size if endpoint.target.batch else 1
+            for start in range(0, len(items), size):
+                self._start_delivery(
+                    endpoint, items[start : start + size], acquired=False
+                )
+        deliveries = list(self._deliveries)
+        if deliveries:
+            _, pending = await asyncio.wait(deliveries, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+
+
+_dispatcher: WebhookDispatcher | None = None
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    """Return the process-wide webhook dispatcher."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = WebhookDispatcher()
+        Metrics.register_gauge(
+            "sentinel_queue_depth", _dispatcher.queue_depth, channel="webhook"
+        )
+    return _dispatcher
@@ -6,10 +6,24 @@ import math
 import asyncio
 import uuid
 import os
+import time
 from datetime import datetime, timedelta
-from app.models import AlertRule, AlertEvent, LogEntry, PREFECT_STATES
+from app.models import AlertRule, AlertEvent, Incident, LogEntry, PREFECT_STATES
 from app.alert_runner import AlertRunner
 from app.services.prefect_service import PrefectSyncService
+from app.services.rule_store import RUNTIME_FIELDS, RuleStore
+from app.services.correlation_service import IncidentCorrelator
+from app.services.event_filter import EventFilter
+from app.services.export_service import ExportRegistry, history_filter
+from app.services.parquet_export import ParquetExporter
+from app.services.event_store import EventStore
+from app.services.metrics import MetricsView, format_seconds
+from app.services.tracing import Tracer
+from app.worker import cluster_metrics, in_process_worker
+
+# How long "Generate Mock Alerts" waits for the workers to commit results.
+RUN_NOW_POLLS = 10
+RUN_NOW_POLL_SECONDS = 0.5
 
 
 class AlertState(rx.State):
@@ -18,8 +32,12 @@ class AlertState(rx.State):
     rules: list[AlertRule] = []
     events: list[AlertEvent] = []
     next_rule_id: int = 1
-    next_event_id: int = 1
     available_triggers: list[dict] = []
+    incidents: list[Incident] = []
+    next_incident_id: int = 1
+    group_incidents: bool = False
+    _store_version: int = 0
+    _rules_stamp: tuple[int, float] | None = None
 
     @rx.var
     def total_rules(self) -> int:
@@ -49,6 +67,7 @@ class AlertState(rx.State):
 
     current_time: datetime = datetime.utcnow()
     selected_event_id: int = -1
+    selected_incident_id: int = -1
     acknowledgement_comment: str = ""
 
     @rx.event
@@ -82,6 +101,7 @@ class AlertState(rx.State):
         else:
             self.prefect_status_message = result.get("error", "Connection Failed")
             rx.toast.error(f"Failed: {self.prefect_status_message}")
+        self._refresh_prefect_breakers()
 
     @rx.event
     async def fetch_prefect_deployments(self):
@@ -124,6 +144,77 @@ class AlertState(rx.State):
     def set_log_active_tab(self, value: str):
         self.log_active_tab = value
 
+    trace_event_query: str = ""
+    trace_spans: list[dict[str, str]] = []
+    trace_status: str = ""
+
+    @rx.event
+    def set_trace_event_query(self, value: str):
+        self.trace_event_query = value
+
+    def _event_trace_spans(self) -> list:
+        """Spans of the selected event's trace, narrowed to its rule and event."""
+        try:
+            event = self._get_event_by_id(int(self.trace_event_query.strip()))
+        except ValueError:
+            event = None
+        if event is None:
+            self.trace_status = f"Event '{self.trace_event_query}' not found."
+            return []
+        if not event.trace_id:
+            self.trace_status = f"Event {event.id} has no trace."
+            return []
+        spans = Tracer.spans(event.trace_id, rule_id=event.rule_id, event_id=event.id)
+        self.trace_status = (
+            f"Trace {event.trace_id}: {len(spans)} spans"
+            if spans
+            else f"Trace {event.trace_id} has aged out of the span buffer."
+        )
+        return spans
+
+    @rx.event
+    def load_event_trace(self):
+        spans = self._event_trace_spans()
+        if not spans:
+            self.trace_spans = []
+            return
+        origin = spans[0].start_ns
+        total = max(max(s.end_ns for s in spans) - origin, 1)
+        self.trace_spans = [
+            {
+                "name": span.name,
+                "offset": f"{(span.start_ns - origin) / 1_000_000:.1f} ms",
+                "duration": f"{span.duration_ms:.2f} ms",
+                "status": span.status,
+                "attributes": ", ".join(f"{k}={v}" for k, v in span.attributes.items()),
+                "left": f"{(span.start_ns - origin) / total * 100:.2f}%",
+                "width": f"{max((span.end_ns - span.start_ns) / total * 100, 0.5):.2f}%",
+            }
+            for span in spans
+        ]
+
+    @rx.event
+    def export_event_trace_json(self):
+        spans = self._event_trace_spans()
+        if not spans:
+            return rx.toast.error(self.trace_status)
+        return rx.download(
+            data=Tracer.export_json(spans),
+            filename=f"trace_event_{self.trace_event_query.strip()}.json",
+        )
+
+    @rx.event
+    async def export_event_trace_otlp(self):
+        spans = self._event_trace_spans()
+        if not spans:
+            return rx.toast.error(self.trace_status)
+        try:
+            sent = await Tracer.export_otlp(spans)
+        except Exception as e:
+            logging.exception(f"OTLP trace export failed: {e}")
+            return rx.toast.error("OTLP export failed. Is the collector running?")
+        return rx.toast.success(f"Sent {sent} spans to the OTLP collector.")
+
     @rx.event
     def set_log_search_query(self, value: str):
         self.log_search_query = value
@@ -230,6 +321,12 @@ class AlertState(rx.State):
                 return e
         return None
 
+    def _get_incident_by_id(self, incident_id: int) -> Incident | None:
+        for i in self.incidents:
+            if i.id == incident_id:
+                return i
+        return None
+
     live_sort_column: str = "timestamp"
     live_sort_reverse: bool = True
     live_page: int = 1
@@ -265,6 +362,10 @@ class AlertState(rx.State):
         self.quick_filter = value
         self.live_page = 1
 
+    @rx.event
+    def toggle_group_incidents(self, value: bool):
+        self.group_incidents = value
+
     @rx.event
     def set_prefect_state_filter(self, value: str):
         self.prefect_state_filter = value
@@ -290,11 +391,19 @@ class AlertState(rx.State):
             return f"https://logo.clearbit.com/{domain}"
         return f"https://ui-avatars.com/api/?name={ticker}&background=random&color=fff&size=64&font-size=0.4"
 
+    def _incident_summary(self, incident: Incident) -> str:
+        return f"[{incident.importance.upper()}] {incident.title} ({len(incident.event_ids)} alerts)"
+
     def _serialize_event_for_grid(
         self, event: AlertEvent, for_history: bool = False
     ) -> dict:
         """Unified serializer for both blotters."""
-        status_text = "Acknowledged" if event.is_acknowledged else "Pending"
+        if event.is_acknowledged:
+            status_text = "Acknowledged"
+        elif event.is_resolved:
+            status_text = "Resolved"
+        else:
+            status_text = "Pending"
         if for_history:
             action_label = "View Details"
         else:
@@ -324,6 +433,10 @@ class AlertState(rx.State):
             "category": category,
             "message": event.message or "",
             "status": status_text,
+            "repeat_count": event.repeat_count,
+            "last_seen": event.last_seen.strftime("%Y-%m-%d %H:%M:%S")
+            if event.last_seen
+            else "",
             "is_acknowledged": event.is_acknowledged,
             "acknowledged_timestamp": event.acknowledged_timestamp.strftime(
                 "%Y-%m-%d %H:%M:%S"
@@ -339,6 +452,7 @@ class AlertState(rx.State):
             "prefect_link": prefect_link_text,
             "prefect_ui_url": prefect_ui_url,
             "is_critical": is_critical,
+            "incident_id": event.incident_id or 0,
         }
 
     @rx.var
@@ -348,6 +462,11 @@ class AlertState(rx.State):
         Filters relevant events in memory based on importance, recency, and quick filters.
         """
         data = []
+        incident_summaries = (
+            {i.id: self._incident_summary(i) for i in self.incidents}
+            if self.group_incidents
+            else {}
+        )
         critical_high = [
             e
             for e in self.events
@@ -393,7 +512,17 @@ class AlertState(rx.State):
                         continue
                 elif evt_state != self.prefect_state_filter:
                     continue
-            data.append(self._serialize_event_for_grid(event, for_history=False))
+            row = self._serialize_event_for_grid(event, for_history=False)
+            if self.group_incidents:
+                # The group key must stay stable as the incident grows or
+                # escalates, or the grid collapses the expanded group.
+                if event.incident_id in incident_summaries:
+                    row["incident"] = f"INC-{event.incident_id}"
+                    row["incident_summary"] = incident_summaries[event.incident_id]
+                else:
+                    row["incident"] = "Uncorrelated"
+                    row["incident_summary"] = ""
+            data.append(row)
         return data
 
     @rx.event
@@ -468,27 +597,132 @@ class AlertState(rx.State):
 
     @rx.event
     def tick(self, _=None):
-        """Update current time."""
+        """Update current time and merge rule and event changes from the store.
+
+        Rules are evaluated by the process-wide workers (see app/worker.py),
+        not per session, so the tick never waits on a trigger.
+        """
         self.current_time = datetime.utcnow()
+        self._pull_rules()
+        traces = self._pull_store_events()
+        if traces:
+            return AlertState.ack_trace_delivery(traces, str(time.time_ns()))
+
+    def _pull_store_events(self) -> list[dict[str, str]]:
+        """Merge events committed to the shared EventStore since the last pull.
+
+        Returns the (trace_id, parent_id) of a ``state.merge`` span recorded
+        for each traced trace that was merged.
+        """
+        traces = {}
+        started = time.time_ns()
+        try:
+            version, incoming = EventStore.changes_since(self._store_version)
+            while incoming:
+                for event in incoming:
+                    if event.trace_id:
+                        traces.setdefault(event.trace_id, []).append(event.id)
+                self._store_version = version
+                by_id = {e.id: i for i, e in enumerate(self.events)}
+                correlator = IncidentCorrelator(self.incidents, self.next_incident_id)
+                # The store copy wins: it carries acknowledgements from any
+                # dashboard as well as the workers' repeats and resolutions.
+                incoming.sort(key=lambda e: e.timestamp or datetime.min)
+                for event in incoming:
+                    idx = by_id.get(event.id)
+                    is_open = not (event.is_resolved or event.is_acknowledged)
+                    if idx is None:
+                        if is_open:
+                            correlator.assign(event)
+                        self.events.append(event)
+                    else:
+                        event.incident_id = self.events[idx].incident_id
+                        self.events[idx] = event
+                        if is_open:
+                            correlator.touch(event, event.last_seen or event.timestamp)
+                self.next_incident_id = correlator.next_incident_id
+                self.events = list(self.events)
+                # Acknowledgements made on other dashboards close incidents too.
+                self._mark_acknowledged_incidents(
+                    [e for e in incoming if e.is_acknowledged]
+                )
+                # Settled incidents past the window are dropped, so they don't pile up.
+                correlator.prune({e.id: e for e in self.events}, datetime.utcnow())
+                self.incidents = list(self.incidents)
+                self._refresh_history()
+                version, incoming = EventStore.changes_since(self._store_version)
+        except Exception as e:
+            logging.exception(f"Error pulling events from event store: {e}")
+        merged = []
+        for trace_id, event_ids in traces.items():
+            span = Tracer.record(
+                "state.merge", trace_id, start_ns=started, events=len(event_ids)
+            )
+            merged.append({"trace_id": trace_id, "parent_id": span.span_id})
+        return merged
+
+    @rx.event
+    def ack_trace_delivery(self, traces: list[dict[str, str]], sent_ns: str):
+        """Close ``ui.push`` spans once the client has applied the state delta.
+
+        Chained from handlers that changed events: the browser only runs it
+        after receiving the delta, so the span covers serialization, websocket
+        delivery and the round trip back. The arguments come back from the
+        client, so malformed entries are ignored.
+        """
+        try:
+            start_ns = int(sent_ns)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(traces, list) or not 0 < start_ns <= time.time_ns():
+            return
+        for trace in traces:
+            if not isinstance(trace, dict):
+                continue
+            if not Tracer.is_id(trace.get("trace_id"), 16):
+                continue
+            parent_id = trace.get("parent_id")
+            if parent_id is not None and not Tracer.is_id(parent_id, 8):
+                continue
+            Tracer.record(
+                "ui.push",
+                trace["trace_id"],
+                start_ns=start_ns,
+                parent_id=parent_id,
+            )
 
     @rx.event
     def open_acknowledge_modal(self, event_id: int):
         self.selected_event_id = event_id
+        self.selected_incident_id = -1
+        if self.group_incidents:
+            event = self._get_event_by_id(event_id)
+            if event and event.incident_id:
+                self.selected_incident_id = event.incident_id
         self.acknowledgement_comment = ""
 
     @rx.event
     def cancel_acknowledgement(self):
         self.selected_event_id = -1
+        self.selected_incident_id = -1
 
     @rx.event
-    def submit_acknowledgement(self):
-        if self.selected_event_id != -1:
+    async def submit_acknowledgement(self):
+        changed = []
+        if self.selected_incident_id != -1:
+            changed = self._acknowledge_incident(self.selected_incident_id)
+            self.selected_event_id = -1
+            self.selected_incident_id = -1
+            self._refresh_history()
+        elif self.selected_event_id != -1:
             event = self._get_event_by_id(self.selected_event_id)
             if event:
                 event.is_acknowledged = True
                 event.acknowledged_timestamp = datetime.utcnow()
-                event.comment = self.acknowledgement_comment
+                self._append_comment(event, self.acknowledgement_comment)
                 self.events = list(self.events)
+                changed = [event]
+                self._mark_acknowledged_incidents(changed)
                 log_msg = f"Acknowledged event {event.id}: {event.message}"
                 if self.acknowledgement_comment:
                     log_msg += f" | Comment: {self.acknowledgement_comment}"
@@ -502,9 +736,179 @@ class AlertState(rx.State):
                 )
             self.selected_event_id = -1
             self._refresh_history()
+        await self._commit_user_changes(changed)
+
+    async def _commit_user_changes(self, events: list[AlertEvent]):
+        """Store acknowledgements and comments so workers and dashboards see them."""
+        try:
+            await EventStore.commit(events, source=EventStore.USER_SOURCE)
+        except Exception as e:
+            logging.exception(f"Error storing acknowledgements: {e}")
+
+    def _acknowledge_incident(self, incident_id: int) -> list[AlertEvent]:
+        """Acknowledge every pending event of an incident in one mutation."""
+        incident = self._get_incident_by_id(incident_id)
+        if not incident:
+            return []
+        incident.is_acknowledged = True
+        self.incidents = list(self.incidents)
+        return self._apply_bulk(
+            set(incident.event_ids),
+            acknowledge=True,
+            comment=self.acknowledgement_comment,
+            event_type="Incident Acknowledged",
+            scope=f"incident INC-{incident.id} ({incident.title})",
+        )
+
+    @staticmethod
+    def _append_comment(event: AlertEvent, comment: str):
+        """Add ``comment`` after any existing one; empty comments change nothing."""
+        if comment:
+            event.comment = f"{event.comment} | {comment}" if event.comment else comment
+
+    def _mark_acknowledged_incidents(self, events: list[AlertEvent]):
+        """Acknowledge the incidents of ``events`` once none of their events is open."""
+        touched = {e.incident_id for e in events if e.incident_id}
+        if not touched:
+            return
+        by_id = {e.id: e for e in self.events}
+        for incident in self.incidents:
+            if incident.id not in touched or incident.is_acknowledged:
+                continue
+            members = [by_id[i] for i in incident.event_ids if i in by_id]
+            if any(e.is_acknowledged for e in members) and all(
+                e.is_acknowledged or e.is_resolved for e in members
+            ):
+                incident.is_acknowledged = True
+        self.incidents = list(self.incidents)
+
+    def _apply_bulk(
+        self,
+        event_ids: set[int],
+        acknowledge: bool,
+        comment: str,
+        event_type: str,
+        scope: str,
+    ) -> list[AlertEvent]:
+        """Acknowledge and/or annotate many events with one state update and log entry.
+
+        Returns the changed events for ``_commit_user_changes``.
+        """
+        now = datetime.utcnow()
+        changed = []
+        for event in self.events:
+            if event.id not in event_ids:
+                continue
+            if acknowledge:
+                if event.is_acknowledged:
+                    continue
+                event.is_acknowledged = True
+                event.acknowledged_timestamp = now
+            self._append_comment(event, comment)
+            changed.append(event)
+        if not changed:
+            return []
+        self.events = list(self.events)
+        if acknowledge:
+            self._mark_acknowledged_incidents(changed)
+        verb = "Acknowledged" if acknowledge else "Annotated"
+        log_msg = f"{verb} {len(changed)} events in {scope}"
+        if comment:
+            log_msg += f" | Comment: {comment}"
+        self.log_system_event(event_type, log_msg, "success", user="Admin User")
+        return changed
+
+    selected_live_event_ids: list[int] = []
+    bulk_filter_expression: str = ""
+    bulk_comment: str = ""
+    bulk_filter_error: str = ""
+
+    @rx.event
+    def handle_live_selection_changed(
+        self, rows: list[dict], source: str = "", type: str = ""
+    ):
+        self.selected_live_event_ids = [r["id"] for r in rows if r.get("id")]
+
+    @rx.event
+    def set_bulk_filter_expression(self, value: str):
+        self.bulk_filter_expression = value
+        self.bulk_filter_error = ""
 
-    def _initialize_db(self):
-        """Initialize mock data if empty."""
+    @rx.event
+    def set_bulk_comment(self, value: str):
+        self.bulk_comment = value
+
+    @rx.event
+    async def bulk_acknowledge_selected(self):
+        changed = self._apply_bulk(
+            set(self.selected_live_event_ids),
+            acknowledge=True,
+            comment=self.bulk_comment,
+            event_type="Bulk Acknowledge",
+            scope="selection",
+        )
+        self.selected_live_event_ids = []
+        await self._commit_user_changes(changed)
+        return rx.toast.success(f"Acknowledged {len(changed)} events.")
+
+    @rx.event
+    async def bulk_annotate_selected(self):
+        if not self.bulk_comment:
+            return rx.toast.error("Enter a comment to annotate the selection.")
+        changed = self._apply_bulk(
+            set(self.selected_live_event_ids),
+            acknowledge=False,
+            comment=self.bulk_comment,
+            event_type="Bulk Annotate",
+            scope="selection",
+        )
+        await self._commit_user_changes(changed)
+        return rx.toast.success(f"Annotated {len(changed)} events.")
+
+    def _match_bulk_filter(self) -> set[int] | None:
+        try:
+            flt = EventFilter.parse(self.bulk_filter_expression)
+        except ValueError as e:
+            self.bulk_filter_error = str(e)
+            return None
+        self.bulk_filter_error = ""
+        now = datetime.utcnow()
+        return {e.id for e in self.events if flt.matches(e, now)}
+
+    @rx.event
+    async def bulk_acknowledge_matching(self):
+        ids = self._match_bulk_filter()
+        if ids is None:
+            return rx.toast.error(self.bulk_filter_error)
+        changed = self._apply_bulk(
+            ids,
+            acknowledge=True,
+            comment=self.bulk_comment,
+            event_type="Bulk Acknowledge",
+            scope=f"filter '{self.bulk_filter_expression}'",
+        )
+        await self._commit_user_changes(changed)
+        return rx.toast.success(f"Acknowledged {len(changed)} events.")
+
+    @rx.event
+    async def bulk_annotate_matching(self):
+        if not self.bulk_comment:
+            return rx.toast.error("Enter a comment to annotate matching events.")
+        ids = self._match_bulk_filter()
+        if ids is None:
+            return rx.toast.error(self.bulk_filter_error)
+        changed = self._apply_bulk(
+            ids,
+            acknowledge=False,
+            comment=self.bulk_comment,
+            event_type="Bulk Annotate",
+            scope=f"filter '{self.bulk_filter_expression}'",
+        )
+        await self._commit_user_changes(changed)
+        return rx.toast.success(f"Annotated {len(changed)} events.")
+
+    async def _initialize_db(self):
+        """Load the stored rules, seeding the defaults and mock history if empty."""
         if not self.rules:
             self.log_system_event(
                 "System Init",
@@ -512,7 +916,12 @@ class AlertState(rx.State):
                 "info",
                 user="System",
             )
-            rules_data = [
+            try:
+                published = RuleStore.load()
+            except Exception as e:
+                logging.exception(f"Error loading rules: {e}")
+                published = []
+            rules_data = [] if published else [
                 dict(
                     name="Production CPU Monitor",
                     trigger_script="cpu_usage_trigger",
@@ -520,6 +929,9 @@ class AlertState(rx.State):
                     importance="high",
                     category="System",
                     period_seconds=300,
+                    adaptive_period=True,
+                    min_period_seconds=30,
+                    max_period_seconds=1800,
                     display_duration_minutes=1440,
                     action_config=json.dumps({"emails": ["ops@sentinel.io"]}),
                     comment="Critical server monitoring",
@@ -549,6 +961,24 @@ class AlertState(rx.State):
                     comment="Volume tracking",
                     is_active=True,
                 ),
+                dict(
+                    name="AAPL Breakout",
+                    trigger_script="expression_trigger",
+                    parameters=json.dumps(
+                        {
+                            "expression": "price > 180 and volume_pct > 200",
+                            "ticker": "AAPL",
+                            "importance": "high",
+                        }
+                    ),
+                    importance="high",
+                    category="Market",
+                    period_seconds=60,
+                    display_duration_minutes=120,
+                    action_config=json.dumps({"emails": ["trading@sentinel.io"]}),
+                    comment="Price and volume confirmation",
+                    is_active=True,
+                ),
                 dict(
                     name="Daily Data Pipeline",
                     trigger_script="prefect_deployment_trigger",
@@ -561,67 +991,36 @@ class AlertState(rx.State):
                     importance="medium",
                     category="System",
                     period_seconds=86400,
+                    schedule_cron="0 2 * * *",
                     display_duration_minutes=1440,
                     action_config=json.dumps({"emails": ["data-eng@sentinel.io"]}),
                     comment="Triggers daily ETL",
                     is_active=True,
                 ),
             ]
-            for r_data in rules_data:
-                r = AlertRule(id=self.next_rule_id, **r_data)
-                self.next_rule_id += 1
-                self.rules.append(r)
-            categories = ["Market", "System", "Security", "Liquidity", "News"]
-            importances = ["critical", "high", "medium", "low"]
-            tickers = [
-                "AAPL",
-                "NVDA",
-                "MSFT",
-                "TSLA",
-                "GOOGL",
-                "SYS-01",
-                "API-GW",
-                "DB-PROD",
-            ]
-            messages = [
-                "High latency detected",
-                "Unusual volume spike",
-                "Price threshold breached",
-                "Connection timeout",
-                "Unauthorized access attempt",
-                "Liquidity crunch warning",
-            ]
-            base_time = datetime.utcnow() - timedelta(days=7)
-            for i in range(50):
-                rule_idx = random.randint(0, len(self.rules) - 1)
-                rule = self.rules[rule_idx]
-                event_time = base_time + timedelta(hours=random.randint(1, 160))
-                ticker = random.choice(tickers)
-                evt = AlertEvent(
-                    id=self.next_event_id,
-                    rule_id=rule.id,
-                    timestamp=event_time,
-                    message=f"{random.choice(messages)} on {ticker}",
-                    importance=random.choice(importances),
-                    category=random.choice(categories),
-                    is_acknowledged=random.choice([True, False]),
-                    comment="Auto-generated history" if random.random() > 0.5 else None,
-                    ticker=ticker,
-                )
-                if evt.is_acknowledged:
-                    evt.acknowledged_timestamp = evt.timestamp + timedelta(
-                        minutes=random.randint(5, 120)
-                    )
-                if random.random() < 0.3:
-                    evt.prefect_flow_run_id = str(uuid.uuid4())
-                    evt.prefect_state = random.choice(
-                        ["SCHEDULED", "PENDING", "RUNNING"]
+            seeded = False
+            if rules_data:
+                # Concurrent first loads race here; only one seed is stored.
+                try:
+                    seeded = RuleStore.seed(
+                        [
+                            AlertRule(id=rule_id, **r_data)
+                            for rule_id, r_data in enumerate(rules_data, start=1)
+                        ]
                     )
-                self.events.append(evt)
-                self.next_event_id += 1
+                except Exception as e:
+                    logging.exception(f"Error seeding default rules: {e}")
+            self._pull_rules()
+            history = self._mock_history() if seeded and self.rules else []
+            if history:
+                # Stored like any other event, so every dashboard shares it.
+                try:
+                    await EventStore.commit(history, source="seed")
+                except Exception as e:
+                    logging.exception(f"Error storing mock history: {e}")
             self.log_system_event(
                 "System Init",
-                f"Created {len(self.rules)} rules and {len(self.events)} mock events.",
+                f"Loaded {len(self.rules)} rules, created {len(history)} mock events.",
                 "success",
                 user="System",
             )
@@ -632,61 +1031,134 @@ class AlertState(rx.State):
                     "info",
                     user="System",
                 )
-            self._refresh_history()
 
-    @rx.event
+    def _mock_history(self) -> list[AlertEvent]:
+        """A week of random past events for the seeded rules."""
+        categories = ["Market", "System", "Security", "Liquidity", "News"]
+        importances = ["critical", "high", "medium", "low"]
+        tickers = [
+            "AAPL",
+            "NVDA",
+            "MSFT",
+            "TSLA",
+            "GOOGL",
+            "SYS-01",
+            "API-GW",
+            "DB-PROD",
+        ]
+        messages = [
+            "High latency detected",
+            "Unusual volume spike",
+            "Price threshold breached",
+            "Connection timeout",
+            "Unauthorized access attempt",
+            "Liquidity crunch warning",
+        ]
+        base_time = datetime.utcnow() - timedelta(days=7)
+        history = []
+        for event_id in EventStore.allocate_ids(50):
+            rule = random.choice(self.rules)
+            event_time = base_time + timedelta(hours=random.randint(1, 160))
+            ticker = random.choice(tickers)
+            evt = AlertEvent(
+                id=event_id,
+                rule_id=rule.id,
+                timestamp=event_time,
+                message=f"{random.choice(messages)} on {ticker}",
+                importance=random.choice(importances),
+                category=random.choice(categories),
+                is_acknowledged=random.choice([True, False]),
+                comment="Auto-generated history" if random.random() > 0.5 else None,
+                ticker=ticker,
+            )
+            if evt.is_acknowledged:
+                evt.acknowledged_timestamp = evt.timestamp + timedelta(
+                    minutes=random.randint(5, 120)
+                )
+            if random.random() < 0.3:
+                evt.prefect_flow_run_id = str(uuid.uuid4())
+                evt.prefect_state = random.choice(["SCHEDULED", "PENDING", "RUNNING"])
+            history.append(evt)
+        return history
+
+    @rx.event(background=True)
     async def generate_mock_alerts(self):
-        """Run trigger scripts for active rules."""
-        new_events_count = 0
-        active_rules = [r for r in self.rules if r.is_active]
-        for rule in active_rules:
-            try:
-                params = json.loads(rule.parameters)
-                if rule.trigger_script and rule.trigger_script != "custom":
-                    output = await AlertRunner.run_trigger(rule.trigger_script, params)
-                    if output:
-                        rule.last_output = output.json()
-                        if output.triggered:
-                            flow_run_id = output.metadata.get("flow_run_id")
-                            prefect_state = output.metadata.get("initial_state")
-                            event = AlertEvent(
-                                id=self.next_event_id,
-                                rule_id=rule.id,
-                                message=output.message,
-                                importance=output.importance.lower(),
-                                timestamp=datetime.utcnow(),
-                                is_acknowledged=False,
-                                category=rule.category,
-                                ticker=output.ticker,
-                                prefect_flow_run_id=flow_run_id,
-                                prefect_state=prefect_state,
-                            )
-                            self.next_event_id += 1
-                            self.events.append(event)
-                            new_events_count += 1
-            except Exception as e:
-                logging.exception(f"Error running trigger for rule {rule.name}: {e}")
-                continue
-        if new_events_count > 0:
-            self.events = list(self.events)
-            self._refresh_history()
-            triggered_rules = [
-                r.name
-                for r in active_rules
-                if r.last_output and json.loads(r.last_output).get("triggered")
-            ]
-            triggered_str = ", ".join(triggered_rules) if triggered_rules else "Unknown"
+        """Ask the rule workers to run the active rules now and merge the results."""
+        async with self:
+            rule_ids = [r.id for r in self.rules if r.is_active]
+            version = self._store_version
+            before = len(self.events)
+        if not rule_ids:
+            return rx.toast.info("No active rules to run.")
+        try:
+            RuleStore.request_runs(rule_ids)
+        except Exception as e:
+            logging.exception(f"Error requesting rule runs: {e}")
+            return rx.toast.error("Failed to request rule runs.")
+        traces = []
+        for _ in range(RUN_NOW_POLLS):
+            await asyncio.sleep(RUN_NOW_POLL_SECONDS)
+            async with self:
+                traces = self._pull_store_events()
+                if self._store_version != version:
+                    break
+        async with self:
+            new_events_count = len(self.events) - before
             self.log_system_event(
                 "Trigger Execution",
-                f"Generated {new_events_count} alerts. Sources: {triggered_str}",
+                f"Requested runs of {len(rule_ids)} active rules; "
+                f"{new_events_count} new alerts so far.",
                 "info",
                 user="System",
             )
-            return rx.toast.info(
+            updated = self._store_version != version
+        try:
+            queued = len(RuleStore.pending_runs(rule_ids))
+        except Exception as e:
+            logging.exception(f"Error checking rule run requests: {e}")
+            queued = 0
+        if new_events_count > 0:
+            toast = rx.toast.info(
                 f"Generated {new_events_count} new alerts from triggers."
             )
+        elif updated:
+            toast = rx.toast.info("No new alerts; existing alerts were updated.")
+        elif queued == len(rule_ids):
+            toast = rx.toast.warning(
+                "Run requests queued, but no worker has picked them up yet."
+            )
+        elif queued:
+            toast = rx.toast.info(
+                f"No alerts triggered yet; {queued} of {len(rule_ids)} "
+                "run requests are still queued."
+            )
         else:
-            return rx.toast.info("Rules executed but no alerts triggered.")
+            toast = rx.toast.info("Rules executed but no alerts triggered.")
+        if traces:
+            return [toast, AlertState.ack_trace_delivery(traces, str(time.time_ns()))]
+        return toast
+
+    def _pull_rules(self):
+        """Pick up rule changes stored by other sessions, keeping runtime fields."""
+        try:
+            stored = RuleStore.load()
+        except Exception as e:
+            logging.exception(f"Error loading rules: {e}")
+            return
+        stamp = RuleStore.stamp()
+        if stamp == self._rules_stamp:
+            return
+        previous = {r.id: r for r in self.rules}
+        rules = []
+        for rule in stored:
+            rule = rule.copy()
+            if old := previous.get(rule.id):
+                for field in RUNTIME_FIELDS:
+                    setattr(rule, field, getattr(old, field))
+            rules.append(rule)
+        self.rules = rules
+        self.next_rule_id = max((r.id for r in rules), default=0) + 1
+        self._rules_stamp = stamp
 
     rules_search_query: str = ""
 
@@ -694,6 +1166,17 @@ class AlertState(rx.State):
     def set_rules_search_query(self, value: str):
         self.rules_search_query = value
 
+    def _period_label(self, rule: AlertRule) -> str:
+        if rule.schedule_cron:
+            return rule.schedule_cron
+        if rule.adaptive_period:
+            worker = in_process_worker()
+            current = worker.scheduler.intervals.get(rule.id) if worker else None
+            if current is None:
+                return f"{rule.period_seconds}s (adaptive)"
+            return f"{rule.period_seconds}s (adaptive, now {current:g}s)"
+        return f"{rule.period_seconds}s"
+
     def _serialize_rule_for_grid(self, rule: AlertRule) -> dict:
         flow_info = f"{rule.prefect_flow_name}" if rule.prefect_flow_name else "-"
         last_sync = (
@@ -706,7 +1189,7 @@ class AlertState(rx.State):
             "name": rule.name,
             "category": rule.category,
             "importance": rule.importance.upper(),
-            "period": f"{rule.period_seconds}s",
+            "period": self._period_label(rule),
             "status": "ACTIVE" if rule.is_active else "INACTIVE",
             "action": "Delete",
             "prefect_info": flow_info,
@@ -735,45 +1218,31 @@ class AlertState(rx.State):
     paginated_history: list[dict] = []
     filtered_history_count: int = 0
 
+    def _history_criteria(self) -> dict[str, str]:
+        return {
+            "importance": self.history_importance_filter,
+            "prefect_state": self.prefect_state_filter,
+            "search": self.history_search_query,
+            "start_date": self.history_start_date,
+            "end_date": self.history_end_date,
+        }
+
+    def _filtered_history_events(self) -> list[AlertEvent]:
+        """Events matching the history filters, newest first (unserialized)."""
+        filtered = filter(history_filter(self._history_criteria()), self.events)
+        return sorted(
+            filtered,
+            key=lambda x: x.timestamp if x.timestamp else datetime.min,
+            reverse=True,
+        )
+
     @rx.var
     def history_grid_data(self) -> list[dict]:
         """Data source for the History Ag-Grid (Client-side pagination)."""
-        filtered = self.events
-        if self.history_importance_filter != "All":
-            filtered = [
-                e
-                for e in filtered
-                if e.importance == self.history_importance_filter.lower()
-            ]
-        if self.prefect_state_filter != "All":
-            target = self.prefect_state_filter
-            if target == "None":
-                filtered = [e for e in filtered if not e.prefect_state]
-            else:
-                filtered = [e for e in filtered if e.prefect_state == target]
-        if self.history_search_query:
-            q = self.history_search_query.lower()
-            filtered = [e for e in filtered if q in e.message.lower()]
-        if self.history_start_date:
-            try:
-                s_date = datetime.strptime(self.history_start_date, "%Y-%m-%d")
-                filtered = [
-                    e for e in filtered if e.timestamp and e.timestamp >= s_date
-                ]
-            except ValueError as e:
-                logging.exception(f"Error parsing history start date: {e}")
-        if self.history_end_date:
-            try:
-                e_date = datetime.strptime(
-                    self.history_end_date, "%Y-%m-%d"
-                ) + timedelta(days=1)
-                filtered = [e for e in filtered if e.timestamp and e.timestamp < e_date]
-            except ValueError as e:
-                logging.exception(f"Error parsing history end date: {e}")
-        filtered.sort(
-            key=lambda x: x.timestamp if x.timestamp else datetime.min, reverse=True
-        )
-        return [self._serialize_event_for_grid(e, for_history=True) for e in filtered]
+        return [
+            self._serialize_event_for_grid(e, for_history=True)
+            for e in self._filtered_history_events()
+        ]
 
     def _refresh_history(self):
         """Perform memory search and pagination (Legacy/Back-compat for non-grid usage if any)."""
@@ -795,9 +1264,49 @@ class AlertState(rx.State):
     def set_history_end_date(self, value: str):
         self.history_end_date = value
 
+    def _export_history(self, fmt: str):
+        criteria = self._history_criteria()
+        try:
+            token = ExportRegistry.register(criteria, fmt)
+        except Exception as e:
+            logging.exception(f"Error registering history export: {e}")
+            return rx.toast.error("Failed to start the export.")
+        self.log_system_event(
+            "History Export",
+            f"Exporting stored history as {fmt.upper()} ({json.dumps(criteria)})",
+            "info",
+        )
+        api_url = rx.config.get_config().api_url.rstrip("/")
+        return [
+            rx.toast.success(f"Exporting matching history to {fmt.upper()}..."),
+            rx.redirect(f"{api_url}/api/export/{token}", is_external=True),
+        ]
+
     @rx.event
     def export_history_csv(self):
-        rx.toast.success(f"Exporting {len(self.history_grid_data)} events to CSV...")
+        return self._export_history("csv")
+
+    @rx.event
+    def export_history_ndjson(self):
+        return self._export_history("ndjson")
+
+    @rx.event
+    async def export_history_parquet(self):
+        """Append store changes since the last export to the Parquet dataset."""
+        exporter = ParquetExporter()
+        if not exporter.available():
+            return rx.toast.error("Parquet export requires the 'pyarrow' package.")
+        try:
+            stats = await asyncio.to_thread(exporter.export)
+        except Exception as e:
+            logging.exception(f"Parquet export failed: {e}")
+            return rx.toast.error("Parquet export failed.")
+        self.log_system_event(
+            "History Export",
+            f"Parquet export wrote {stats['events']} events to {stats['files']} partitions in {exporter.base_dir} (watermark {stats['watermark']})",
+            "success",
+        )
+        return rx.toast.success(f"Exported {stats['events']} new events to Parquet.")
 
     @rx.event(background=True)
     async def sync_prefect_status(self):
@@ -851,6 +1360,108 @@ class AlertState(rx.State):
                 logging.exception(f"Prefect sync failed: {e}")
                 rx.toast.error("Failed to sync with Prefect API.")
 
+    metrics_trigger_rows: list[dict[str, str]] = []
+    metrics_slow_rules: list[dict[str, str]] = []
+    metrics_overview: dict[str, str] = {}
+    prefect_breakers: list[dict[str, str]] = []
+
+    def _refresh_prefect_breakers(self, view: MetricsView):
+        rows = []
+        for process, snap in view.extra("breakers"):
+            rows.append(
+                {
+                    "endpoint": snap["name"],
+                    "process": process,
+                    "state": snap["state"].replace("_", "-"),
+                    "failure_rate": f"{snap['failure_rate']:.0%}",
+                    "calls": str(snap["calls"]),
+                    "opens": str(snap["opens"]),
+                    "retry_in": f"{snap['retry_in']:.0f}s" if snap["retry_in"] else "-",
+                    "tripped": "yes" if snap["state"] != "closed" else "",
+                }
+            )
+        self.prefect_breakers = rows
+
+    @rx.event
+    def refresh_metrics_summary(self):
+        """Summarize trigger, sweep, queue and Prefect metrics for Settings.
+
+        Covers this web process and every live rule worker (SharedMetrics).
+        """
+        view = cluster_metrics()
+        runs = view.counter_values("sentinel_trigger_runs_total")
+        fired = view.counter_values("sentinel_trigger_fired_total")
+        errors = view.counter_values("sentinel_trigger_errors_total")
+        totals: dict[str, list[float]] = {}
+        for source, column in ((runs, 0), (fired, 1), (errors, 2)):
+            for key, value in source.items():
+                totals.setdefault(dict(key)["trigger"], [0, 0, 0])[column] += value
+        by_trigger = view.histogram(
+            "sentinel_trigger_duration_seconds", group_by="trigger"
+        )
+        self.metrics_trigger_rows = [
+            {
+                "trigger": trigger,
+                "runs": f"{counts[0]:g}",
+                "fired": f"{counts[1]:g}",
+                "errors": f"{counts[2]:g}",
+                "p50": format_seconds(by_trigger[trigger].percentile(50)),
+                "p99": format_seconds(by_trigger[trigger].percentile(99)),
+                "max": format_seconds(by_trigger[trigger].max_value / 1_000_000),
+            }
+            for trigger, counts in sorted(totals.items())
+            if trigger in by_trigger
+        ]
+        rules_by_id = {str(r.id): r for r in self.rules}
+        # Per-rule latency comes from each process's trace ring, not metrics.
+        by_rule: dict[str, float] = {}
+        for _, row in view.extra("slow_rules"):
+            by_rule[row["key"]] = max(by_rule.get(row["key"], 0.0), row["p99"])
+        slow = []
+        for rule_id, p99 in by_rule.items():
+            rule = rules_by_id.get(rule_id)
+            if rule is None:
+                continue
+            budget = p99 / rule.period_seconds * 100 if rule.period_seconds else 0
+            slow.append((p99, rule, budget))
+        slow.sort(key=lambda item: item[0], reverse=True)
+        self.metrics_slow_rules = [
+            {
+                "name": rule.name,
+                "p99": format_seconds(p99),
+                "period": f"{rule.period_seconds}s",
+                "budget": f"{budget:.2f}%",
+                "over_budget": "yes" if budget >= 100 else "",
+            }
+            for p99, rule, budget in slow[:10]
+        ]
+        sweep = view.histogram("sentinel_sweep_duration_seconds").get("")
+        prefect = view.histogram("sentinel_prefect_api_duration_seconds").get("")
+        prefect_errors = sum(
+            view.counter_values("sentinel_prefect_api_errors_total").values()
+        )
+        queues = {
+            dict(key)["channel"]: value
+            for key, value in view.gauge_values("sentinel_queue_depth").items()
+        }
+        shed = view.counter_values("sentinel_runs_shed_total")
+        rejected = view.counter_values("sentinel_prefect_api_rejected_total")
+        lag = view.histogram("sentinel_run_queue_lag_seconds").get("")
+        self.metrics_overview = {
+            "sweeps": str(sweep.count if sweep else 0),
+            "sweep_p50": format_seconds(sweep.percentile(50)) if sweep else "-",
+            "sweep_p99": format_seconds(sweep.percentile(99)) if sweep else "-",
+            "prefect_calls": str(prefect.count if prefect else 0),
+            "prefect_p99": format_seconds(prefect.percentile(99)) if prefect else "-",
+            "prefect_errors": f"{prefect_errors:g}",
+            "prefect_rejected": f"{sum(rejected.values()):g}",
+            "email_queue": f"{queues.get('email', 0):g}",
+            "webhook_queue": f"{queues.get('webhook', 0):g}",
+            "runs_shed": f"{sum(shed.values()):g}",
+            "run_lag_p99": format_seconds(lag.percentile(99)) if lag else "-",
+        }
+        self._refresh_prefect_breakers(view)
+
     is_grid_ready: bool = False
 
     @rx.event(background=True)
@@ -877,7 +1488,9 @@ class AlertState(rx.State):
                     "success",
                     user="System",
                 )
-            self._initialize_db()
+            await self._initialize_db()
+            self._pull_rules()
+            self._pull_store_events()
             self._refresh_history()
             await asyncio.sleep(0.5)
             self.is_grid_ready = True
\ No newline at end of file
@@ -0,0 +1,230 @@
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import os
+import pkgutil
+import threading
+from importlib import metadata
+from app import alert_triggers
+from app.alert_triggers import BaseTrigger
+from app.alert_triggers.params import describe_params
+
+ENTRY_POINT_GROUP = "sentinel_alerts.triggers"
+MANIFEST_VERSION = 2
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def find_trigger_class(module) -> type[BaseTrigger] | None:
+    """First BaseTrigger subclass defined in or imported into ``module``."""
+    for _, item in inspect.getmembers(module):
+        if (
+            inspect.isclass(item)
+            and issubclass(item, BaseTrigger)
+            and (item is not BaseTrigger)
+        ):
+            return item
+    return None
+
+
+class TriggerManifest:
+    """Cached description of every available trigger.
+
+    Built-in triggers are the modules of ``app.alert_triggers``; third-party
+    packages register more under the ``sentinel_alerts.triggers`` entry point
+    group (``name = "package.module:TriggerClass"``). Each entry stores what
+    the UI needs (name, description, default params, parameter fields) plus
+    an invalidation key: file size/mtime and a SHA-256 of the source for
+    built-ins, the distribution version for entry points. Loading the manifest stats the
+    trigger files and only re-imports modules whose content hash changed, so
+    discovery is normally a stat per file (plus one JSON read per process)
+    and trigger modules are imported only when first executed.
+    """
+
+    _lock = threading.Lock()
+    _memo: tuple[tuple, dict[str, dict]] | None = None
+    _entry_point_cache: list | None = None
+
+    @staticmethod
+    def path() -> str:
+        return os.environ.get("SENTINEL_TRIGGER_MANIFEST", ".trigger_manifest.json")
+
+    @staticmethod
+    def _describe(module_name: str, class_name: str | None = None) -> dict | None:
+        module = importlib.import_module(module_name)
+        trigger_class = (
+            getattr(module, class_name) if class_name else find_trigger_class(module)
+        )
+        if trigger_class is None:
+            return None
+        instance = trigger_class()
+        return {
+            "module": module_name,
+            "class": trigger_class.__name__,
+            "name": instance.get_name(),
+            "description": instance.get_description(),
+            "default_params": instance.get_default_params(),
+            "param_fields": describe_params(trigger_class.params_schema),
+        }
+
+    @staticmethod
+    def _builtin_sources() -> dict[str, tuple[str, str]]:
+        """script -> (module name, file path), found without importing."""
+        sources = {}
+        prefix = alert_triggers.__name__ + "."
+        for finder, name, is_pkg in pkgutil.iter_modules(
+            alert_triggers.__path__, prefix
+        ):
+            if is_pkg:
+                continue
+            script = name.split(".")[-1]
+            path = os.path.join(finder.path, f"{script}.py")
+            if os.path.exists(path):
+                sources[script] = (name, path)
+        return sources
+
+    @classmethod
+    def _entry_points(cls) -> list:
+        """Registered entry points, scanned once per process."""
+        if cls._entry_point_cache is None:
+            try:
+                cls._entry_point_cache = list(
+                    metadata.entry_points(group=ENTRY_POINT_GROUP)
+                )
+            except Exception as e:
+                logging.exception(f"Error reading trigger entry points: {e}")
+                cls._entry_point_cache = []
+        return cls._entry_point_cache
+
+    @classmethod
+    def _read(cls) -> dict[str, dict]:
+        try:
+            with open(cls.path()) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.exception(f"Error reading trigger manifest {cls.path()}: {e}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("triggers", {})
+
+    @classmethod
+    def _write(cls, entries: dict[str, dict]):
+        path = cls.path()
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(
+                    {"version": MANIFEST_VERSION, "triggers": entries}, f, indent=1
+                )
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.exception(f"Error writing trigger manifest {path}: {e}")
+
+    @classmethod
+    def _refresh_builtin(
+        cls, module_name: str, path: str, cached: dict | None
+    ) -> dict:
+        """Reuse the cached entry unless the file's content hash changed."""
+        stat = os.stat(path)
+        if (
+            cached
+            and cached.get("size") == stat.st_size
+            and cached.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            return cached
+        digest = _file_hash(path)
+        if cached and cached.get("sha256") == digest:
+            return {**cached, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        # Helper modules (no trigger class) are cached too, so they aren't
+        # re-imported on every load; ``load`` leaves them out.
+        entry = cls._describe(module_name) or {"module": module_name, "class": None}
+        return {
+            **entry,
+            "source": "builtin",
+            "path": path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+        }
+
+    @classmethod
+    def _refresh_entry_point(cls, ep, cached: dict | None) -> dict | None:
+        dist = getattr(ep, "dist", None)
+        version = f"{dist.name}=={dist.version}" if dist else ""
+        key = f"{version}:{ep.value}"
+        if cached and cached.get("version") == key:
+            return cached
+        module_name, _, class_name = ep.value.partition(":")
+        entry = cls._describe(module_name, class_name or None)
+        if entry is None:
+            logging.error(
+                f"No BaseTrigger subclass found for entry point {ep.name}"
+            )
+            return None
+        return {**entry, "source": f"entry_point:{ep.name}", "version": key}
+
+    @classmethod
+    def load(cls) -> dict[str, dict]:
+        """Return script -> entry, re-describing only changed triggers."""
+        builtins = cls._builtin_sources()
+        entry_points = cls._entry_points()
+        stats = {script: os.stat(path) for script, (_, path) in builtins.items()}
+        signature = tuple(
+            (script, stat.st_mtime_ns, stat.st_size)
+            for script, stat in sorted(stats.items())
+        ) + tuple(sorted(ep.value for ep in entry_points))
+        with cls._lock:
+            if cls._memo and cls._memo[0] == signature:
+                return cls._memo[1]
+            cached = cls._read()
+            entries = {}
+            for script, (module_name, path) in builtins.items():
+                try:
+                    entry = cls._refresh_builtin(module_name, path, cached.get(script))
+                except Exception as e:
+                    logging.exception(
+                        f"Error loading trigger module {module_name}: {e}"
+                    )
+                    continue
+                entries[script] = entry
+            for ep in entry_points:
+                if ep.name in entries:
+                    logging.warning(
+                        f"Trigger entry point '{ep.name}' shadows a built-in "
+                        "trigger; ignored."
+                    )
+                    continue
+                try:
+                    entry = cls._refresh_entry_point(ep, cached.get(ep.name))
+                except Exception as e:
+                    logging.exception(
+                        f"Error loading trigger entry point {ep.name}: {e}"
+                    )
+                    continue
+                if entry:
+                    entries[ep.name] = entry
+            if entries != cached:
+                cls._write(entries)
+            triggers = {k: v for k, v in entries.items() if v.get("class")}
+            cls._memo = (signature, triggers)
+            return triggers
+
+    @classmethod
+    def resolve(cls, script: str) -> dict | None:
+        """Manifest entry (module, class, ...) for one trigger script."""
+        return cls.load().get(script)
+
+    @classmethod
+    def invalidate(cls):
+        """Forget the in-process copy (and entry points) so the next load rechecks."""
+        with cls._lock:
+            cls._memo = None
+            cls._entry_point_cache = None
\ No newline at end of file
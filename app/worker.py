@@ -0,0 +1,309 @@
+"""Rule evaluation worker.
+
+Runs the scheduler and triggers for a share of the stored rules. By
+default one worker runs inside each web process (``lifespan``, registered in
+app.py); standalone workers take evaluation out of the web tier so it scales
+across cores and hosts:
+
+    SENTINEL_EXTERNAL_WORKERS=1 reflex run     # dashboards evaluate nothing
+    python -m app.worker                       # start one per core / host
+
+Workers coordinate only through the shared database (``SENTINEL_DB_PATH``).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from datetime import datetime
+from app.alert_runner import AlertRunner
+from app.models import AlertEvent, AlertRule
+from app.services.alert_recorder import AlertRecorder
+from app.services.metrics import Metrics, MetricsView, SharedMetrics
+from app.services.prefect_service import PrefectSyncService
+from app.services.rule_params import RuleParams
+from app.services.rule_store import RuleStore
+from app.services.run_queue import RunQueue
+from app.services.scheduler import RuleScheduler, ScheduleStore
+from app.services.sharding import HashRing, RuleLeases
+from app.services.tracing import Tracer
+from app.services.trigger_state import TriggerStateStore
+
+
+class RuleWorker:
+    """Evaluates this worker's share of the stored rules.
+
+    Every ``lease_seconds / 3`` the worker heartbeats, places the live
+    workers on a HashRing of rule ids and claims leases (RuleLeases) on the
+    active rules that hash to it, releasing any that now hash elsewhere.
+    Owned rules run on their schedules through RuleScheduler and RunQueue,
+    and right away when a dashboard requested a run (``RuleStore.request_runs``);
+    outputs go through an AlertRecorder, which deduplicates them against
+    the store's open events (following the change feed, so acknowledgements
+    made on any dashboard apply), queues the rules' actions and group
+    commits to the EventStore, which every dashboard merges on its next
+    tick. Leases are also extended from a keep-alive task while a long sweep
+    is running, and a rule whose lease was lost anyway is skipped for the
+    rest of the sweep. A worker that dies stops renewing, and its rules move
+    to the survivors once their leases expire.
+    """
+
+    def __init__(
+        self, worker_id: str, lease_seconds: float = 15.0, poll_interval: float = 1.0
+    ):
+        self.worker_id = worker_id
+        self.host = socket.gethostname()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.scheduler = RuleScheduler([], {})
+        self.rules: dict[int, AlertRule] = {}
+        self._owned: set[int] = set()
+        self._renewed_at = 0.0
+        self._leased_at = 0.0
+        self.recorder = AlertRecorder(f"worker:{worker_id}")
+
+    def renew(self, now: float):
+        """Heartbeat, re-balance and renew leases; updates the owned rules."""
+        RuleLeases.heartbeat(self.worker_id, self.host, now)
+        published = RuleStore.load()
+        active = {r.id: r for r in published if r.is_active}
+        workers = RuleLeases.live_workers(now, self.lease_seconds)
+        ring = HashRing(workers)
+        wanted = {i for i in active if ring.owner(i) == self.worker_id}
+        released = set(self.rules) - wanted
+        deleted = released - {r.id for r in published}
+        for rule_id in deleted:
+            TriggerStateStore.reset(rule_id)
+        if deleted:
+            ScheduleStore.forget(deleted)
+        if released - deleted:
+            # Hand trigger state over before the lease is given up.
+            TriggerStateStore.evict(released - deleted)
+        owned = RuleLeases.claim(self.worker_id, wanted, now, self.lease_seconds)
+        rules = {i: active[i] for i in owned if i in active}
+        for rule_id, rule in rules.items():
+            previous = self.rules.get(rule_id)
+            if previous is not None and rule.last_output is None:
+                rule.last_output = previous.last_output
+        if set(rules) != set(self.rules):
+            logging.info(
+                f"Worker {self.worker_id} owns {len(rules)} of {len(active)} "
+                f"active rules ({len(workers)} live workers)"
+            )
+        self.rules = rules
+        # Rules taken over resume at the fire time their last owner saved.
+        saved = ScheduleStore.load(set(rules) - set(self.scheduler.keys))
+        self.scheduler.sync(list(self.rules.values()), now, saved)
+        ScheduleStore.save(self.scheduler.changes())
+        self._owned = set(rules)
+        self._renewed_at = self._leased_at = now
+        try:
+            SharedMetrics.publish(self.worker_id, process_metrics())
+        except Exception as e:
+            logging.exception(f"Error publishing metrics of {self.worker_id}: {e}")
+
+    def _extend(self, now: float):
+        """Heartbeat and extend the leases already held, without re-balancing."""
+        RuleLeases.heartbeat(self.worker_id, self.host, now)
+        owned = RuleLeases.claim(self.worker_id, self._owned, now, self.lease_seconds)
+        if lost := self._owned - owned:
+            logging.warning(
+                f"Worker {self.worker_id} lost the leases on rules {sorted(lost)}"
+            )
+        self._owned = owned
+        self._leased_at = now
+
+    async def _keep_leases(self):
+        """Extend leases on schedule even while a sweep holds up ``run_once``."""
+        interval = self.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            now = time.time()
+            if now - self._leased_at < interval:
+                continue
+            try:
+                self._extend(now)
+            except Exception as e:
+                logging.exception(f"Worker {self.worker_id} lease renewal failed: {e}")
+
+    async def _run_rules(self, queue: RunQueue) -> list[AlertEvent]:
+        """Run queued rules in priority order; returns the events they changed."""
+        sweep_started = time.perf_counter()
+        with Tracer.span("sweep", rules=len(queue), worker=self.worker_id) as span:
+            self.recorder.begin()
+            AlertRunner.prefetch(queue.trigger_runs())
+            for rule in queue:
+                if rule.id not in self._owned:
+                    # The lease expired mid-sweep; another worker runs it now.
+                    continue
+                try:
+                    params = RuleParams.get(rule)
+                    if not rule.trigger_script or rule.trigger_script == "custom":
+                        continue
+                    output = await AlertRunner.run_trigger(
+                        rule.trigger_script, params, rule_id=rule.id
+                    )
+                    if not output:
+                        continue
+                    rule.last_output = output
+                    self.recorder.record(rule, output, datetime.utcnow())
+                except Exception as e:
+                    logging.exception(
+                        f"Error running trigger for rule {rule.name}: {e}"
+                    )
+            changed = self.recorder.finish()
+            span.set(shed=len(queue.shed))
+            TriggerStateStore.snapshot()
+        Metrics.observe(
+            "sentinel_sweep_duration_seconds", time.perf_counter() - sweep_started
+        )
+        return changed
+
+    async def run_once(self) -> int:
+        """Renew leases when due and run due or requested rules.
+
+        Returns the number of events committed.
+        """
+        now = time.time()
+        if now - self._renewed_at >= self.lease_seconds / 3:
+            self.renew(now)
+        requested = RuleStore.take_run_requests(set(self.rules))
+        if not requested and not RuleScheduler.is_due(self.scheduler.heap, now):
+            return 0
+        popped = [
+            (entry, self.rules.get(entry[1])) for entry in self.scheduler.pop_due(now)
+        ]
+        queue = RunQueue()
+        for entry, rule in popped:
+            if self.scheduler.is_current(rule, entry):
+                queue.push(rule, entry[0], self.scheduler.deadline(rule, entry[0]))
+                requested.discard(rule.id)
+        for rule_id in requested:
+            rule = self.rules[rule_id]
+            queue.push(rule, now, self.scheduler.deadline(rule, now))
+        changed = await self._run_rules(queue) if len(queue) else []
+        if queue.shed:
+            logging.warning(
+                f"Skipped {len(queue.shed)} late low-priority rule runs "
+                f"(lag budget {queue.budget_seconds:g}s) until their next schedule."
+            )
+        now = time.time()
+        for entry, rule in popped:
+            self.scheduler.reschedule(rule, entry, now)
+        ScheduleStore.save(self.scheduler.changes())
+        await self.recorder.commit(changed)
+        return len(changed)
+
+    async def run(self):
+        logging.info(f"Worker {self.worker_id} started on {self.host}")
+        keep_leases = asyncio.create_task(self._keep_leases())
+        try:
+            while True:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logging.exception(f"Worker {self.worker_id} cycle failed: {e}")
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            keep_leases.cancel()
+            await asyncio.gather(keep_leases, return_exceptions=True)
+            TriggerStateStore.snapshot(force=True)
+            RuleLeases.leave(self.worker_id)
+            logging.info(f"Worker {self.worker_id} stopped")
+
+
+_in_process: RuleWorker | None = None
+
+
+def in_process_worker() -> RuleWorker | None:
+    """The worker running inside this web process, if any."""
+    return _in_process
+
+
+def web_process_id() -> str:
+    """Id of this web process, also used by its in-process worker."""
+    return f"web-{socket.gethostname()}-{os.getpid()}"
+
+
+def process_metrics() -> dict:
+    """This process's metrics export, plus its Prefect breakers and slowest rules."""
+    breakers = [breaker.snapshot() for breaker in PrefectSyncService.breakers()]
+    slow_rules = Tracer.slowest("trigger.check", "rule_id")
+    return Metrics.export(breakers=breakers, slow_rules=slow_rules)
+
+
+def cluster_metrics() -> MetricsView:
+    """Metrics of this web process and every live worker (SharedMetrics)."""
+    return SharedMetrics.view(web_process_id(), process_metrics())
+
+
+def _lease_seconds() -> float:
+    return float(os.environ.get("SENTINEL_WORKER_LEASE_SECONDS", 15))
+
+
+def _poll_interval() -> float:
+    return float(os.environ.get("SENTINEL_WORKER_POLL_SECONDS", 1))
+
+
+@contextlib.asynccontextmanager
+async def lifespan():
+    """Run one worker in the web process for its lifetime.
+
+    Every web process evaluates a lease-backed share of the rules, so each
+    rule runs once per schedule however many dashboards are open, and keeps
+    running when none are. Disabled by ``SENTINEL_EXTERNAL_WORKERS=1``.
+    """
+    global _in_process
+    if os.environ.get("SENTINEL_EXTERNAL_WORKERS", "") == "1":
+        yield
+        return
+    worker = RuleWorker(web_process_id(), _lease_seconds(), _poll_interval())
+    task = asyncio.create_task(worker.run())
+    _in_process = worker
+    try:
+        yield
+    finally:
+        _in_process = None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def _serve(worker: RuleWorker):
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, task.cancel)
+        except NotImplementedError:
+            pass
+    try:
+        await worker.run()
+    except asyncio.CancelledError:
+        pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--worker-id", default=f"{socket.gethostname()}-{os.getpid()}"
+    )
+    parser.add_argument("--lease-seconds", type=float, default=_lease_seconds())
+    parser.add_argument("--poll-interval", type=float, default=_poll_interval())
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+        stream=sys.stderr,
+    )
+    worker = RuleWorker(args.worker_id, args.lease_seconds, args.poll_interval)
+    asyncio.run(_serve(worker))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Import-time budget report for backend worker cold start.
+
+Usage:
+    python -m benchmarks.import_time --budget-ms 2500 --output import_time.json
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters,
+keeps the fastest run, and reports the total plus the heaviest top-level
+packages. Exits non-zero when the total exceeds ``--budget-ms`` or when a
+``--forbid`` package (lazily loaded integrations) was imported at startup.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+DEFAULT_MODULES = ["app.states.alert_state", "app.api"]
+DEFAULT_FORBID = ["prefect", "pyarrow"]
+
+
+def measure(module: str) -> dict:
+    """One ``-X importtime`` run; returns per-module self/cumulative µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = {
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": len(indent) // 2,
+        }
+    return modules
+
+
+def report(module: str, runs: int, top: int, forbid: list[str]) -> dict:
+    samples = [measure(module) for _ in range(runs)]
+    totals = [
+        sum(m["cumulative_us"] for m in sample.values() if m["depth"] == 0)
+        for sample in samples
+    ]
+    best = samples[totals.index(min(totals))]
+    packages: dict[str, int] = {}
+    for name, m in best.items():
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + m["self_us"]
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "module": module,
+        "total_ms": round(min(totals) / 1000, 1),
+        "runs_ms": [round(t / 1000, 1) for t in totals],
+        "modules_imported": len(best),
+        "top_packages": [
+            {"package": name, "self_ms": round(us / 1000, 1)}
+            for name, us in heaviest[:top]
+        ],
+        "forbidden_imported": sorted(
+            {name.split(".")[0] for name in best} & set(forbid)
+        ),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBID)
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+    results = [report(m, args.runs, args.top, args.forbid) for m in args.modules]
+    failures = []
+    for result in results:
+        if args.budget_ms is not None and result["total_ms"] > args.budget_ms:
+            failures.append(
+                f"{result['module']}: {result['total_ms']} ms > {args.budget_ms} ms"
+            )
+        if result["forbidden_imported"]:
+            failures.append(
+                f"{result['module']}: imported {', '.join(result['forbidden_imported'])}"
+            )
+    payload = json.dumps(
+        {"budget_ms": args.budget_ms, "results": results, "failures": failures},
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+    for failure in failures:
+        print(f"Import budget exceeded: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""Benchmark the AlertState hot paths against synthetic data.
+
+Usage:
+    python -m benchmarks.run --events 10000 100000 --rules 10000 --output bench.json
+
+Each computed var is timed with its cache cleared so every repeat does the
+full recomputation. Results are written as JSON for regression tracking.
+Use ``--only``/``--skip`` to limit the run; ``sync_prefect_status`` currently
+scans every event per rule, so it dominates at 1M events x 10k rules.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+os.environ.setdefault(
+    "SENTINEL_DB_PATH",
+    os.path.join(tempfile.mkdtemp(prefix="sentinel-bench-"), "bench.db"),
+)
+
+import reflex as rx
+from app.services import prefect_service
+from app.services.rule_store import RuleStore
+from app.services.run_queue import RunQueue
+from app.states.alert_state import AlertState
+from app.worker import RuleWorker
+from benchmarks.synthetic import (
+    FakePrefectClient,
+    FakeFilter,
+    make_events,
+    make_logs,
+    make_rules,
+)
+
+HISTORY_FILTERS = {
+    "none": {},
+    "importance": {"history_importance_filter": "Critical"},
+    "prefect_state": {"prefect_state_filter": "RUNNING"},
+    "search": {"history_search_query": "latency"},
+    "date_range": {"history_start_date": "-3", "history_end_date": "-1"},
+    "combined": {
+        "history_importance_filter": "High",
+        "prefect_state_filter": "None",
+        "history_search_query": "nvda",
+        "history_start_date": "-5",
+        "history_end_date": "0",
+    },
+}
+LOG_FILTERS = {
+    "none": {},
+    "level": {"log_level_filter": "Error"},
+    "search": {"log_search_query": "timeout"},
+    "date_range": {"log_start_date": "-1", "log_end_date": "0"},
+}
+
+
+class _BackgroundProxy:
+    """Lets a background handler's ``async with self`` run on a bare state."""
+
+    def __init__(self, state):
+        object.__setattr__(self, "_state", state)
+
+    def __getattr__(self, name):
+        return getattr(self._state, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._state, name, value)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _new_state() -> AlertState:
+    root = rx.State(_reflex_internal_init=True)
+    return root.get_substate(AlertState.get_full_name().split(".")[1:])
+
+
+def _clear_computed(state: AlertState):
+    for var in AlertState.computed_vars.values():
+        state.__dict__.pop(var._cache_attr, None)
+
+
+def _resolve_dates(filters: dict) -> dict:
+    """Turn relative day offsets ("-3") into YYYY-MM-DD strings."""
+    today = datetime.utcnow()
+    resolved = {}
+    for key, value in filters.items():
+        if key.endswith("_date"):
+            value = (today + timedelta(days=int(value))).strftime("%Y-%m-%d")
+        resolved[key] = value
+    return resolved
+
+
+def _apply(state: AlertState, filters: dict):
+    defaults = {
+        "history_importance_filter": "All",
+        "prefect_state_filter": "All",
+        "history_search_query": "",
+        "history_start_date": "",
+        "history_end_date": "",
+        "log_level_filter": "All",
+        "log_search_query": "",
+        "log_start_date": "",
+        "log_end_date": "",
+    }
+    for key, value in {**defaults, **_resolve_dates(filters)}.items():
+        setattr(state, key, value)
+
+
+def _time(fn, repeat: int) -> dict:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "rows": len(result) if isinstance(result, (list, dict)) else None,
+    }
+
+
+def _computed(state: AlertState, name: str, filters: dict | None = None):
+    def run():
+        _clear_computed(state)
+        if filters is not None:
+            _apply(state, filters)
+        return getattr(state, name)
+
+    return run
+
+
+def _install_fake_prefect():
+    prefect_service.prefect.override(
+        SimpleNamespace(
+            get_client=FakePrefectClient,
+            FlowRunFilter=FakeFilter,
+            FlowRunFilterId=FakeFilter,
+        )
+    )
+
+
+BENCHMARKS = [
+    "all_live_events",
+    "paginated_live_events",
+    "prefect_stats",
+    "history_grid_data",
+    "filtered_logs",
+    "sync_prefect_status",
+    "rule_sweep",
+]
+
+
+def bench_size(
+    events: int, rules: int, logs: int, repeat: int, seed: int, selected: set[str]
+) -> list[dict]:
+    rng = random.Random(seed)
+    rule_objs = make_rules(rules, rng)
+    event_objs = make_events(events, rule_objs, rng)
+    state = _new_state()
+    state.rules = rule_objs
+    state.events = event_objs
+    state.system_logs = make_logs(logs, rng)
+    results = []
+
+    def record(name: str, timing: dict, **extra):
+        results.append(
+            {"benchmark": name, "events": events, "rules": rules, **extra, **timing}
+        )
+        label = f" [{extra['filter']}]" if "filter" in extra else ""
+        logging.info(f"{name}{label} @ {events} events: {timing['median_ms']} ms")
+
+    for name in ("all_live_events", "paginated_live_events", "prefect_stats"):
+        if name in selected:
+            record(name, _time(_computed(state, name), repeat))
+    for name, variants in (
+        ("history_grid_data", HISTORY_FILTERS),
+        ("filtered_logs", LOG_FILTERS),
+    ):
+        if name not in selected:
+            continue
+        for label, filters in variants.items():
+            record(name, _time(_computed(state, name, filters), repeat), filter=label)
+    _apply(state, {})
+
+    if "sync_prefect_status" in selected:
+        sync = AlertState.event_handlers["sync_prefect_status"].fn
+        proxy = _BackgroundProxy(state)
+        record(
+            "sync_prefect_status",
+            _time(lambda: asyncio.run(sync(proxy)), repeat),
+            linked_runs=sum(1 for e in state.events if e.prefect_flow_run_id),
+        )
+    if "rule_sweep" in selected:
+        RuleStore.seed(rule_objs)
+        worker = RuleWorker("bench")
+        worker.renew(time.time())
+
+        def sweep():
+            queue = RunQueue()
+            now = time.time()
+            for rule in worker.rules.values():
+                queue.push(rule, now, worker.scheduler.deadline(rule, now))
+            asyncio.run(worker._run_rules(queue))
+
+        record("rule_sweep", _time(sweep, max(1, repeat // 2)))
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--rules", type=int, default=10000)
+    parser.add_argument("--logs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--skip", nargs="+", choices=BENCHMARKS, default=[])
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+    selected = set(args.only) - set(args.skip)
+    logging.basicConfig(
+        level=logging.INFO, format="%(message)s", stream=sys.stderr, force=True
+    )
+    _install_fake_prefect()
+    report = {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "reflex": rx.constants.Reflex.VERSION,
+            "platform": platform.platform(),
+            "rules": args.rules,
+            "logs": args.logs,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "benchmarks": sorted(selected),
+        },
+        "results": [],
+    }
+    for events in args.events:
+        report["results"].extend(
+            bench_size(
+                events, args.rules, args.logs, args.repeat, args.seed, selected
+            )
+        )
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+    return report
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
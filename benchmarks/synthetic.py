@@ -0,0 +1,157 @@
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+from app.models import AlertEvent, AlertRule, LogEntry, PREFECT_STATES
+
+CATEGORIES = ["Market", "System", "Security", "Liquidity", "News"]
+IMPORTANCES = ["critical", "high", "medium", "low"]
+TICKERS = ["AAPL", "NVDA", "MSFT", "TSLA", "GOOGL", "SYS-01", "API-GW", "DB-PROD"]
+MESSAGES = [
+    "High latency detected",
+    "Unusual volume spike",
+    "Price threshold breached",
+    "Connection timeout",
+    "Unauthorized access attempt",
+    "Liquidity crunch warning",
+]
+LOG_LEVELS = ["info", "success", "warning", "error"]
+
+RULE_TEMPLATES = [
+    (
+        "cpu_usage_trigger",
+        "System",
+        lambda i: {"server": f"SRV-{i:05d}", "threshold": 90},
+    ),
+    (
+        "price_surge_trigger",
+        "Market",
+        lambda i: {"ticker": TICKERS[i % len(TICKERS)], "threshold": 180.0},
+    ),
+    (
+        "volume_spike_trigger",
+        "Market",
+        lambda i: {"ticker": TICKERS[i % len(TICKERS)], "avg_volume": 5000000},
+    ),
+    (
+        "expression_trigger",
+        "Market",
+        lambda i: {
+            "ticker": TICKERS[i % len(TICKERS)],
+            "expression": f"price > {150 + i % 50} and volume_pct > 200",
+        },
+    ),
+]
+
+
+def make_rules(count: int, rng: random.Random) -> list[AlertRule]:
+    """Active rules cycling through the offline (non-network) mock triggers."""
+    rules = []
+    for i in range(count):
+        script, category, params = RULE_TEMPLATES[i % len(RULE_TEMPLATES)]
+        rules.append(
+            AlertRule(
+                id=i + 1,
+                name=f"Bench {script} #{i + 1}",
+                trigger_script=script,
+                parameters=json.dumps(params(i)),
+                importance=rng.choice(IMPORTANCES),
+                category=category,
+                period_seconds=300,
+                display_duration_minutes=rng.choice([60, 120, 1440]),
+                action_config=json.dumps({"emails": []}),
+                is_active=True,
+            )
+        )
+    return rules
+
+
+def make_events(
+    count: int, rules: list[AlertRule], rng: random.Random, days: int = 7
+) -> list[AlertEvent]:
+    """Events shaped like the `_initialize_db` mock history, spread over ``days``."""
+    now = datetime.utcnow()
+    base_time = now - timedelta(days=days)
+    span_minutes = days * 24 * 60
+    events = []
+    for i in range(count):
+        rule = rules[rng.randrange(len(rules))]
+        ticker = rng.choice(TICKERS)
+        event = AlertEvent(
+            id=i + 1,
+            rule_id=rule.id,
+            timestamp=base_time + timedelta(minutes=rng.randrange(span_minutes)),
+            message=f"{rng.choice(MESSAGES)} on {ticker}",
+            importance=rng.choice(IMPORTANCES),
+            category=rng.choice(CATEGORIES),
+            is_acknowledged=rng.random() < 0.5,
+            comment="Auto-generated history" if rng.random() > 0.5 else None,
+            ticker=ticker,
+        )
+        if event.is_acknowledged:
+            event.acknowledged_timestamp = event.timestamp + timedelta(
+                minutes=rng.randint(5, 120)
+            )
+        if rng.random() < 0.3:
+            event.prefect_flow_run_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            event.prefect_state = rng.choice(["SCHEDULED", "PENDING", "RUNNING"])
+        events.append(event)
+    return events
+
+
+def make_logs(count: int, rng: random.Random) -> list[LogEntry]:
+    """System log entries, newest first like `log_system_event` keeps them."""
+    now = datetime.utcnow()
+    logs = []
+    for i in range(count):
+        logs.append(
+            LogEntry(
+                timestamp=(now - timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+                type=rng.choice(["Trigger Execution", "Prefect Sync", "Acknowledge"]),
+                message=f"{rng.choice(MESSAGES)} ({i})",
+                level=rng.choice(LOG_LEVELS),
+                ticker=rng.choice(TICKERS),
+            )
+        )
+    return logs
+
+
+class FakePrefectClient:
+    """Stands in for ``prefect.client.orchestration.get_client()``.
+
+    ``read_flow_runs`` answers every requested id with a deterministic
+    terminal or running state, without any network I/O.
+    """
+
+    class _State:
+        def __init__(self, name: str):
+            self.name = name
+
+    class _FlowRun:
+        def __init__(self, run_id: uuid.UUID, state: str):
+            self.id = run_id
+            self.state = FakePrefectClient._State(state)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read_flow_runs(self, flow_run_filter=None, **kwargs):
+        ids = flow_run_filter.id.any_ if flow_run_filter is not None else []
+        return [
+            self._FlowRun(run_id, PREFECT_STATES[run_id.int % len(PREFECT_STATES)])
+            for run_id in ids
+        ]
+
+    async def read_deployments(self, **kwargs):
+        return []
+
+
+class FakeFilter:
+    """Attribute bag standing in for Prefect's FlowRunFilter/FlowRunFilterId."""
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
\ No newline at end of file
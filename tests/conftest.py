@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the shared Sentinel database at a fresh file for one test."""
+    path = str(tmp_path / "sentinel.db")
+    monkeypatch.setenv("SENTINEL_DB_PATH", path)
+    return path
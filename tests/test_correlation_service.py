@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+from app.models import AlertEvent
+from app.services.correlation_service import IncidentCorrelator
+
+START = datetime(2026, 1, 5, 9, 0)
+
+
+def _event(event_id: int, ticker: str, minutes: int = 0) -> AlertEvent:
+    return AlertEvent(
+        id=event_id,
+        ticker=ticker,
+        category=ticker,
+        message=f"{ticker} alert",
+        timestamp=START + timedelta(minutes=minutes),
+    )
+
+
+def _correlator(incidents: list) -> IncidentCorrelator:
+    return IncidentCorrelator(incidents, 1, topology={}, now=START)
+
+
+def test_events_join_incidents_within_the_window():
+    correlator = _correlator([])
+    first = correlator.assign(_event(1, "AAPL"))
+    assert correlator.assign(_event(2, "AAPL", minutes=4)) is first
+    assert correlator.assign(_event(3, "AAPL", minutes=10)) is not first
+    assert correlator.assign(_event(4, "MSFT", minutes=10)).id == 3
+
+
+def test_prune_expires_only_settled_incidents_past_the_window():
+    incidents = []
+    correlator = _correlator(incidents)
+    events = {e.id: e for e in (_event(1, "AAPL"), _event(2, "MSFT"), _event(3, "DB"))}
+    for event in events.values():
+        correlator.assign(event)
+    events[1].is_resolved = True
+    incidents[2].is_acknowledged = True
+
+    assert correlator.prune(events, START + timedelta(minutes=3)) == []
+    expired = correlator.prune(events, START + timedelta(minutes=6))
+    assert [i.id for i in expired] == [1, 3]
+    assert [i.id for i in incidents] == [2]
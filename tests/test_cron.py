@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+import pytest
+from app.services.cron import parse_cron
+
+MONDAY = datetime(2026, 1, 5, 9, 7, tzinfo=timezone.utc)
+
+
+def _next(expression: str, after: datetime = MONDAY) -> datetime:
+    return parse_cron(expression).next_fire(after).astimezone(timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("*/15 * * * *", datetime(2026, 1, 5, 9, 15)),
+        ("0 9-17/4 * * mon-fri", datetime(2026, 1, 5, 13, 0)),
+        ("@monthly", datetime(2026, 2, 1, 0, 0)),
+        ("0 0 29 feb *", datetime(2028, 2, 29, 0, 0)),
+        # Day of month and day of week both restricted: either matches.
+        ("0 0 13 * fri", datetime(2026, 1, 9, 0, 0)),
+    ],
+)
+def test_next_fire(expression, expected):
+    assert _next(expression) == expected.replace(tzinfo=timezone.utc)
+
+
+def test_next_fire_is_strictly_after():
+    fire = _next("7 9 * * *")
+    assert fire == datetime(2026, 1, 6, 9, 7, tzinfo=timezone.utc)
+
+
+def test_daylight_saving_changes_fire_once():
+    skipped = "CRON_TZ=America/New_York 30 2 * * *"
+    spring = _next(skipped, datetime(2026, 3, 7, 12, tzinfo=timezone.utc))
+    assert spring == datetime(2026, 3, 8, 7, 30, tzinfo=timezone.utc)
+    repeated = "CRON_TZ=America/New_York 30 1 * * *"
+    first_pass = datetime(2026, 11, 1, 5, 30, tzinfo=timezone.utc)
+    assert _next(repeated, first_pass) == datetime(
+        2026, 11, 2, 6, 30, tzinfo=timezone.utc
+    )
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "* * *",
+        "61 * * * *",
+        "* * * * */0",
+        "0 0 * * xyz",
+        "0 0 30 feb *",
+        "CRON_TZ=Nowhere/City * * * * *",
+    ],
+)
+def test_invalid_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        parse_cron(expression)
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.models import AlertEvent, AlertOutput, AlertRule
+from app.services.alert_recorder import AlertRecorder
+from app.services.dedup_service import AlertDeduplicator
+
+RULE = AlertRule(id=1, name="CPU", suppression_window_seconds=300)
+START = datetime(2026, 1, 5, 9, 0)
+
+
+def _output(
+    message: str = "CPU at 95%", importance: str = "medium", ticker: str = "SYS-01"
+) -> AlertOutput:
+    return AlertOutput(
+        triggered=True,
+        importance=importance,
+        ticker=ticker,
+        message=message,
+        timestamp=START.isoformat(),
+    )
+
+
+def _record(dedup, output, minutes: float, event_id: int, rule: AlertRule = RULE):
+    """Merge an output, creating event ``event_id`` when it isn't a repeat."""
+    now = START + timedelta(minutes=minutes)
+    if repeat := dedup.merge(rule, output, now):
+        return repeat
+    event = AlertEvent(
+        id=event_id, rule_id=rule.id, timestamp=now, ticker=output.ticker
+    )
+    dedup.register(rule, output, event)
+    return event
+
+
+def test_repeats_inside_the_window_fold_onto_the_open_event():
+    dedup = AlertDeduplicator({}, [])
+    first = _record(dedup, _output(), 0, 1)
+    repeat = _record(dedup, _output("CPU at 97.5%", "critical"), 4, 2)
+    assert repeat is first
+    assert first.repeat_count == 2 and first.importance == "critical"
+    assert first.message == "CPU at 97.5%"
+    assert _record(dedup, _output("Disk full"), 4, 3).id == 3
+    assert _record(dedup, _output(ticker="SYS-02"), 4, 4).id == 4
+
+
+def test_repeat_after_the_window_resolves_the_old_event():
+    dedup = AlertDeduplicator({}, [])
+    first = _record(dedup, _output(), 0, 1)
+    _record(dedup, _output(), 4, 9)
+    second = _record(dedup, _output(), 10, 2)
+    assert second.id == 2
+    assert dedup.expired == [first] and first.is_resolved
+    assert set(dedup.open_events()) == {2}
+
+
+def test_window_zero_never_folds_but_resolves_the_previous_event():
+    rule = RULE.copy(update={"suppression_window_seconds": 0})
+    dedup = AlertDeduplicator({}, [])
+    first = _record(dedup, _output(), 0, 1, rule)
+    second = _record(dedup, _output(), 1, 2, rule)
+    assert second is not first and first.is_resolved
+    assert set(dedup.open_events()) == {2}
+
+
+def test_cleared_condition_resolves_only_its_ticker():
+    dedup = AlertDeduplicator({}, [])
+    first = _record(dedup, _output(), 0, 1)
+    other = _record(dedup, _output(ticker="SYS-02"), 0, 2)
+    resolved = dedup.resolve(RULE.id, "SYS-01", START + timedelta(minutes=1))
+    assert resolved == [first] and not other.is_resolved
+    assert set(dedup.open_events()) == {2}
+
+
+def test_writers_deduplicate_against_each_others_events(db_path):
+    async def record(recorder: AlertRecorder, message: str):
+        recorder.begin()
+        action, (event,) = recorder.record(RULE, _output(message), datetime.utcnow())
+        await recorder.commit(recorder.finish())
+        return action, event
+
+    async def scenario():
+        worker, ingestion = AlertRecorder("worker:a"), AlertRecorder("ingestion")
+        created = await record(worker, "CPU at 95%")
+        repeated = await record(ingestion, "CPU at 96%")
+        return created, repeated
+
+    (created, first), (repeated, second) = asyncio.run(scenario())
+    assert (created, repeated) == ("created", "repeated")
+    assert second.id == first.id and second.repeat_count == 2
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime
+from app.models import AlertOutput, AlertRule
+from app.services.alert_recorder import AlertRecorder
+from app.services.event_store import EventStore, event_from_output
+
+RULE = AlertRule(id=1, name="CPU", suppression_window_seconds=900)
+
+
+def _output(message: str = "CPU at 95%") -> AlertOutput:
+    return AlertOutput(
+        triggered=True,
+        importance="high",
+        ticker="SYS-01",
+        message=message,
+        timestamp=datetime.utcnow().isoformat(),
+    )
+
+
+def _stored(event_id: int):
+    _, events = EventStore.changes_since(0)
+    return next(e for e in events if e.id == event_id)
+
+
+async def _record(recorder: AlertRecorder, output: AlertOutput):
+    """One worker pass: sync, dedup, commit."""
+    recorder.begin()
+    _, (event,) = recorder.record(RULE, output, datetime.utcnow())
+    await recorder.commit(recorder.finish())
+    return event
+
+
+def test_acknowledged_event_stops_absorbing_repeats(db_path):
+    async def scenario():
+        worker = AlertRecorder("worker:test")
+        first = await _record(worker, _output())
+        assert (await _record(worker, _output("CPU at 97%"))).id == first.id
+        acked = _stored(first.id).copy(update={"is_acknowledged": True})
+        await EventStore.commit([acked], source=EventStore.USER_SOURCE)
+        second = await _record(worker, _output("CPU at 99%"))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second.id != first.id
+    stored = _stored(first.id)
+    assert stored.is_acknowledged and stored.repeat_count == 2
+
+
+def test_commits_keep_the_fields_they_do_not_own(db_path):
+    async def scenario():
+        now = datetime.utcnow()
+        event = event_from_output(RULE, _output(), EventStore.next_id(), now)
+        await EventStore.commit([event], source="worker:test")
+        stale = event.copy()
+        event.repeat_count = 5
+        await EventStore.commit([event], source="worker:test")
+        acked = stale.copy(update={"is_acknowledged": True, "comment": "on it"})
+        await EventStore.commit([acked], source=EventStore.USER_SOURCE)
+        after_ack = _stored(event.id)
+        event.repeat_count = 6
+        await EventStore.commit([event], source="worker:test")
+        return after_ack, _stored(event.id)
+
+    after_ack, after_repeat = asyncio.run(scenario())
+    assert after_ack.repeat_count == 5 and after_ack.is_acknowledged
+    assert after_repeat.repeat_count == 6
+    assert after_repeat.is_acknowledged and after_repeat.comment == "on it"
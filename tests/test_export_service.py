@@ -0,0 +1,36 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from app.models import AlertEvent
+from app.services.event_store import EventStore
+from app.services.export_service import ExportRegistry
+
+
+def _event(minutes_ago: int, importance: str) -> AlertEvent:
+    return AlertEvent(
+        id=EventStore.next_id(),
+        rule_id=1,
+        message=f"{importance} alert",
+        importance=importance,
+        timestamp=datetime.utcnow() - timedelta(minutes=minutes_ago),
+        is_acknowledged=False,
+    )
+
+
+def test_export_streams_matching_stored_events_newest_first(db_path):
+    events = [_event(m, "high" if m % 2 else "low") for m in range(7)]
+    asyncio.run(EventStore.commit(events, source="worker:test"))
+    token = ExportRegistry.register({"importance": "High"}, "ndjson")
+    fmt, criteria = ExportRegistry.take(token)
+    assert ExportRegistry.take(token) is None
+    body = "".join(ExportRegistry.stream(fmt, criteria))
+    exported = [json.loads(line)["id"] for line in body.splitlines()]
+    assert exported == [e.id for e in events if e.importance == "high"]
+
+
+def test_store_cursor_pages_through_equal_timestamps(db_path):
+    at = datetime.utcnow()
+    events = [_event(0, "low").copy(update={"timestamp": at}) for _ in range(5)]
+    asyncio.run(EventStore.commit(events, source="worker:test"))
+    ids = [e.id for e in EventStore.iter_newest_first(page_size=2)]
+    assert ids == sorted((e.id for e in events), reverse=True)
@@ -0,0 +1,54 @@
+import pytest
+from app.alert_triggers.expressions import compile_expression
+
+SNAPSHOT = {"price": 190.0, "volume_pct": 250.0}
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "'x' * 999999999999",
+        "999999999999 * 'x'",
+        "'%0999999999d' % 1",
+        "[price] * 99999999999 == []",
+        "(1,) * 999999999999",
+        "{1} * 2",
+        "('x' if 1 else '') * 999999999999",
+        "(price and 'x') * 999999999999",
+        "min('a', 'b') * 999999999999",
+        "max(1, 'b' + 'c') * 999999999999",
+        "('a' + 'b') * 999999999999",
+        "price in [[1] * 999999999999]",
+        "price in ['x' * 999999999999]",
+        "[1, 2] == [1, 2]",
+        "len([1])",
+        "price ** 2 > 1",
+        "price.real > 1",
+        "__import__('os')",
+    ],
+)
+def test_rejects_unsafe_expressions(source):
+    with pytest.raises(ValueError):
+        compile_expression(source)
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("price > 180 and volume_pct > 200", True),
+        ("price * 2 > 300", True),
+        ("abs(price - 200) < 5", False),
+        ("max(price, volume_pct) == 250", True),
+        ("round(price) in [190, 191]", True),
+        ("price not in (1, 2, 3)", True),
+        ("price in {190.0}", True),
+        ("(price if volume_pct > 100 else 0) > 150", True),
+    ],
+)
+def test_evaluates_supported_expressions(source, expected):
+    assert compile_expression(source)(SNAPSHOT) is expected
+
+
+def test_missing_metric_raises_key_error():
+    with pytest.raises(KeyError):
+        compile_expression("latency_ms > 5")(SNAPSHOT)
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.services.health_prober import HealthProber
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+@pytest.fixture
+def health_server():
+    """Serves ``/ok`` (200), ``/down`` (503) and ``/slow`` (200 after 0.3s).
+
+    Yields the base URL (with ``localhost``), the port and the list of
+    ``(path, Host header)`` of every request.
+    """
+    requests = []
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with lock:
+                requests.append((self.path, self.headers.get("Host")))
+            if self.path == "/slow":
+                time.sleep(0.3)
+            status = 503 if self.path == "/down" else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = _Server(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    try:
+        yield f"http://localhost:{port}", port, requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _run(scenario):
+    async def wrapper():
+        prober = HealthProber(timeout=2, dns_ttl=60)
+        try:
+            return await scenario(prober)
+        finally:
+            await prober.close()
+
+    return asyncio.run(wrapper())
+
+
+def test_probe_reports_health_and_status(health_server):
+    base, port, requests = health_server
+
+    async def scenario(prober):
+        return await prober.probe(f"{base}/ok"), await prober.probe(f"{base}/down")
+
+    ok, down = _run(scenario)
+    assert (ok.healthy, ok.status_code, ok.error) == (True, 200, "")
+    assert (down.healthy, down.status_code, down.error) == (False, 503, "HTTP 503")
+    assert requests == [("/ok", f"localhost:{port}"), ("/down", f"localhost:{port}")]
+
+
+def test_probe_reuses_fresh_results_and_joins_in_flight_probes(health_server):
+    base, _, requests = health_server
+    url = f"{base}/slow"
+
+    async def scenario(prober):
+        results = await asyncio.gather(*(prober.probe(url) for _ in range(5)))
+        cached = await prober.probe(url, max_age=60)
+        fresh = await prober.probe(url, max_age=0)
+        return results, cached, fresh
+
+    results, cached, fresh = _run(scenario)
+    assert len({id(r) for r in results}) == 1
+    assert cached is results[0]
+    assert fresh is not results[0]
+    assert len(requests) == 2
+
+
+def test_probe_many_keeps_order_and_runs_concurrently(health_server):
+    base, _, _ = health_server
+    urls = [f"{base}/slow?{i}" for i in range(6)] + [f"{base}/down"]
+
+    async def scenario(prober):
+        started = time.perf_counter()
+        results = await prober.probe_many(urls)
+        return results, time.perf_counter() - started
+
+    results, elapsed = _run(scenario)
+    assert [r.url for r in results] == urls
+    assert [r.healthy for r in results] == [True] * 6 + [False]
+    assert elapsed < 6 * 0.3
+
+
+def test_prefetch_starts_probes_that_probe_joins(health_server):
+    base, _, requests = health_server
+    urls = [f"{base}/slow?{i}" for i in range(3)]
+
+    async def scenario(prober):
+        prober.prefetch(urls + urls, max_age=60)
+        await asyncio.sleep(0)
+        assert len(prober._inflight) == 3
+        results = [await prober.probe(url, max_age=60) for url in urls]
+        prober.prefetch(urls, max_age=60)
+        assert not prober._inflight
+        return results
+
+    results = _run(scenario)
+    assert all(r.healthy for r in results)
+    assert len(requests) == 3
+
+
+def test_dns_cache_keeps_connections_per_host_name(health_server, monkeypatch):
+    base, port, requests = health_server
+    lookups = []
+
+    async def scenario(prober):
+        client = prober._get_client()
+        backend = client._transport.resolver
+        resolve = backend._lookup
+
+        async def counting_lookup(key):
+            lookups.append(key)
+            return await resolve(key)
+
+        monkeypatch.setattr(backend, "_lookup", counting_lookup)
+        for _ in range(3):
+            await prober.probe(f"{base}/ok")
+        await prober.probe(f"http://127.0.0.1:{port}/ok")
+        pool = client._transport._pool
+        return {connection._origin.host for connection in pool.connections}
+
+    hosts = _run(scenario)
+    assert lookups == [("localhost", port)]
+    # localhost and 127.0.0.1 are the same address but different origins, so
+    # they must not share a pooled connection (or TLS session).
+    assert hosts == {b"localhost", b"127.0.0.1"}
+    assert [host for _, host in requests] == [f"localhost:{port}"] * 3 + [
+        f"127.0.0.1:{port}"
+    ]
@@ -0,0 +1,35 @@
+import asyncio
+from app.models import AlertRule
+from app.services import alert_recorder
+from app.services.ingestion_service import IngestionService
+from app.services.rule_store import RuleStore
+
+
+class _Recorded:
+    def __init__(self):
+        self.enqueued = []
+
+    def enqueue(self, rule, event):
+        self.enqueued.append((rule.name, rule.action_config, event.id))
+        return 1
+
+
+def test_ingested_alerts_run_the_stored_rule_actions(db_path, monkeypatch):
+    webhooks = _Recorded()
+    monkeypatch.setattr(alert_recorder, "get_dispatcher", lambda: None)
+    monkeypatch.setattr(alert_recorder, "get_webhook_dispatcher", lambda: webhooks)
+    monkeypatch.setattr(IngestionService, "_lock", None)
+    config = '{"webhooks": [{"url": "http://example.invalid/hook"}]}'
+    RuleStore.seed([AlertRule(id=7, name="Disk", action_config=config)])
+    payload = {"importance": "high", "ticker": "DB-1", "triggered": True}
+    items = [
+        IngestionService.parse({**payload, "rule_id": 7, "message": "disk 91%"}),
+        IngestionService.parse({**payload, "rule_id": 7, "message": "disk 93%"}),
+        IngestionService.parse({**payload, "message": "no rule"}),
+    ]
+    results = asyncio.run(IngestionService.ingest(items))
+    assert [r["action"] for r in results] == ["created", "repeated", "created"]
+    assert webhooks.enqueued == [
+        ("Disk", config, results[0]["event_id"]),
+        ("External", "{}", results[2]["event_id"]),
+    ]
@@ -0,0 +1,51 @@
+import asyncio
+from app.alert_runner import AlertRunner
+from app.services.metric_snapshots import MetricSnapshots
+from app.services.metrics import Metrics, SharedMetrics
+from app.services.tracing import Tracer
+
+
+def test_view_adds_up_published_processes(db_path):
+    Metrics.reset()
+    Metrics.inc("sentinel_trigger_runs_total", trigger="Price")
+    Metrics.observe("sentinel_sweep_duration_seconds", 0.2)
+    SharedMetrics.publish("worker-a", Metrics.export(breakers=[{"name": "flows"}]))
+    Metrics.inc("sentinel_trigger_runs_total", 2, trigger="Price")
+    view = SharedMetrics.view("web", Metrics.export())
+    Metrics.reset()
+    assert view.counter_values("sentinel_trigger_runs_total") == {
+        (("trigger", "Price"),): 4
+    }
+    assert view.histogram("sentinel_sweep_duration_seconds")[""].count == 2
+    assert view.extra("breakers") == [("worker-a", {"name": "flows"})]
+    text = view.render_prometheus()
+    assert 'sentinel_trigger_runs_total{process="web",trigger="Price"} 3' in text
+    assert 'sentinel_trigger_runs_total{process="worker-a",trigger="Price"} 1' in text
+
+
+def test_snapshots_are_shared_through_the_database(db_path):
+    MetricSnapshots.clear()
+    MetricSnapshots.update("SYS-01", {"cpu": 91})
+    assert MetricSnapshots.update("SYS-01", {"memory_mb": 512}) == {
+        "cpu": 91.0,
+        "memory_mb": 512.0,
+    }
+    # Another process only has what it reads back from the database.
+    MetricSnapshots._snapshots, MetricSnapshots._loaded_at = {}, None
+    assert MetricSnapshots.get("SYS-01") == {"cpu": 91.0, "memory_mb": 512.0}
+    MetricSnapshots.clear()
+
+
+def test_rule_ids_stay_out_of_metric_labels_but_reach_the_slow_rules():
+    Metrics.reset()
+    Tracer.clear()
+    for rule_id in (1, 2):
+        params = {"ticker": "AAPL", "threshold": 180.0}
+        run = AlertRunner.run_trigger("price_surge_trigger", params, rule_id=rule_id)
+        asyncio.run(run)
+    keys = Metrics.counter_values("sentinel_trigger_runs_total")
+    assert keys == {(("trigger", "price_surge_trigger"),): 2}
+    slowest = Tracer.slowest("trigger.check", "rule_id")
+    assert sorted(row["key"] for row in slowest) == ["1", "2"]
+    Metrics.reset()
+    Tracer.clear()
@@ -0,0 +1,222 @@
+import asyncio
+import smtplib
+import socket
+import time
+from datetime import datetime
+import pytest
+from app.models import AlertEvent, AlertRule
+from app.services import database
+from app.services.notification_service import (
+    NotificationDispatcher,
+    SmtpConfig,
+    SmtpConnectionPool,
+)
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+SERVER_IDLE_TIMEOUT = 0.5
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    """SMTP server that drops connections idle for SERVER_IDLE_TIMEOUT seconds."""
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=_free_port(),
+        timeout=SERVER_IDLE_TIMEOUT,
+    )
+    controller.start()
+    try:
+        yield controller, handler
+    finally:
+        controller.stop()
+
+
+def _config(controller, idle_check_seconds: float = 0.1) -> SmtpConfig:
+    return SmtpConfig(
+        host=controller.hostname,
+        port=controller.port,
+        idle_check_seconds=idle_check_seconds,
+    )
+
+
+def test_pool_replaces_connection_dropped_while_idle(smtp_server):
+    controller, _ = smtp_server
+
+    async def scenario():
+        pool = SmtpConnectionPool(_config(controller), size=1)
+        first = await pool.acquire()
+        pool.release(first)
+        await asyncio.sleep(SERVER_IDLE_TIMEOUT * 3)
+        second = await pool.acquire()
+        assert second is not first
+        assert second.noop()[0] == 250
+        assert pool._created == 1
+        pool.release(second)
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_pool_reuses_recent_connection_without_noop(smtp_server, monkeypatch):
+    controller, _ = smtp_server
+
+    async def scenario():
+        pool = SmtpConnectionPool(_config(controller, idle_check_seconds=60), size=1)
+        conn = await pool.acquire()
+        pool.release(conn)
+        monkeypatch.setattr(
+            SmtpConnectionPool, "_is_alive", staticmethod(lambda conn: False)
+        )
+        assert await pool.acquire() is conn
+        pool.release(conn)
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def _event(rule: AlertRule, event_id: int, message: str = "") -> AlertEvent:
+    return AlertEvent(
+        id=event_id,
+        rule_id=rule.id,
+        importance="high",
+        ticker="SRV",
+        message=message or f"alert {event_id}",
+        timestamp=datetime.utcnow(),
+    )
+
+
+async def _wait_for(handler: RecordingHandler, count: int):
+    deadline = time.monotonic() + 10
+    while len(handler.messages) < count and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+
+def test_digest_after_idle_timeout_is_sent_on_first_attempt(smtp_server, db_path):
+    controller, handler = smtp_server
+    rule = AlertRule(id=1, name="CPU", action_config='{"emails": ["ops@example.com"]}')
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(
+            _config(controller), workers=1, batch_window=0.1
+        )
+        try:
+            dispatcher.enqueue(rule, _event(rule, 1))
+            await _wait_for(handler, 1)
+            await asyncio.sleep(SERVER_IDLE_TIMEOUT * 3)
+            dispatcher.enqueue(rule, _event(rule, 2))
+            await _wait_for(handler, 2)
+        finally:
+            await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert len(handler.messages) == 2
+    rows = (
+        database.get_connection()
+        .execute("SELECT status, attempts FROM notification_outbox ORDER BY id")
+        .fetchall()
+    )
+    assert rows == [("sent", 1), ("sent", 1)]
+
+
+def test_unreachable_idle_connection_counts_as_dead():
+    conn = smtplib.SMTP()
+    assert SmtpConnectionPool._is_alive(conn) is False
+
+
+def test_alerts_within_the_window_go_out_as_one_digest_per_recipient(
+    smtp_server, db_path
+):
+    controller, handler = smtp_server
+    emails = '{"emails": ["ops@example.com", "dba@example.com"]}'
+    rule = AlertRule(id=1, name="CPU", action_config=emails)
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(
+            _config(controller), workers=2, batch_window=0.3
+        )
+        try:
+            for i in range(3):
+                dispatcher.enqueue(rule, _event(rule, i))
+            await _wait_for(handler, 2)
+            await asyncio.sleep(0.5)
+        finally:
+            await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert sorted(m.rcpt_tos[0] for m in handler.messages) == [
+        "dba@example.com",
+        "ops@example.com",
+    ]
+    for message in handler.messages:
+        body = message.content.decode()
+        assert "Subject: [Sentinel] 3 new alerts" in body
+        assert all(f"alert {i}" in body for i in range(3))
+
+
+def test_digests_reuse_the_pooled_connection(smtp_server, db_path, monkeypatch):
+    controller, handler = smtp_server
+    rule = AlertRule(id=1, name="CPU", action_config='{"emails": ["ops@example.com"]}')
+    connects = []
+    original = SmtpConnectionPool._connect
+
+    def counting_connect(pool):
+        connects.append(pool)
+        return original(pool)
+
+    monkeypatch.setattr(SmtpConnectionPool, "_connect", counting_connect)
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(
+            _config(controller, idle_check_seconds=60), workers=1, batch_window=0.1
+        )
+        try:
+            for i in range(3):
+                dispatcher.enqueue(rule, _event(rule, i))
+                await _wait_for(handler, i + 1)
+        finally:
+            await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert len(handler.messages) == 3
+    assert len(connects) == 1
+
+
+def test_line_breaks_in_alerts_do_not_reach_the_headers(smtp_server, db_path):
+    controller, handler = smtp_server
+    rule = AlertRule(id=1, name="CPU", action_config='{"emails": ["ops@example.com"]}')
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(
+            _config(controller), workers=1, batch_window=0.1
+        )
+        try:
+            dispatcher.enqueue(rule, _event(rule, 1, "disk full\r\nBcc: x@evil.test"))
+            await _wait_for(handler, 1)
+        finally:
+            await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert len(handler.messages) == 1
+    message = handler.messages[0]
+    assert message.rcpt_tos == ["ops@example.com"]
+    assert "Subject: [Sentinel] HIGH: disk full Bcc: x@evil.test" in (
+        message.content.decode()
+    )
@@ -0,0 +1,28 @@
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import receive_otlp_traces
+from app.services.tracing import OtlpCollectorStandIn
+
+PAYLOAD = {"resourceSpans": [{"scopeSpans": [{"spans": [{"name": "sweep"}]}]}]}
+
+
+def test_file_rotates_and_keeps_a_bounded_history(tmp_path, monkeypatch):
+    monkeypatch.setenv("SENTINEL_TRACE_DIR", str(tmp_path))
+    monkeypatch.setattr(OtlpCollectorStandIn, "MAX_FILE_BYTES", 200)
+    for _ in range(20):
+        assert OtlpCollectorStandIn.receive(PAYLOAD) == 1
+    names = sorted(os.listdir(tmp_path))
+    assert names == ["otlp.ndjson", "otlp.ndjson.1", "otlp.ndjson.2", "otlp.ndjson.3"]
+    assert all(os.path.getsize(tmp_path / name) <= 200 for name in names)
+
+
+def test_route_refuses_oversized_and_malformed_bodies(tmp_path, monkeypatch):
+    monkeypatch.setenv("SENTINEL_TRACE_DIR", str(tmp_path))
+    monkeypatch.setattr(OtlpCollectorStandIn, "MAX_PAYLOAD_BYTES", 100)
+    app = FastAPI()
+    app.add_api_route("/v1/traces", receive_otlp_traces, methods=["POST"])
+    client = TestClient(app)
+    assert client.post("/v1/traces", json=PAYLOAD).json() == {"accepted_spans": 1}
+    assert client.post("/v1/traces", content=b"x" * 101).status_code == 413
+    assert client.post("/v1/traces", content=b"[1]").status_code == 400
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from datetime import datetime
+from app.models import AlertOutput, AlertRule
+from app.services.event_store import EventStore, event_from_output
+from app.services.parquet_export import ParquetExporter
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+RULE = AlertRule(id=1, name="CPU")
+
+
+def _events(count: int):
+    output = AlertOutput(
+        triggered=True,
+        importance="high",
+        ticker="SYS-01",
+        message="CPU at 95%",
+        timestamp=datetime.utcnow().isoformat(),
+    )
+    return [
+        event_from_output(RULE, output, EventStore.next_id(), datetime.utcnow())
+        for _ in range(count)
+    ]
+
+
+def test_incremental_export_picks_up_updated_events(db_path, tmp_path):
+    exporter = ParquetExporter(str(tmp_path / "parquet"))
+    events = _events(3)
+    asyncio.run(EventStore.commit(events, source="worker:test"))
+    first = exporter.export()
+    assert first["events"] == 3
+    assert exporter.export()["events"] == 0
+    acked = events[1].copy(update={"is_acknowledged": True})
+    asyncio.run(EventStore.commit([acked], source=EventStore.USER_SOURCE))
+    second = exporter.export()
+    assert second["events"] == 1 and second["watermark"] > first["watermark"]
+    table = pq.read_table(str(tmp_path / "parquet")).to_pylist()
+    latest = {}
+    for row in sorted(table, key=lambda r: r["store_version"]):
+        latest[row["id"]] = row
+    assert len(table) == 4
+    assert [latest[e.id]["is_acknowledged"] for e in events] == [False, True, False]
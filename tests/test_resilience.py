@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from app.services import resilience
+from app.services.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimitedError,
+    TokenBucket,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+def _open_breaker(**options) -> CircuitBreaker:
+    breaker = CircuitBreaker("flows", min_calls=2, open_seconds=30, **options)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record(False)
+    return breaker
+
+
+def test_breaker_opens_at_the_failure_rate(clock):
+    breaker = CircuitBreaker("flows", window=4, min_calls=4, failure_rate=0.5)
+    for success in (True, False, True):
+        breaker.before_call()
+        breaker.record(success)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    assert breaker.state == OPEN and breaker.opens == 1
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_probes_close_the_breaker(clock):
+    breaker = _open_breaker(half_open_calls=2)
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record(True)
+    assert breaker.state == HALF_OPEN
+    breaker.record(True)
+    assert breaker.state == CLOSED and breaker.snapshot()["calls"] == 0
+
+
+def test_failed_probe_reopens_and_released_probes_are_returned(clock):
+    breaker = _open_breaker()
+    clock.now += 30
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    breaker.record(False)
+    assert breaker.state == OPEN and breaker.opens == 2
+    assert breaker.snapshot()["retry_in"] == 30
+    breaker.retry_now()
+    assert breaker.state == HALF_OPEN
+
+
+def test_token_bucket_allows_bursts_then_refills(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() == 0.5
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0
+    clock.now += 60
+    assert [bucket.try_acquire() for _ in range(4)] == [0, 0, 0, 0.5]
+
+
+def test_token_bucket_acquire_gives_up_past_max_wait(clock):
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.try_acquire()
+    with pytest.raises(RateLimitedError):
+        asyncio.run(bucket.acquire(max_wait=0.5, name="flows"))
+    assert TokenBucket(rate=0, capacity=1).try_acquire() == 0
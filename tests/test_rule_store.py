@@ -0,0 +1,34 @@
+from app.models import AlertRule
+from app.services.rule_store import RuleStore
+
+
+def _rules(*ids: int) -> list[AlertRule]:
+    return [AlertRule(id=i, name=f"Rule {i}", is_active=True) for i in ids]
+
+
+def test_seed_only_fills_an_empty_store(db_path):
+    assert RuleStore.seed(_rules(1, 2))
+    assert not RuleStore.seed(_rules(7))
+    assert [r.id for r in RuleStore.load()] == [1, 2]
+
+
+def test_save_and_delete_touch_one_rule(db_path):
+    RuleStore.seed(_rules(1, 2, 3))
+    edited = RuleStore.load()[1].copy(update={"name": "Edited"})
+    assert RuleStore.save(edited)
+    assert not RuleStore.save(edited)
+    assert RuleStore.delete(3)
+    assert not RuleStore.delete(3)
+    assert [(r.id, r.name) for r in RuleStore.load()] == [
+        (1, "Rule 1"),
+        (2, "Edited"),
+    ]
+
+
+def test_run_requests_are_taken_once_by_their_owner(db_path):
+    RuleStore.request_runs([1, 2, 3])
+    assert RuleStore.take_run_requests({4}) == set()
+    assert RuleStore.take_run_requests({1, 3, 4}) == {1, 3}
+    assert RuleStore.pending_runs([1, 2, 3]) == {2}
+    assert RuleStore.take_run_requests({1, 2, 3}) == {2}
+    assert RuleStore.take_run_requests({1, 2, 3}) == set()
@@ -0,0 +1,35 @@
+import time
+from app.models import AlertRule
+from app.services.metrics import Metrics
+from app.services.run_queue import RunQueue
+
+
+def _rule(rule_id: int, importance: str) -> AlertRule:
+    return AlertRule(id=rule_id, name=f"Rule {rule_id}", importance=importance)
+
+
+def test_runs_go_by_importance_then_deadline():
+    queue = RunQueue(budget_seconds=60)
+    now = time.time()
+    queue.push(_rule(1, "low"), now, now + 10)
+    queue.push(_rule(2, "critical"), now, now + 500)
+    queue.push(_rule(3, "medium"), now, now + 300)
+    queue.push(_rule(4, "medium"), now, now + 100)
+    queue.push(_rule(5, "bogus"), now, now + 200)
+    assert [r.id for r in queue] == [2, 4, 5, 3, 1]
+    assert queue.shed == []
+
+
+def test_late_low_priority_runs_are_shed():
+    Metrics.reset()
+    queue = RunQueue(budget_seconds=60)
+    late = time.time() - 120
+    for rule_id, importance in enumerate(["critical", "high", "medium", "low"]):
+        queue.push(_rule(rule_id, importance), late, late + 300)
+    assert [r.id for r in queue] == [0, 1]
+    assert [r.id for r in queue.shed] == [2, 3]
+    assert Metrics.counter_values("sentinel_runs_shed_total") == {
+        (("importance", "medium"),): 1,
+        (("importance", "low"),): 1,
+    }
+    Metrics.reset()
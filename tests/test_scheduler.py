@@ -0,0 +1,82 @@
+from app.models import AlertOutput, AlertRule
+from app.services.scheduler import RuleScheduler, ScheduleStore
+
+DAILY = AlertRule(id=1, name="Daily", is_active=True, period_seconds=86400)
+
+
+def _output(**metadata) -> AlertOutput:
+    return AlertOutput(
+        triggered=False,
+        importance="low",
+        ticker="SYS-01",
+        message="",
+        metadata=metadata,
+        timestamp="",
+    )
+
+
+def _take_over(now: float) -> RuleScheduler:
+    """A fresh scheduler syncing the rule the way a worker taking it does."""
+    scheduler = RuleScheduler([], {})
+    scheduler.sync([DAILY], now, ScheduleStore.load({DAILY.id}))
+    ScheduleStore.save(scheduler.changes())
+    return scheduler
+
+
+def test_takeover_resumes_the_saved_fire_time(db_path):
+    first = _take_over(1000.0)
+    assert first.heap[0][0] == 1000.0 + 86400
+    assert _take_over(5000.0).heap[0][0] == 1000.0 + 86400
+
+
+def test_overdue_saved_fire_runs_once_on_takeover(db_path):
+    _take_over(1000.0)
+    later = 1000.0 + 3 * 86400
+    scheduler = _take_over(later)
+    assert [entry[1] for entry in scheduler.pop_due(later)] == [DAILY.id]
+    assert scheduler.pop_due(later) == []
+
+
+def test_edited_rule_ignores_its_old_saved_fire_time(db_path):
+    _take_over(1000.0)
+    hourly = DAILY.copy(update={"period_seconds": 3600})
+    scheduler = RuleScheduler([], {})
+    scheduler.sync([hourly], 5000.0, ScheduleStore.load({DAILY.id}))
+    assert scheduler.heap[0][0] == 5000.0 + 3600
+
+
+def test_interval_rules_keep_their_cadence_and_collapse_missed_runs():
+    scheduler = RuleScheduler([], {})
+    scheduler.sync([DAILY.copy(update={"period_seconds": 60})], 1000.0)
+    assert scheduler.pop_due(1059.0) == []
+    (entry,) = scheduler.pop_due(1300.0)
+    scheduler.reschedule(DAILY.copy(update={"period_seconds": 60}), entry, 1300.0)
+    assert scheduler.heap[0][0] == 1360.0
+
+
+def test_edits_and_deactivation_drop_stale_entries():
+    scheduler = RuleScheduler([], {})
+    scheduler.sync([DAILY], 0.0)
+    cron = DAILY.copy(update={"schedule_cron": "*/5 * * * *"})
+    scheduler.sync([cron], 60.0)
+    assert [entry[2] for entry in scheduler.pop_due(300.0)] == ["cron:*/5 * * * *"]
+    scheduler.sync([cron.copy(update={"is_active": False})], 300.0)
+    assert scheduler.keys == {} and scheduler.pop_due(86400.0) == []
+
+
+def test_adaptive_rules_back_off_while_quiet_and_tighten_near_threshold():
+    rule = AlertRule(
+        id=2,
+        name="Adaptive",
+        is_active=True,
+        period_seconds=60,
+        adaptive_period=True,
+        min_period_seconds=10,
+        max_period_seconds=200,
+    )
+    previous, intervals = 60, []
+    for ratio in (0.1, 0.1, 0.1, 0.95):
+        rule.last_output = _output(value=ratio * 10, threshold=10)
+        previous = RuleScheduler.adaptive_interval(rule, previous)
+        intervals.append(previous)
+    assert intervals == [120, 200, 200, 10]
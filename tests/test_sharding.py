@@ -0,0 +1,46 @@
+from app.services.sharding import HashRing, RuleLeases
+
+RULE_IDS = range(1, 2001)
+
+
+def _owners(ring: HashRing) -> dict[int, str]:
+    return {rule_id: ring.owner(rule_id) for rule_id in RULE_IDS}
+
+
+def test_joining_worker_only_takes_rules_from_the_others():
+    before = _owners(HashRing(["a", "b", "c"]))
+    after = _owners(HashRing(["a", "b", "c", "d"]))
+    moved = [r for r in RULE_IDS if before[r] != after[r]]
+    assert all(after[r] == "d" for r in moved)
+    assert 0.15 < len(moved) / len(RULE_IDS) < 0.35
+
+
+def test_leaving_worker_only_hands_off_its_own_rules():
+    before = _owners(HashRing(["a", "b", "c", "d"]))
+    after = _owners(HashRing(["a", "c", "d"]))
+    assert [r for r in RULE_IDS if before[r] != after[r]] == [
+        r for r in RULE_IDS if before[r] == "b"
+    ]
+    assert set(after.values()) == {"a", "c", "d"}
+
+
+def test_ring_ignores_node_order_and_duplicates():
+    assert _owners(HashRing(["c", "a", "b", "a"])) == _owners(HashRing(["a", "b", "c"]))
+    assert HashRing([]).owner(1) is None
+
+
+def test_leases_move_only_after_expiry_or_leave(db_path):
+    assert RuleLeases.claim("a", {1, 2}, now=0, ttl=30) == {1, 2}
+    assert RuleLeases.claim("b", {2, 3}, now=10, ttl=30) == {3}
+    assert RuleLeases.claim("b", {2, 3}, now=31, ttl=30) == {2, 3}
+    assert RuleLeases.claim("a", {1, 2}, now=35, ttl=30) == {1}
+    RuleLeases.leave("b")
+    assert RuleLeases.claim("a", {1, 2, 3}, now=36, ttl=30) == {1, 2, 3}
+
+
+def test_live_workers_follow_heartbeats(db_path):
+    RuleLeases.heartbeat("a", "host-1", now=0)
+    RuleLeases.heartbeat("b", "host-2", now=20)
+    assert RuleLeases.live_workers(now=40, ttl=30) == ["b"]
+    RuleLeases.leave("b")
+    assert RuleLeases.live_workers(now=40, ttl=30) == []
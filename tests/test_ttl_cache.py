@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from app.services import ttl_cache
+from app.services.ttl_cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ttl_cache, "time", clock)
+    return clock
+
+
+class _Loader:
+    """Counts calls; each returns the call number after yielding once."""
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return call
+
+
+def test_concurrent_misses_share_one_load(clock):
+    cache, loader = TTLCache("deployments", ttl=60), _Loader()
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get("k", loader) for _ in range(10)))
+
+    assert asyncio.run(scenario()) == [1] * 10
+    assert loader.calls == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_load(clock):
+    cache, loader = TTLCache("deployments", ttl=60), _Loader()
+
+    async def scenario():
+        first = asyncio.create_task(cache.get("k", loader))
+        second = asyncio.create_task(cache.get("k", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == 1
+    assert loader.calls == 1
+
+
+def test_expired_values_are_served_stale_while_one_reload_runs(clock):
+    cache, loader = TTLCache("deployments", ttl=60, stale_seconds=30), _Loader()
+
+    async def scenario():
+        await cache.get("k", loader)
+        clock.now += 70
+        stale = await asyncio.gather(*(cache.get("k", loader) for _ in range(3)))
+        await asyncio.sleep(0.05)
+        fresh = await cache.get("k", loader)
+        clock.now += 100
+        return stale, fresh, await cache.get("k", loader)
+
+    stale, fresh, reloaded = asyncio.run(scenario())
+    assert stale == [1, 1, 1] and fresh == 2 and reloaded == 3
+
+
+def test_failed_loads_are_not_cached(clock):
+    cache, loader = TTLCache("deployments", ttl=60), _Loader(fail=True)
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(cache.get("k", loader) for _ in range(2)), return_exceptions=True
+        )
+        loader.fail = False
+        return results, await cache.get("k", loader)
+
+    results, value = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert loader.calls == 2 and value == 2
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.models import AlertEvent, AlertRule
+from app.services.webhook_service import WebhookDispatcher
+
+
+@pytest.fixture
+def webhook_server():
+    """Records (path, Authorization header, body); ``/slow`` answers after 1s."""
+    received = []
+    release = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if self.path == "/slow":
+                release.wait(5)
+            received.append((self.path, self.headers.get("Authorization"), body))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", received, release
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+
+
+def _rule(rule_id: int, webhooks: list) -> AlertRule:
+    config = json.dumps({"webhooks": webhooks})
+    return AlertRule(id=rule_id, name=f"rule {rule_id}", action_config=config)
+
+
+def _event(event_id: int) -> AlertEvent:
+    return AlertEvent(id=event_id, message="m", timestamp=datetime.utcnow())
+
+
+def test_rules_sharing_a_url_keep_their_own_headers(webhook_server, db_path):
+    url, received, _ = webhook_server
+    first = _rule(1, [{"url": f"{url}/hook", "headers": {"Authorization": "a"}}])
+    second = _rule(2, [{"url": f"{url}/hook", "headers": {"Authorization": "b"}}])
+
+    async def scenario():
+        dispatcher = WebhookDispatcher(batch_window=0.1)
+        for i in range(3):
+            dispatcher.enqueue(first, _event(i))
+            dispatcher.enqueue(second, _event(100 + i))
+        await asyncio.sleep(0.5)
+        await dispatcher.close()
+
+    asyncio.run(scenario())
+    auth = {body["event_id"]: header for _, header, body in received}
+    assert auth == {0: "a", 1: "a", 2: "a", 100: "b", 101: "b", 102: "b"}
+
+
+def test_close_waits_for_in_flight_deliveries(webhook_server, db_path):
+    url, received, release = webhook_server
+    rule = _rule(1, [f"{url}/slow"])
+
+    async def scenario():
+        dispatcher = WebhookDispatcher()
+        dispatcher.enqueue(rule, _event(1))
+        await asyncio.sleep(0.2)
+        assert dispatcher._deliveries
+        asyncio.get_running_loop().call_later(0.2, release.set)
+        await dispatcher.close(timeout=5)
+        assert not dispatcher._deliveries
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    assert dispatcher.delivered == 1
+    assert [path for path, _, _ in received] == ["/slow"]
+
+
+def test_close_dead_letters_deliveries_it_cancels(webhook_server, db_path):
+    url, _, _ = webhook_server
+    rule = _rule(1, [f"{url}/slow"])
+
+    async def scenario():
+        dispatcher = WebhookDispatcher()
+        dispatcher.enqueue(rule, _event(1))
+        await asyncio.sleep(0.2)
+        await dispatcher.close(timeout=0.1)
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    assert dispatcher.delivered == 0
+    assert dispatcher.dead_lettered == 1
+
+
+def test_close_drains_queues_and_dead_letters_the_rest(webhook_server, db_path):
+    url, received, release = webhook_server
+    slow, fast = _rule(1, [f"{url}/slow"]), _rule(2, [f"{url}/fast"])
+
+    async def scenario():
+        dispatcher = WebhookDispatcher(max_concurrency_per_endpoint=1)
+        for i in range(3):
+            dispatcher.enqueue(slow, _event(i))
+        dispatcher.enqueue(fast, _event(10))
+        await dispatcher.close(timeout=0.5)
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    release.set()
+    assert [body["event_id"] for _, _, body in received] == [10]
+    assert dispatcher.delivered == 1
+    assert dispatcher.dead_lettered == 3
+
+
+def test_full_queues_dead_letter_the_overflow(webhook_server, db_path):
+    url, received, _ = webhook_server
+    rule = _rule(1, [{"url": f"{url}/hook", "batch": True}])
+
+    async def scenario():
+        dispatcher = WebhookDispatcher(batch_window=0.1, max_queue_size=2)
+        for i in range(5):
+            dispatcher.enqueue(rule, _event(i))
+        await dispatcher.close()
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    assert [[e["event_id"] for e in body] for _, _, body in received] == [[0, 1]]
+    assert dispatcher.dead_lettered == 3
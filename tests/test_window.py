@@ -0,0 +1,47 @@
+import pytest
+from app.alert_triggers.window import TimeSeriesWindow
+
+
+def _window(samples, capacity: int = 60, max_age: float | None = None):
+    window = TimeSeriesWindow(capacity, alpha=0.5, max_age=max_age)
+    for ts, value in samples:
+        window.push(ts, value)
+    return window
+
+
+def test_full_ring_evicts_the_oldest_samples():
+    window = _window([(t, t * 10) for t in range(7)], capacity=4)
+    assert window.is_full and len(window) == 4
+    assert window.values() == [(3, 30), (4, 40), (5, 50), (6, 60)]
+    assert window.mean == 45
+    assert window.span_seconds == 3
+
+
+def test_max_age_evicts_samples_older_than_the_newest():
+    window = _window([(0, 1), (10, 2), (20, 3)], max_age=15)
+    assert window.values() == [(10, 2), (20, 3)]
+    window.push(100, 4)
+    assert window.values() == [(100, 4)]
+    assert window.slope is None and window.variance is None
+
+
+def test_aggregates_match_the_samples_in_the_window():
+    window = _window([(0, 5), (60, 7), (120, 9), (180, 11)])
+    assert window.mean == 8
+    assert window.variance == pytest.approx(20 / 3)
+    assert window.slope == pytest.approx(2 / 60)
+    assert window.ewma == pytest.approx(9.25)
+    assert window.pct_change_per_hour() == pytest.approx(2 * 60 / 8 * 100)
+    assert window.last == (180, 11)
+
+
+def test_rebuilt_sums_and_round_trip_keep_the_statistics():
+    window = _window([(t, (t * 7) % 11) for t in range(25)], capacity=6, max_age=30)
+    restored = TimeSeriesWindow.from_dict(window.to_dict())
+    exact = _window(window.values(), capacity=6)
+    for stats in (window, restored):
+        assert stats.values() == exact.values()
+        assert stats.mean == pytest.approx(exact.mean)
+        assert stats.variance == pytest.approx(exact.variance)
+        assert stats.slope == pytest.approx(exact.slope)
+    assert restored.max_age == 30 and restored.ewma == window.ewma